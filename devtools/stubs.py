@@ -0,0 +1,438 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from src.utils.lazy import LazyModule
+from src.utils.text_budget import count_tokens
+
+pymongo_errors = LazyModule("pymongo.errors")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECORDINGS_FILE = "data/profile_stubs/llm_recordings.json"
+
+
+def _request_key(model: str, messages: List[Dict[str, str]]) -> str:
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _system_prompt(messages: List[Dict[str, str]]) -> str:
+    return next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+
+
+def _make_response(content: str, prompt_tokens: int, completion_tokens: int):
+    """Build an object shaped like an OpenAI chat completion response"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                              total_tokens=prompt_tokens + completion_tokens)
+    )
+
+
+def canned_json_for_schema(schema: Dict[str, Any]) -> str:
+    """Return a minimal valid JSON document for an object schema"""
+    document = {}
+    for name, spec in schema.get("properties", {}).items():
+        document[name] = ["Not specified"] if spec.get("type") == "array" else "Not specified"
+    return json.dumps(document)
+
+
+class _Completions:
+    def __init__(self, owner: "StubChatClient"):
+        self._owner = owner
+
+    def create(self, **kwargs):
+        return self._owner.create(**kwargs)
+
+
+class StubChatClient:
+    """
+    Drop-in replacement for `openai.OpenAI` covering `chat.completions.create`
+
+    In record mode every request is forwarded to the real client and the
+    response text is saved; in replay mode responses come from the
+    recordings file, matched by request hash and falling back to any
+    recording made with the same system prompt, then to `default_response`.
+    """
+
+    def __init__(self, recordings_file: str = DEFAULT_RECORDINGS_FILE, real_client=None,
+                 default_response: str = "", replay_latency: bool = False):
+        """
+        Initialize the stub
+
+        Args:
+            recordings_file (str): JSON file holding recorded responses
+            real_client: OpenAI client to record from; None means replay only
+            default_response (str): Response used when nothing was recorded for a prompt
+            replay_latency (bool): Sleep for the recorded request duration when replaying
+        """
+        self.recordings_file = recordings_file
+        self.real_client = real_client
+        self.default_response = default_response
+        self.replay_latency = replay_latency
+        self.recordings: Dict[str, Dict[str, Any]] = {}
+        self._by_system_prompt: Dict[str, List[str]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_Completions(self))
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.recordings_file):
+            if self.real_client is None:
+                logger.warning(f"No LLM recordings at {self.recordings_file}; using the default response")
+            return
+        with open(self.recordings_file, "r", encoding="utf-8") as f:
+            self.recordings = json.load(f)
+        for key, recording in self.recordings.items():
+            self._by_system_prompt.setdefault(recording.get("system", ""), []).append(key)
+        logger.info(f"Loaded {len(self.recordings)} LLM recording(s) from {self.recordings_file}")
+
+    def save(self):
+        """Write the recordings file"""
+        os.makedirs(os.path.dirname(self.recordings_file) or ".", exist_ok=True)
+        with self._lock:
+            with open(self.recordings_file, "w", encoding="utf-8") as f:
+                json.dump(self.recordings, f, indent=2, ensure_ascii=False)
+        logger.info(f"Saved {len(self.recordings)} LLM recording(s) to {self.recordings_file}")
+
+    def create(self, model: str, messages: List[Dict[str, str]], **kwargs):
+        key = _request_key(model, messages)
+        system = _system_prompt(messages)
+
+        if self.real_client is not None:
+            start = time.perf_counter()
+            response = self.real_client.chat.completions.create(model=model, messages=messages, **kwargs)
+            usage = getattr(response, "usage", None)
+            with self._lock:
+                self.recordings[key] = {
+                    "system": system,
+                    "content": response.choices[0].message.content or "",
+                    "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+                    "completion_tokens": getattr(usage, "completion_tokens", 0),
+                    "elapsed": round(time.perf_counter() - start, 4)
+                }
+                self._by_system_prompt.setdefault(system, []).append(key)
+            return response
+
+        with self._lock:
+            recording = self.recordings.get(key)
+            if recording is None and self._by_system_prompt.get(system):
+                candidates = self._by_system_prompt[system]
+                cursor = self._cursor.get(system, 0)
+                recording = self.recordings[candidates[cursor % len(candidates)]]
+                self._cursor[system] = cursor + 1
+
+        if recording is None:
+            prompt_tokens = sum(count_tokens(m.get("content", "")) for m in messages)
+            return _make_response(self.default_response, prompt_tokens, count_tokens(self.default_response))
+        if self.replay_latency:
+            time.sleep(recording.get("elapsed", 0))
+        return _make_response(recording["content"], recording.get("prompt_tokens", 0),
+                              recording.get("completion_tokens", 0))
+
+
+def _matches(document: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Evaluate the small subset of the MongoDB query language the pipeline uses"""
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        value = document.get(field)
+        if isinstance(condition, dict) and any(op.startswith("$") for op in condition):
+            for op, operand in condition.items():
+                if op == "$all" and not (isinstance(value, list) and all(item in value for item in operand)):
+                    return False
+                if op == "$in" and not (value in operand or (isinstance(value, list) and set(value) & set(operand))):
+                    return False
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$gt" and not (value is not None and value > operand):
+                    return False
+                if op == "$gte" and not (value is not None and value >= operand):
+                    return False
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+        elif isinstance(value, list) and not isinstance(condition, list):
+            if condition not in value:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return dict(document)
+    included = [field for field, flag in projection.items() if flag and field != "_id"]
+    if included:
+        result = {field: document[field] for field in included if field in document}
+        if projection.get("_id", 1) and "_id" in document:
+            result["_id"] = document["_id"]
+        return result
+    return {field: value for field, value in document.items() if projection.get(field, 1)}
+
+
+def _sort_key(value: Any):
+    if isinstance(value, (int, float)):
+        return (0, value, "")
+    return (1, 0, "" if value is None else str(value))
+
+
+SUPPORTED_STAGES = ("$match", "$unwind", "$group", "$sort", "$limit", "$count", "$facet")
+
+
+def _check_pipeline(pipeline: List[Dict[str, Any]]):
+    for stage in pipeline:
+        (op, spec), = stage.items()
+        if op not in SUPPORTED_STAGES:
+            raise pymongo_errors.OperationFailure(f"Unrecognized pipeline stage name: '{op}' (in-memory database)")
+        if op == "$facet":
+            for sub_pipeline in spec.values():
+                _check_pipeline(sub_pipeline)
+
+
+class _StubCursor(list):
+    def limit(self, count: int) -> "_StubCursor":
+        return _StubCursor(self[:count]) if count else self
+
+    def skip(self, count: int) -> "_StubCursor":
+        return _StubCursor(self[count:])
+
+    def sort(self, field, direction: int = 1) -> "_StubCursor":
+        keys = [(field, direction)] if isinstance(field, str) else list(field)
+        documents = list(self)
+        # Stable sorts from the last key to the first give a compound order
+        for name, key_direction in reversed(keys):
+            documents.sort(key=lambda doc: _sort_key(doc.get(name)), reverse=key_direction < 0)
+        return _StubCursor(documents)
+
+
+class _StubRawBatchCursor:
+    """find_raw_batches result: documents re-encoded as BSON batches"""
+
+    def __init__(self, documents: _StubCursor, projection: Optional[Dict[str, Any]], batch_size: int):
+        self.documents = documents
+        self.projection = projection
+        self.batch_size = batch_size or 101
+
+    def sort(self, field: str, direction: int = 1) -> "_StubRawBatchCursor":
+        return _StubRawBatchCursor(self.documents.sort(field, direction), self.projection, self.batch_size)
+
+    def __iter__(self):
+        import bson
+        for start in range(0, len(self.documents), self.batch_size):
+            batch = self.documents[start:start + self.batch_size]
+            yield b"".join(bson.encode(_project(doc, self.projection)) for doc in batch)
+
+
+class _BulkRecorder:
+    """
+    Collects the writes of pymongo request objects
+
+    The driver exposes no public accessors on InsertOne/ReplaceOne/UpdateOne;
+    each request describes itself to a bulk builder through this interface,
+    the same way it does inside Collection.bulk_write.
+    """
+
+    def __init__(self):
+        self.writes: List[tuple] = []
+
+    def add_insert(self, document: Dict[str, Any]):
+        self.writes.append(("insert", (document,)))
+
+    def add_replace(self, selector: Dict[str, Any], replacement: Dict[str, Any], upsert: bool = False, **kwargs):
+        self.writes.append(("replace", (selector, replacement, bool(upsert))))
+
+    def add_update(self, selector: Dict[str, Any], update: Dict[str, Any], multi: bool = False,
+                   upsert: bool = False, **kwargs):
+        self.writes.append(("update", (selector, update, bool(upsert))))
+
+
+class StubCollection:
+    """In-memory collection supporting the operations used by the batch scripts"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.documents: List[Dict[str, Any]] = []
+        self._next_id = 0
+        self.indexes: Dict[str, Dict[str, Any]] = {"_id_": {"key": [("_id", 1)]}}
+
+    def create_index(self, keys, name: Optional[str] = None, **kwargs) -> str:
+        keys = [(keys, 1)] if isinstance(keys, str) else list(keys)
+        name = name or "_".join(f"{key}_{direction}" for key, direction in keys)
+        self.indexes.setdefault(name, dict(kwargs, key=keys))
+        return name
+
+    def index_information(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(info) for name, info in self.indexes.items()}
+
+    def drop_index(self, name: str):
+        del self.indexes[name]
+
+    def _find_index(self, query: Dict[str, Any]) -> int:
+        return next((i for i, doc in enumerate(self.documents) if _matches(doc, query)), -1)
+
+    def insert_one(self, document: Dict[str, Any]):
+        self._next_id += 1
+        stored = dict(document, _id=document.get("_id", self._next_id))
+        self.documents.append(stored)
+        return SimpleNamespace(inserted_id=stored["_id"])
+
+    def replace_one(self, query: Dict[str, Any], document: Dict[str, Any], upsert: bool = False):
+        index = self._find_index(query)
+        if index < 0:
+            if not upsert:
+                return SimpleNamespace(upserted_id=None, modified_count=0, matched_count=0)
+            return SimpleNamespace(upserted_id=self.insert_one(document).inserted_id, modified_count=0, matched_count=0)
+        existing = self.documents[index]
+        replacement = dict(document, _id=existing["_id"])
+        modified = int(replacement != existing)
+        self.documents[index] = replacement
+        return SimpleNamespace(upserted_id=None, modified_count=modified, matched_count=1)
+
+    def find_one_and_replace(self, query: Dict[str, Any], document: Dict[str, Any],
+                             projection: Optional[Dict[str, Any]] = None, upsert: bool = False):
+        """Replace a document and return its previous version (or None)"""
+        index = self._find_index(query)
+        previous = _project(self.documents[index], projection) if index >= 0 else None
+        self.replace_one(query, document, upsert=upsert)
+        return previous
+
+    def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        index = self._find_index(query)
+        if index < 0:
+            if not upsert:
+                return SimpleNamespace(upserted_id=None, modified_count=0, matched_count=0)
+            base = {k: v for k, v in query.items() if not isinstance(v, dict)}
+            index = len(self.documents)
+            self.insert_one(base)
+        document = self.documents[index]
+        document.update(update.get("$set", {}))
+        for path, amount in update.get("$inc", {}).items():
+            *parents, field = path.split(".")
+            target = document
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[field] = target.get(field, 0) + amount
+        return SimpleNamespace(upserted_id=None, modified_count=1, matched_count=1)
+
+    def bulk_write(self, operations: List[Any], ordered: bool = True):
+        """Apply pymongo InsertOne/ReplaceOne/UpdateOne request objects"""
+        recorder = _BulkRecorder()
+        for operation in operations:
+            operation._add_to_bulk(recorder)
+        modified = upserted = inserted = 0
+        for kind, args in recorder.writes:
+            if kind == "insert":
+                self.insert_one(*args)
+                inserted += 1
+                continue
+            result = self.replace_one(*args) if kind == "replace" else self.update_one(*args)
+            modified += result.modified_count
+            upserted += int(result.upserted_id is not None)
+        return SimpleNamespace(modified_count=modified, upserted_count=upserted, inserted_count=inserted)
+
+    def delete_many(self, query: Dict[str, Any]):
+        before = len(self.documents)
+        self.documents = [doc for doc in self.documents if not _matches(doc, query)]
+        return SimpleNamespace(deleted_count=before - len(self.documents))
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None) -> _StubCursor:
+        return _StubCursor(_project(doc, projection) for doc in self.documents if _matches(doc, query or {}))
+
+    def find_raw_batches(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None,
+                         batch_size: int = 0) -> _StubRawBatchCursor:
+        return _StubRawBatchCursor(self.find(query), projection, batch_size)
+
+    def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+    def find_one(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None):
+        results = self.find(query, projection)
+        return results[0] if results else None
+
+    def count_documents(self, query: Dict[str, Any]) -> int:
+        return sum(1 for doc in self.documents if _matches(doc, query))
+
+    def distinct(self, field: str) -> List[Any]:
+        values = []
+        for doc in self.documents:
+            value = doc.get(field)
+            for item in value if isinstance(value, list) else [value]:
+                if item is not None and item not in values:
+                    values.append(item)
+        return values
+
+    def aggregate(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run $match, $unwind, $group (count via $sum: 1), $sort, $limit, $count and $facet stages
+
+        Other stages are rejected up front with OperationFailure, as the server rejects unknown ones.
+        """
+        _check_pipeline(pipeline)
+        return self._run_pipeline([dict(doc) for doc in self.documents], pipeline)
+
+    def _run_pipeline(self, documents: List[Dict[str, Any]], pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for stage in pipeline:
+            (op, spec), = stage.items()
+            if op == "$match":
+                documents = [doc for doc in documents if _matches(doc, spec)]
+            elif op == "$unwind":
+                field = spec.lstrip("$")
+                documents = [dict(doc, **{field: item}) for doc in documents for item in doc.get(field) or []]
+            elif op == "$group":
+                field = spec["_id"].lstrip("$")
+                counts: Dict[Any, int] = {}
+                for doc in documents:
+                    counts[doc.get(field)] = counts.get(doc.get(field), 0) + 1
+                documents = [{"_id": key, "count": count} for key, count in counts.items()]
+            elif op == "$sort":
+                for field, direction in reversed(list(spec.items())):
+                    documents.sort(key=lambda doc: _sort_key(doc.get(field)), reverse=direction < 0)
+            elif op == "$limit":
+                documents = documents[:spec]
+            elif op == "$count":
+                documents = [{spec: len(documents)}] if documents else []
+            elif op == "$facet":
+                documents = [{name: self._run_pipeline(list(documents), sub_pipeline)
+                              for name, sub_pipeline in spec.items()}]
+        return documents
+
+
+class StubDatabase:
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: Dict[str, StubCollection] = {}
+
+    def __getitem__(self, name: str) -> StubCollection:
+        if name not in self._collections:
+            self._collections[name] = StubCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> StubCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+class StubMongoClient:
+    """In-memory stand-in for `pymongo.MongoClient`, for profiling without a database"""
+
+    def __init__(self):
+        self._databases: Dict[str, StubDatabase] = {}
+        self.admin = SimpleNamespace(command=lambda *args, **kwargs: {"ok": 1.0})
+
+    def __getitem__(self, name: str) -> StubDatabase:
+        if name not in self._databases:
+            self._databases[name] = StubDatabase(name)
+        return self._databases[name]
+
+    def close(self):
+        pass
@@ -0,0 +1,68 @@
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Library entry points used by the batch scripts and the matching service
+MODULES = [
+    "src.config",
+    "src.utils.api_client",
+    "src.generator.jd_generator",
+    "src.processor.processor",
+    "src.matcher.job_matcher",
+    "src.matcher.recommendations",
+    "src.matcher.service",
+    "src.matcher.report_generator",
+    "src.matcher.resume_processor",
+]
+
+# Dependencies that should only be imported when they are actually used
+HEAVY_DEPENDENCIES = ["streamlit", "sklearn", "numpy", "scipy", "pandas", "openai", "pymongo",
+                      "reportlab", "PyPDF2", "docx", "dotenv"]
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    """Import a module in fresh interpreters and return the median import time"""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_DEPENDENCIES)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(run["seconds"] for run in runs) * 1000, 1),
+        "heavy_loaded": runs[-1]["heavy"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of the library modules")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in MODULES]
+
+    print(f"{'module':<34} {'median ms':>10}  heavy dependencies loaded")
+    for result in results:
+        print(f"{result['module']:<34} {result['median_ms']:>10}  {', '.join(result['heavy_loaded']) or '-'}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
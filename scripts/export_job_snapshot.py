@@ -0,0 +1,31 @@
+import argparse
+import logging
+from src.matcher.job_matcher import RAGJobMatcher
+from src.config import OPENAI_API_KEY, MONGO_URI, DATABASE_NAME, JOB_SNAPSHOT_PATH
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    """
+    Snapshot the job index (catalog columns and TF-IDF vectors) to Arrow files
+    """
+    parser = argparse.ArgumentParser(description="Export the job index to a local Arrow snapshot")
+    parser.add_argument("--output", default=JOB_SNAPSHOT_PATH or "data/job_snapshot",
+                        help="Snapshot directory (point JOB_SNAPSHOT_PATH at it to load from it)")
+    args = parser.parse_args()
+
+    if not MONGO_URI or "${MONGO_PASSWORD}" in MONGO_URI:
+        logger.error("⚠️ Please set MONGO_URI with a valid password in .env")
+        return
+
+    matcher = RAGJobMatcher(OPENAI_API_KEY, MONGO_URI, DATABASE_NAME)
+    if not matcher.load_and_vectorize_jobs(use_snapshot=False):
+        logger.error("No jobs to export")
+        return
+    metadata = matcher.export_job_snapshot(args.output)
+    print(f"Exported {metadata['num_jobs']} job(s) to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import logging
+import certifi
+import pymongo
+from src.processor.job_queries import JOB_INDEX_VERSION, ensure_job_indexes
+from src.config import MONGO_URI, DATABASE_NAME
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    """
+    Create the job collection's browse indexes and drop the superseded ones (run once per deploy)
+    """
+    parser = argparse.ArgumentParser(description="Migrate the job_descriptions indexes")
+    parser.add_argument("--force", action="store_true",
+                        help="Compare against the live indexes even if this version was already applied")
+    args = parser.parse_args()
+
+    if not MONGO_URI or "${MONGO_PASSWORD}" in MONGO_URI:
+        logger.error("⚠️ Please set MONGO_URI with a valid password in .env")
+        return
+
+    client = pymongo.MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000, tlsCAFile=certifi.where())
+    try:
+        db = client[DATABASE_NAME]
+        changed = ensure_job_indexes(db.job_descriptions, db.pipeline_state, force=args.force)
+        print(f"Job indexes at version {JOB_INDEX_VERSION} ({'migrated' if changed else 'already current'})")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    main()
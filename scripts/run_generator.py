@@ -1,33 +1,87 @@
 import sys
 import os
+import argparse
+from contextlib import nullcontext
 from dotenv import load_dotenv
 from src.utils.api_client import OpenAIClient
 from src.generator.jd_generator import JobDescriptionGenerator
+from src.generator.synthesizer import TemplateJobSynthesizer
 from src.utils.file_handler import FileHandler
 from src.config import OPENAI_API_KEY
+from src.utils.metrics import metrics
+from src.utils.profiling import RunProfiler, optional_stage
+from devtools.stubs import StubChatClient, DEFAULT_RECORDINGS_FILE
 
 # Ensure the project root is in the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+CANNED_JOB_DESCRIPTION = """**Job Title**: Software Engineer
+**Company Overview**: A growing technology company building data products.
+**Job Summary**: Design, build and operate backend services.
+**Key Responsibilities**:
+- Develop services in Python
+- Review code and mentor engineers
+**Required Qualifications**:
+- Bachelor's degree in Computer Science
+- 3-5 years of experience with Python, SQL and AWS
+- Strong communication skills
+**Benefits**: Health insurance, remote work
+**Employment Type**: Full-time
+**Salary Range**: $90,000 - $120,000"""
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic job descriptions")
+    parser.add_argument("--count", type=int, default=200, help="Number of job descriptions to generate")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write cProfile, folded-stack and tracemalloc reports to data/profile_generator.*")
+    parser.add_argument("--stub-llm", action="store_true",
+                        help="Replay recorded LLM responses instead of calling the API (no rate-limit delays)")
+    parser.add_argument("--record-llm", action="store_true",
+                        help="Call the API and record responses for later --stub-llm runs")
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS_FILE, help="LLM recordings file")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Compose job descriptions from local templates instead of calling the API")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --synthetic (reproducible output)")
+    return parser.parse_args()
+
 def main():
-    """Generate 200 job descriptions and save to JSON."""
-    # Load environment variables from .env file
+    """Generate job descriptions and save to JSON."""
+    args = parse_args()
 
-    if not OPENAI_API_KEY:
+    if not OPENAI_API_KEY and not (args.stub_llm or args.synthetic):
         print("⚠️ Please set the OPENAI_API_KEY environment variable in .env file")
         return
     
-    api_client = OpenAIClient(OPENAI_API_KEY)
-    jd_generator = JobDescriptionGenerator(api_client)
+    stub_client = None
+    if args.stub_llm:
+        stub_client = StubChatClient(args.recordings, default_response=CANNED_JOB_DESCRIPTION)
+    elif args.record_llm:
+        stub_client = StubChatClient(args.recordings, real_client=OpenAIClient(OPENAI_API_KEY).client)
+    
+    if args.synthetic:
+        jd_generator = TemplateJobSynthesizer(seed=args.seed)
+    else:
+        api_client = OpenAIClient(OPENAI_API_KEY, client=stub_client)
+        delays = {"request_delay": 0, "batch_delay": 0} if args.stub_llm else {}
+        jd_generator = JobDescriptionGenerator(api_client, **delays)
     file_handler = FileHandler()
     
-    print("Generating 200 job descriptions...")
-    job_descriptions = jd_generator.generate_all_job_descriptions(200)
+    profiler = RunProfiler("generator") if args.profile else None
+    with profiler or nullcontext():
+        print(f"Generating {args.count} job descriptions...")
+        with optional_stage(profiler, "generate"):
+            job_descriptions = jd_generator.generate_all_job_descriptions(args.count)
+        
+        with optional_stage(profiler, "save"):
+            file_handler.save_to_json(job_descriptions, "data/job_descriptions_dataset.json")
+            summary = file_handler.generate_summary_report(job_descriptions)
     
-    file_handler.save_to_json(job_descriptions, "data/job_descriptions_dataset.json")
+    if args.record_llm:
+        stub_client.save()
     
-    summary = file_handler.generate_summary_report(job_descriptions)
+    summary["metrics"] = metrics.summary()
     file_handler.save_to_json(summary, "data/generation_summary.json")
+    metrics.write_prometheus("data/generator_metrics.prom")
 
     print("\n" + "="*50)
     print("GENERATION SUMMARY")
@@ -39,6 +93,9 @@ def main():
     print(f"\nFiles generated:")
     print(f"  - data/job_descriptions_dataset.json (main dataset)")
     print(f"  - data/generation_summary.json (summary statistics)")
+    print(f"  - data/generator_metrics.prom (Prometheus metrics)")
+    if args.profile:
+        print(f"  - data/profile_generator.* (profiling reports)")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -12,7 +12,6 @@ from pymongo import MongoClient
 from pymongo.server_api import ServerApi
 import certifi
 import logging
-import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -377,6 +376,13 @@ def validate_environment():
     
     return openai_api_key, mongo_uri, database_name
 
+@st.cache_resource(show_spinner=False)
+def get_matcher(openai_api_key, mongo_uri, database_name):
+    """One matcher per server process, with its job index warming up in the background"""
+    matcher = RAGJobMatcher(openai_api_key, mongo_uri, database_name)
+    matcher.start_warm_up()
+    return matcher
+
 def display_resume_upload():
     """Display enhanced resume upload section"""
     st.markdown("""
@@ -584,38 +590,68 @@ def display_job_matches(matches):
     
     return filtered_matches
 
+def stream_job_matches(matcher, processed_resume, top_k):
+    """Run matching while rendering stage progress and early results"""
+    status = st.status("🔄 Searching for the best job matches...", expanded=True)
+    progress_bar = status.progress(0.0)
+    preview = status.empty()
+    matches = []
+    
+    for event in matcher.iter_matching_jobs(processed_resume, top_k):
+        progress_bar.progress(min(event.progress, 1.0), text=event.message)
+        matches = event.matches
+        if matches:
+            # Lightweight preview of the current leaders; full cards render after the rerun
+            preview.markdown("\n".join(
+                f"{i}. **{match.title}** · {match.category} · {match.similarity_score:.0%}"
+                for i, match in enumerate(matches, 1)
+            ))
+    
+    if matches:
+        status.update(label=f"✅ Found {len(matches)} amazing job matches for you!", state="complete")
+    else:
+        status.update(label="⚠️ No matching jobs found", state="error")
+    return matches
+
 def display_export_section(filtered_matches, resume_name):
-    """Display export options"""
+    """Display export options; reports are rendered on request and cached"""
     st.markdown('<div class="modern-card">', unsafe_allow_html=True)
     st.markdown("### 📥 Export Your Results")
     st.markdown("Download your personalized job match report in your preferred format.")
     
+    fingerprint = ReportGenerator.matches_fingerprint(filtered_matches, resume_name)
     col1, col2 = st.columns(2)
     
     with col1:
         try:
-            pdf_data = ReportGenerator.generate_pdf_report(filtered_matches, resume_name)
-            st.download_button(
-                label="📄 Download PDF Report",
-                data=pdf_data,
-                file_name=f"job_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+            if (ReportGenerator.is_cached("pdf", fingerprint)
+                    or st.button("📄 Prepare PDF Report", use_container_width=True)):
+                pdf_data = ReportGenerator.get_pdf_report(filtered_matches, resume_name, fingerprint)
+                st.download_button(
+                    label="📄 Download PDF Report",
+                    data=pdf_data,
+                    file_name=f"job_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                    mime="application/pdf",
+                    on_click="ignore",
+                    use_container_width=True
+                )
         except Exception as e:
             st.error("PDF generation temporarily unavailable")
             logger.error(f"PDF generation error: {e}")
     
     with col2:
         try:
-            csv_data = ReportGenerator.generate_csv_report(filtered_matches)
-            st.download_button(
-                label="📊 Download CSV Report",
-                data=csv_data,
-                file_name=f"job_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+            if (ReportGenerator.is_cached("csv", fingerprint)
+                    or st.button("📊 Prepare CSV Report", use_container_width=True)):
+                csv_data = ReportGenerator.get_csv_report(filtered_matches, resume_name, fingerprint)
+                st.download_button(
+                    label="📊 Download CSV Report",
+                    data=csv_data,
+                    file_name=f"job_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv",
+                    on_click="ignore",
+                    use_container_width=True
+                )
         except Exception as e:
             st.error("CSV generation temporarily unavailable")
             logger.error(f"CSV generation error: {e}")
@@ -629,6 +665,7 @@ def main():
     
     # Validate environment silently
     openai_api_key, mongo_uri, database_name = validate_environment()
+    matcher = get_matcher(openai_api_key, mongo_uri, database_name)
     
     # Hero section
     display_hero_section()
@@ -655,6 +692,10 @@ def main():
             st.metric("Technical Skills", len(resume.technical_skills))
             st.metric("Experience", f"{resume.experience_years} years")
             st.metric("Certifications", len(resume.certifications))
+        
+        index_status = matcher.index_status()
+        if not index_status["ready"]:
+            st.caption("⏳ Job index warming up...")
     
     # Main content
     if current_step == 0:
@@ -663,9 +704,6 @@ def main():
         if uploaded_file and process_button:
             with st.spinner("🔄 Processing your resume... This may take a moment."):
                 try:
-                    # Initialize matcher
-                    matcher = RAGJobMatcher(openai_api_key, mongo_uri, database_name)
-                    
                     # Extract text based on file type
                     file_extension = uploaded_file.name.split('.')[-1].lower()
                     if file_extension == 'pdf':
@@ -685,9 +723,9 @@ def main():
                     # Process with LLM
                     processed_resume = matcher.process_resume_with_llm(resume_text)
                     if processed_resume:
+                        matcher.store_resume(processed_resume)
                         st.session_state.processed_resume = processed_resume
                         st.success("✅ Resume processed successfully!")
-                        time.sleep(1)
                         st.rerun()
                     else:
                         st.error("❌ Failed to process resume. Please try again.")
@@ -704,22 +742,18 @@ def main():
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
             if st.button("🔍 Find Matching Jobs", type="primary", use_container_width=True):
-                with st.spinner("🔄 Searching for the best job matches... This may take a moment."):
-                    try:
-                        matcher = RAGJobMatcher(openai_api_key, mongo_uri, database_name)
-                        job_matches = matcher.find_matching_jobs(st.session_state.processed_resume, top_k_jobs)
-                        st.session_state.job_matches = job_matches
-                        
-                        if job_matches:
-                            st.success(f"✅ Found {len(job_matches)} amazing job matches for you!")
-                            time.sleep(1)
-                            st.rerun()
-                        else:
-                            st.warning("⚠️ No matching jobs found. Try adjusting your search criteria.")
+                try:
+                    job_matches = stream_job_matches(matcher, st.session_state.processed_resume, top_k_jobs)
+                    st.session_state.job_matches = job_matches
                     
-                    except Exception as e:
-                        st.error("❌ An error occurred while searching for jobs. Please try again.")
-                        logger.error(f"Job matching error: {e}")
+                    if job_matches:
+                        st.rerun()
+                    else:
+                        st.warning("⚠️ No matching jobs found. Try adjusting your search criteria.")
+                
+                except Exception as e:
+                    st.error("❌ An error occurred while searching for jobs. Please try again.")
+                    logger.error(f"Job matching error: {e}")
     
     if st.session_state.get('job_matches'):
         st.markdown("## 💼 Your Personalized Job Recommendations")
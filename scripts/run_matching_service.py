@@ -0,0 +1,37 @@
+import argparse
+import logging
+from src.matcher.job_matcher import RAGJobMatcher
+from src.matcher.service import MatchingService
+from src.config import OPENAI_API_KEY, MONGO_URI, DATABASE_NAME
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    """
+    Run the headless job matching service
+    """
+    parser = argparse.ArgumentParser(description="Serve job matches over HTTP")
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address")
+    parser.add_argument("--port", type=int, default=8600, help="Bind port")
+    parser.add_argument("--max-batch-size", type=int, default=32, help="Maximum requests per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Micro-batch collection window")
+    args = parser.parse_args()
+
+    if not MONGO_URI or "${MONGO_PASSWORD}" in MONGO_URI:
+        logger.error("⚠️ Please set MONGO_URI with a valid password in .env")
+        return
+
+    matcher = RAGJobMatcher(OPENAI_API_KEY, MONGO_URI, DATABASE_NAME)
+    service = MatchingService(
+        matcher,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms
+    )
+    service.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
+import argparse
 import json
 import logging
-from src.processor.processor import JobDescriptionProcessor
+from contextlib import nullcontext
+from src.processor.processor import JobDescriptionProcessor, JD_EXTRACTION_SCHEMA
+from src.generator.synthesizer import TemplateJobSynthesizer
+from src.utils.metrics import metrics
+from src.utils.profiling import RunProfiler, optional_stage
+from devtools.stubs import StubChatClient, StubMongoClient, canned_json_for_schema, DEFAULT_RECORDINGS_FILE
 from src.config import OPENAI_API_KEY, MONGO_URI, DATABASE_NAME, INPUT_FILE
 
 # Set up logging
@@ -11,30 +17,119 @@ def main():
     """
     Main function to run the job description processor
     """
-    if not OPENAI_API_KEY:
+    parser = argparse.ArgumentParser(description="Process job descriptions into MongoDB")
+    parser.add_argument("--refresh-recommendations", action="store_true",
+                        help="Merge newly stored jobs into the materialized resume recommendations")
+    parser.add_argument("--backfill-match-text", action="store_true",
+                        help="Store precomputed match text on existing jobs and exit")
+    parser.add_argument("--dedupe-existing", action="store_true",
+                        help="Cluster stored jobs into near-duplicate groups (sets duplicate_of) and exit")
+    parser.add_argument("--train-text-dictionary", action="store_true",
+                        help="Train a zstd dictionary on stored job text for TEXT_COMPRESSION=zstd and exit")
+    parser.add_argument("--compress-existing", action="store_true",
+                        help="Rewrite stored job text with the current TEXT_COMPRESSION settings and exit")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N",
+                        help="Bulk-store N template-synthesized structured jobs (no LLM calls) and exit")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for --synthetic")
+    parser.add_argument("--rebuild-stats", action="store_true",
+                        help="Recompute the materialized collection stats instead of reading them")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write cProfile, folded-stack and tracemalloc reports to data/profile_processor.*")
+    parser.add_argument("--stub-llm", action="store_true",
+                        help="Replay recorded LLM responses instead of calling the API (no rate-limit delays)")
+    parser.add_argument("--record-llm", action="store_true",
+                        help="Call the API and record responses for later --stub-llm runs")
+    parser.add_argument("--stub-mongo", action="store_true",
+                        help="Use an in-memory MongoDB stand-in instead of the configured cluster")
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS_FILE, help="LLM recordings file")
+    args = parser.parse_args()
+    
+    if not OPENAI_API_KEY and not (args.stub_llm or args.synthetic):
         logger.error("⚠️ Please set OPENAI_API_KEY in .env")
         return
     
-    if not MONGO_URI or "${MONGO_PASSWORD}" in MONGO_URI:
+    if not args.stub_mongo and (not MONGO_URI or "${MONGO_PASSWORD}" in MONGO_URI):
         logger.error("⚠️ Please set MONGO_URI with a valid password in .env")
         return
     
+    if args.stub_mongo and args.refresh_recommendations:
+        logger.error("⚠️ --refresh-recommendations needs the real database; drop --stub-mongo")
+        return
+    
     try:
+        openai_client = None
+        if args.stub_llm:
+            openai_client = StubChatClient(args.recordings,
+                                           default_response=canned_json_for_schema(JD_EXTRACTION_SCHEMA))
+        elif args.record_llm:
+            import openai
+            openai_client = StubChatClient(args.recordings, real_client=openai.OpenAI(api_key=OPENAI_API_KEY))
+        
         processor = JobDescriptionProcessor(
             openai_api_key=OPENAI_API_KEY,
             mongo_uri=MONGO_URI,
-            database_name=DATABASE_NAME
+            database_name=DATABASE_NAME,
+            openai_client=openai_client,
+            mongo_client=StubMongoClient() if args.stub_mongo else None,
+            request_delay=0 if args.stub_llm else 1.0
         )
         
-        print("Starting job description processing...")
-        summary = processor.process_all_job_descriptions("data/job_descriptions_dataset.json")
+        if args.backfill_match_text:
+            updated = processor.backfill_match_text()
+            print(f"Backfilled match text for {updated} job(s)")
+            processor.close_connection()
+            return
+        
+        if args.train_text_dictionary or args.compress_existing:
+            if args.train_text_dictionary:
+                dict_id = processor.train_text_dictionary()
+                print(f"Trained text compression dictionary {dict_id}")
+            if args.compress_existing:
+                updated = processor.compress_existing()
+                print(f"Rewrote compressed text on {updated} job(s)")
+            processor.close_connection()
+            return
+        
+        if args.synthetic:
+            synthesizer = TemplateJobSynthesizer(seed=args.seed)
+            stored = processor.store_many(synthesizer.iter_processed(args.synthetic))
+            print(f"Stored {stored} synthesized job(s) (seed={args.seed})")
+            metrics.write_prometheus("data/processor_metrics.prom")
+            processor.close_connection()
+            return
         
+        if args.dedupe_existing:
+            result = processor.dedupe_existing()
+            print(f"Scanned {result['postings']} job(s): {result['duplicates']} near-duplicate(s) "
+                  f"in {result['clusters']} cluster(s)")
+            processor.close_connection()
+            return
+        
+        recommendation_store = None
+        if args.refresh_recommendations:
+            from src.matcher.job_matcher import RAGJobMatcher
+            from src.matcher.recommendations import RecommendationStore
+            recommendation_store = RecommendationStore(RAGJobMatcher(OPENAI_API_KEY, MONGO_URI, DATABASE_NAME))
+            processor.add_upsert_listener(recommendation_store.refresh_for_jobs)
+        
+        profiler = RunProfiler("processor") if args.profile else None
+        with profiler or nullcontext():
+            print("Starting job description processing...")
+            with optional_stage(profiler, "process"):
+                summary = processor.process_all_job_descriptions("data/job_descriptions_dataset.json")
+            
+            with optional_stage(profiler, "collection_stats"):
+                stats = processor.get_collection_stats(refresh=args.rebuild_stats)
+            with open("data/collection_stats.json", 'w', encoding='utf-8') as f:
+                json.dump(stats, f, indent=2, ensure_ascii=False)
+        
+        if args.record_llm:
+            openai_client.save()
+        
+        summary["metrics"] = metrics.summary()
         with open("data/processing_summary.json", 'w', encoding='utf-8') as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
-        
-        stats = processor.get_collection_stats()
-        with open("data/collection_stats.json", 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=2, ensure_ascii=False)
+        metrics.write_prometheus("data/processor_metrics.prom")
         
         print("\n" + "="*60)
         print("PROCESSING SUMMARY")
@@ -44,6 +139,7 @@ def main():
         print(f"Successfully Stored: {summary['successful_stored']}")
         print(f"Failed Processing: {summary['failed_processed']}")
         print(f"Failed Storage: {summary['failed_stored']}")
+        print(f"Near-Duplicates Skipped/Linked: {summary['skipped_duplicates']}/{summary['linked_duplicates']}")
         
         print("\n" + "="*60)
         print("COLLECTION STATISTICS")
@@ -60,6 +156,9 @@ def main():
         print(f"\nFiles generated:")
         print(f"  - data/processing_summary.json")
         print(f"  - data/collection_stats.json")
+        print(f"  - data/processor_metrics.prom")
+        if args.profile:
+            print(f"  - data/profile_processor.* (profiling reports)")
 
         processor.close_connection()
         
@@ -0,0 +1,34 @@
+import argparse
+import logging
+from src.matcher.job_matcher import RAGJobMatcher
+from src.matcher.recommendations import RecommendationStore
+from src.config import OPENAI_API_KEY, MONGO_URI, DATABASE_NAME
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    """
+    Refresh the materialized resume recommendations
+    """
+    parser = argparse.ArgumentParser(description="Refresh materialized job recommendations")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recompute every resume from scratch instead of merging new jobs")
+    parser.add_argument("--top-k", type=int, default=20, help="Recommendations kept per resume")
+    args = parser.parse_args()
+
+    if not MONGO_URI or "${MONGO_PASSWORD}" in MONGO_URI:
+        logger.error("⚠️ Please set MONGO_URI with a valid password in .env")
+        return
+
+    matcher = RAGJobMatcher(OPENAI_API_KEY, MONGO_URI, DATABASE_NAME)
+    store = RecommendationStore(matcher, top_k=args.top_k)
+    if args.rebuild:
+        written = store.rebuild_all()
+    else:
+        written = store.refresh_since_watermark()
+    print(f"Updated recommendations for {written} resume(s)")
+
+if __name__ == "__main__":
+    main()
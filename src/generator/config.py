@@ -54,4 +54,165 @@ class JobConfig:
         "Dallas, TX", "Washington, DC", "San Diego, CA"
     ]
 
-    EXPERIENCE_LEVELS: List[str] = ["Entry Level", "Mid Level", "Senior Level", "Lead/Principal"]
\ No newline at end of file
+    EXPERIENCE_LEVELS: List[str] = ["Entry Level", "Mid Level", "Senior Level", "Lead/Principal"]
+
+class PhraseBank:
+    """Local skill and phrase bank for LLM-free (template) job description synthesis."""
+    TECHNICAL_SKILLS: Dict[str, List[str]] = {
+        "Software Engineering": [
+            "Python", "Java", "JavaScript", "TypeScript", "React", "Angular", "Vue.js", "Node.js",
+            "Go", "C#", ".NET", "Spring Boot", "Django", "REST APIs", "GraphQL", "SQL", "PostgreSQL",
+            "MongoDB", "Redis", "Docker", "Git", "Microservices", "HTML", "CSS", "AWS"
+        ],
+        "Data Science": [
+            "Python", "R", "SQL", "Pandas", "NumPy", "scikit-learn", "Statistics", "A/B Testing",
+            "Tableau", "Power BI", "Spark", "Hadoop", "Airflow", "dbt", "Snowflake", "BigQuery",
+            "PostgreSQL", "Oracle", "ETL", "Data Modeling", "Excel", "Jupyter", "Databricks"
+        ],
+        "DevOps": [
+            "AWS", "Azure", "GCP", "Kubernetes", "Docker", "Terraform", "Ansible", "Jenkins",
+            "GitHub Actions", "GitLab CI", "Linux", "Bash", "Python", "Prometheus", "Grafana",
+            "Helm", "CloudFormation", "Networking", "Nginx", "ELK Stack", "Go", "Incident Management"
+        ],
+        "Machine Learning": [
+            "Python", "PyTorch", "TensorFlow", "Keras", "scikit-learn", "NLP", "Computer Vision",
+            "Transformers", "Hugging Face", "MLflow", "Kubeflow", "Spark", "SQL", "Docker",
+            "Kubernetes", "AWS SageMaker", "Deep Learning", "LLMs", "Feature Engineering", "NumPy",
+            "OpenCV", "CUDA"
+        ],
+        "Quality Assurance": [
+            "Selenium", "Cypress", "Playwright", "JUnit", "TestNG", "pytest", "Postman", "JMeter",
+            "LoadRunner", "Appium", "Cucumber", "Jira", "TestRail", "API Testing", "SQL", "Java",
+            "Python", "JavaScript", "CI/CD", "Regression Testing", "Performance Testing"
+        ],
+        "Project Management": [
+            "Agile", "Scrum", "Kanban", "Jira", "Confluence", "MS Project", "Risk Management",
+            "Budgeting", "Stakeholder Management", "PMP", "SAFe", "Roadmapping", "Asana",
+            "Smartsheet", "Product Discovery", "OKRs", "Vendor Management", "Resource Planning"
+        ],
+        "Business Analytics": [
+            "SQL", "Excel", "Tableau", "Power BI", "Looker", "Python", "R", "Google Analytics",
+            "Data Visualization", "Requirements Gathering", "Process Modeling", "BPMN", "SAS",
+            "Forecasting", "Statistics", "Snowflake", "DAX", "Market Research", "KPI Reporting"
+        ]
+    }
+
+    SOFT_SKILLS: List[str] = [
+        "Communication", "Teamwork", "Problem Solving", "Leadership", "Attention to Detail",
+        "Time Management", "Adaptability", "Critical Thinking", "Collaboration", "Mentoring",
+        "Stakeholder Communication", "Ownership", "Creativity", "Analytical Thinking"
+    ]
+
+    RESPONSIBILITIES: Dict[str, List[str]] = {
+        "Software Engineering": [
+            "Design, build and maintain scalable services using {skill}",
+            "Write clean, tested and well-documented code",
+            "Participate in code reviews and architecture discussions",
+            "Collaborate with product and design teams to deliver features",
+            "Improve application performance and reliability",
+            "Troubleshoot and resolve production issues",
+            "Contribute to CI/CD pipelines and developer tooling",
+            "Integrate third-party APIs and internal platforms"
+        ],
+        "Data Science": [
+            "Analyze large datasets with {skill} to uncover business insights",
+            "Build statistical models and forecasts",
+            "Design and evaluate A/B experiments",
+            "Develop dashboards and reports for stakeholders",
+            "Maintain data pipelines and ensure data quality",
+            "Translate business questions into analytical approaches",
+            "Present findings to technical and non-technical audiences",
+            "Partner with engineering to productionize models"
+        ],
+        "DevOps": [
+            "Automate infrastructure provisioning with {skill}",
+            "Build and maintain CI/CD pipelines",
+            "Monitor system health and respond to incidents",
+            "Improve reliability, scalability and cost efficiency",
+            "Manage container orchestration platforms",
+            "Define and track service level objectives",
+            "Harden systems and apply security best practices",
+            "Support engineering teams with deployment tooling"
+        ],
+        "Machine Learning": [
+            "Train and deploy machine learning models with {skill}",
+            "Build data and feature pipelines for model training",
+            "Evaluate model quality and monitor drift in production",
+            "Research and prototype new modeling approaches",
+            "Optimize inference latency and serving cost",
+            "Collaborate with data engineers and product teams",
+            "Document experiments and share results",
+            "Maintain MLOps tooling and model registries"
+        ],
+        "Quality Assurance": [
+            "Design and execute test plans and test cases",
+            "Build automated test suites with {skill}",
+            "Run regression, integration and performance tests",
+            "Track and triage defects with development teams",
+            "Integrate automated tests into CI/CD pipelines",
+            "Define quality metrics and release criteria",
+            "Review requirements for testability",
+            "Mentor team members on testing practices"
+        ],
+        "Project Management": [
+            "Plan and deliver projects using {skill} practices",
+            "Manage scope, schedule, budget and risks",
+            "Facilitate ceremonies and remove team blockers",
+            "Communicate status to stakeholders and leadership",
+            "Coordinate cross-functional teams and vendors",
+            "Maintain roadmaps and prioritize the backlog",
+            "Track delivery metrics and drive continuous improvement",
+            "Align project goals with business objectives"
+        ],
+        "Business Analytics": [
+            "Gather and document business requirements",
+            "Build reports and dashboards in {skill}",
+            "Analyze trends and KPIs to support decisions",
+            "Model business processes and identify improvements",
+            "Partner with stakeholders to define metrics",
+            "Validate data accuracy across sources",
+            "Present recommendations to leadership",
+            "Support user acceptance testing of new solutions"
+        ]
+    }
+
+    EDUCATION: List[str] = [
+        "Bachelor's degree in Computer Science or a related field",
+        "Bachelor's degree in Engineering, Mathematics or a related field",
+        "Bachelor's or Master's degree in a quantitative field",
+        "Bachelor's degree in Business, Information Systems or equivalent experience"
+    ]
+
+    BENEFITS: List[str] = [
+        "Competitive salary and annual bonus", "Comprehensive health, dental and vision insurance",
+        "401(k) with company match", "Flexible working hours", "Remote work options",
+        "Generous paid time off", "Professional development budget", "Stock options",
+        "Parental leave", "Wellness programs", "Home office stipend", "Tuition reimbursement"
+    ]
+
+    COMPANY_OVERVIEWS: List[str] = [
+        "We are a {company_type} focused on building products that customers love.",
+        "Our {company_type} serves clients across the country with data-driven solutions.",
+        "As a fast-growing {company_type}, we invest in technology and in our people.",
+        "We are an established {company_type} modernizing how our industry works."
+    ]
+
+    SUMMARIES: List[str] = [
+        "We are looking for a {role} to join our {category} team and help us deliver high-quality solutions.",
+        "As a {role}, you will own key {category} initiatives and work with cross-functional partners.",
+        "The {role} will play an important part in scaling our {category} capabilities.",
+        "Join us as a {role} and shape how our {category} work creates value for customers."
+    ]
+
+    # Years of experience and base salary (USD thousands) per experience level
+    EXPERIENCE_YEARS: Dict[str, str] = {
+        "Entry Level": "0-2 years", "Mid Level": "3-5 years",
+        "Senior Level": "5-8 years", "Lead/Principal": "8+ years"
+    }
+    BASE_SALARY: Dict[str, int] = {
+        "Entry Level": 65, "Mid Level": 95, "Senior Level": 130, "Lead/Principal": 165
+    }
+    HIGH_COST_LOCATIONS: List[str] = [
+        "San Francisco, CA", "New York, NY", "Seattle, WA", "Boston, MA", "Los Angeles, CA",
+        "Washington, DC", "San Diego, CA"
+    ]
@@ -5,13 +5,17 @@ from typing import List, Dict, Optional
 from datetime import datetime
 from src.generator.config import JobConfig
 from src.utils.api_client import OpenAIClient
+from src.utils.metrics import metrics
 
 class JobDescriptionGenerator:
     """Generates job descriptions."""
     
-    def __init__(self, api_client: OpenAIClient):
+    def __init__(self, api_client: OpenAIClient, request_delay: float = 1, batch_delay: float = 10):
         self.api_client = api_client
         self.config = JobConfig()
+        # Pauses between requests and batches to stay under API rate limits
+        self.request_delay = request_delay
+        self.batch_delay = batch_delay
 
     def generate_job_description_prompt(self, role: str, category: str, company_type: str, 
                                       location: str, experience_level: str) -> str:
@@ -96,10 +100,16 @@ class JobDescriptionGenerator:
                 category = random.choice(list(self.config.JOB_CATEGORIES.keys()))
                 role = random.choice(self.config.JOB_CATEGORIES[category])
                 print(f"Generating job description {i+j+1}/{num_descriptions}: {role} ({category})")
-                jd = self.generate_single_jd(role, category)
+                with metrics.timer("jd_generation_seconds", "Time to generate one job description", category=category):
+                    jd = self.generate_single_jd(role, category)
                 if jd:
+                    metrics.counter("jd_generated_total", "Job descriptions generated").inc(status="ok")
                     job_descriptions.append(jd)
-                time.sleep(1)
-            time.sleep(10)
+                else:
+                    metrics.counter("jd_generated_total", "Job descriptions generated").inc(status="failed")
+                if self.request_delay:
+                    time.sleep(self.request_delay)
+            if self.batch_delay:
+                time.sleep(self.batch_delay)
         print(f"Generated {len(job_descriptions)} job descriptions successfully!")
         return job_descriptions
\ No newline at end of file
@@ -0,0 +1,142 @@
+# synthesizer.py
+import random
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime
+from src.generator.config import JobConfig, PhraseBank
+from src.processor.models import ProcessedJobDescription
+from src.processor.utils import map_seniority_level
+from src.utils.metrics import metrics
+
+class TemplateJobSynthesizer:
+    """
+    Composes job descriptions from JobConfig and the local PhraseBank, without
+    the OpenAI API.
+
+    Every record is a ProcessedJobDescription whose original_description is
+    the composed posting text, so the same synthesis feeds both the raw
+    dataset (processor input) and pre-structured catalogs for load tests.
+    Output is deterministic for a given seed.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.config = JobConfig()
+        self.bank = PhraseBank()
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._id_prefix = f"JD_SYN{'' if seed is None else seed}"
+        # (category, role) pairs and per-category phrase lists, resolved once
+        self._roles = [(category, role) for category, roles in self.config.JOB_CATEGORIES.items() for role in roles]
+        self._responsibilities = {
+            category: [phrase for phrase in phrases if "{skill}" not in phrase]
+            for category, phrases in self.bank.RESPONSIBILITIES.items()
+        }
+        self._skill_responsibility = {
+            category: next(phrase for phrase in phrases if "{skill}" in phrase)
+            for category, phrases in self.bank.RESPONSIBILITIES.items()
+        }
+        self._salary_ranges = {
+            (level, high_cost): self._salary_range(base * (1.2 if high_cost else 1.0))
+            for level, base in self.bank.BASE_SALARY.items() for high_cost in (False, True)
+        }
+
+    @staticmethod
+    def _salary_range(base: float) -> str:
+        low = int(base) * 1000
+        return f"${low:,} - ${int(low * 1.3) // 1000 * 1000:,}"
+
+    def synthesize(self, index: int, processed_at: Optional[str] = None) -> ProcessedJobDescription:
+        """Compose one structured job description; index makes the job_id unique within a seed."""
+        rng = self.rng
+        bank = self.bank
+        category, role = rng.choice(self._roles)
+        company_type = rng.choice(self.config.COMPANY_TYPES)
+        location = rng.choice(self.config.LOCATIONS)
+        experience_level = rng.choice(self.config.EXPERIENCE_LEVELS)
+
+        technical_skills = rng.sample(bank.TECHNICAL_SKILLS[category], rng.randint(5, 8))
+        soft_skills = rng.sample(bank.SOFT_SKILLS, 3)
+        responsibilities = [self._skill_responsibility[category].format(skill=technical_skills[0])]
+        responsibilities += rng.sample(self._responsibilities[category], rng.randint(4, 6))
+        education = rng.choice(bank.EDUCATION)
+        years = bank.EXPERIENCE_YEARS[experience_level]
+        required = [
+            education,
+            f"{years} of experience as a {role} or in a similar role",
+            f"Proficiency in {', '.join(technical_skills[:3])}",
+            f"Strong {soft_skills[0].lower()} and {soft_skills[1].lower()} skills",
+        ]
+        preferred = [f"Experience with {skill}" for skill in technical_skills[-2:]]
+        benefits = rng.sample(bank.BENEFITS, rng.randint(3, 4))
+        salary_range = self._salary_ranges[(experience_level, location in bank.HIGH_COST_LOCATIONS)]
+        summary = rng.choice(bank.SUMMARIES).format(role=role, category=category)
+        overview = rng.choice(bank.COMPANY_OVERVIEWS).format(company_type=company_type.lower())
+
+        description = "\n".join((
+            f"**Job Title**: {role}",
+            f"**Company Overview**: {overview}",
+            f"**Job Summary**: {summary}",
+            "**Key Responsibilities**:",
+            *(f"- {item}" for item in responsibilities),
+            "**Required Qualifications**:",
+            *(f"- {item}" for item in required),
+            "**Preferred Qualifications**:",
+            *(f"- {item}" for item in preferred),
+            "**Benefits**:",
+            *(f"- {item}" for item in benefits),
+            f"**Location**: {location}",
+            "**Employment Type**: Full-time",
+            f"**Salary Range**: {salary_range}",
+        ))
+
+        return ProcessedJobDescription(
+            job_id=f"{self._id_prefix}_{index:07d}",
+            title=role,
+            category=category,
+            company_type=company_type,
+            location=location,
+            employment_type="Full-time",
+            experience_level=experience_level,
+            education_requirements=[education],
+            years_of_experience=years,
+            technical_skills=technical_skills,
+            soft_skills=soft_skills,
+            responsibilities=responsibilities,
+            required_qualifications=required,
+            preferred_qualifications=preferred,
+            benefits=benefits,
+            salary_range=salary_range,
+            job_summary=summary,
+            company_overview=overview,
+            original_description=description,
+            processed_at=processed_at or datetime.now().isoformat(),
+            keywords=[role, category, *technical_skills[:3]],
+            seniority_level=map_seniority_level(experience_level),
+        )
+
+    def iter_processed(self, count: int, start: int = 0) -> Iterator[ProcessedJobDescription]:
+        """Yield count structured job descriptions (one timestamp for the whole run)."""
+        processed_at = datetime.now().isoformat()
+        for index in range(start, start + count):
+            yield self.synthesize(index, processed_at)
+        metrics.counter("jd_generated_total", "Job descriptions generated").inc(count, status="synthetic")
+
+    @staticmethod
+    def to_raw(processed_jd: ProcessedJobDescription) -> Dict:
+        """Raw job description record, in the shape JobDescriptionGenerator produces."""
+        return {
+            "id": processed_jd.job_id,
+            "title": processed_jd.title,
+            "category": processed_jd.category,
+            "company_type": processed_jd.company_type,
+            "location": processed_jd.location,
+            "experience_level": processed_jd.experience_level,
+            "full_description": processed_jd.original_description,
+            "generated_at": processed_jd.processed_at,
+            "status": "active"
+        }
+
+    def generate_all_job_descriptions(self, num_descriptions: int) -> List[Dict]:
+        """Generate raw job descriptions (drop-in for JobDescriptionGenerator)."""
+        job_descriptions = [self.to_raw(jd) for jd in self.iter_processed(num_descriptions)]
+        print(f"Synthesized {len(job_descriptions)} job descriptions (seed={self.seed})")
+        return job_descriptions
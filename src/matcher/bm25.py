@@ -0,0 +1,124 @@
+import logging
+from typing import Callable, Dict, List, Tuple
+from src.utils.lazy import LazyModule
+
+np = LazyModule("numpy")
+
+logger = logging.getLogger(__name__)
+
+
+class BM25Index:
+    """
+    Inverted index of job terms scored with Okapi BM25
+
+    Postings are stored term-major (CSC layout over the job x term count
+    matrix) with each posting's BM25 impact precomputed, plus every term's
+    largest impact. A query walks only its own terms' postings, strongest
+    upper bound first, MaxScore style: once the bound left in the
+    remaining terms cannot lift an unseen job into the top k, later terms
+    are only probed for the jobs that can still make it, and the candidate
+    set shrinks as the k-th best score rises. The result is the exact top k.
+    """
+
+    def __init__(self, counts, vocabulary: Dict[str, int], analyzer: Callable[[str], List[str]],
+                 k1: float = 1.2, b: float = 0.75):
+        """
+        Build the index
+
+        Args:
+            counts: Sparse job x term count matrix (rows in catalog order)
+            vocabulary (Dict[str, int]): Term -> column of counts
+            analyzer (Callable[[str], List[str]]): Turns query text into terms (the vectorizer's analyzer)
+            k1 (float): Term frequency saturation
+            b (float): Document length normalization
+        """
+        self.vocabulary = vocabulary
+        self.analyzer = analyzer
+        self.num_docs = counts.shape[0]
+        doc_lengths = np.asarray(counts.sum(axis=1), dtype=np.float32).ravel()
+        avg_length = float(doc_lengths.mean()) if self.num_docs else 0.0
+
+        postings = counts.tocsc()
+        postings.sort_indices()
+        self.indptr = postings.indptr
+        self.doc_ids = postings.indices
+        document_frequency = np.diff(self.indptr)
+        idf = np.log1p((self.num_docs - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+
+        tf = postings.data.astype(np.float32)
+        length_norm = k1 * (1.0 - b + b * doc_lengths[self.doc_ids] / max(avg_length, 1e-9))
+        term_of_posting = np.repeat(np.arange(len(document_frequency)), document_frequency)
+        self.impacts = idf[term_of_posting] * tf * (k1 + 1.0) / (tf + length_norm)
+
+        self.max_impact = np.zeros(len(document_frequency), dtype=np.float32)
+        nonempty = document_frequency > 0
+        if nonempty.any():
+            self.max_impact[nonempty] = np.maximum.reduceat(self.impacts, self.indptr[:-1][nonempty])
+        logger.info(f"Built BM25 index: {self.num_docs} jobs, {int(nonempty.sum())} terms, "
+                    f"{len(self.doc_ids)} postings")
+
+    def query_terms(self, text: str) -> "np.ndarray":
+        """Distinct indexed terms of a query, as term ids"""
+        ids = {self.vocabulary[term] for term in self.analyzer(text) if term in self.vocabulary}
+        terms = np.fromiter(ids, dtype=np.int64, count=len(ids))
+        return terms[self.max_impact[terms] > 0]
+
+    @staticmethod
+    def _kth_best(scores: "np.ndarray", k: int) -> float:
+        if len(scores) < k:
+            return 0.0
+        return float(np.partition(scores, len(scores) - k)[len(scores) - k])
+
+    def search(self, text: str, k: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        The k best jobs for a query, best first
+
+        Scores are divided by the query's largest attainable BM25 score (the
+        sum of its terms' maximum impacts), so they fall in [0, 1] like the
+        cosine scores. Jobs sharing no term with the query are not returned.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (scores, catalog rows)
+        """
+        terms = self.query_terms(text)
+        if not len(terms) or k <= 0:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+        upper = self.max_impact[terms]
+        order = np.argsort(-upper, kind="stable")
+        terms, upper = terms[order], upper[order]
+        # Bound on what the terms after each position can still add
+        remaining = np.append(np.cumsum(upper[::-1])[::-1][1:], 0.0)
+
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        touched_parts = []
+        touched = np.empty(0, dtype=self.doc_ids.dtype)
+        candidates = None
+        threshold = 0.0
+        for term, rest in zip(terms, remaining):
+            docs = self.doc_ids[self.indptr[term]:self.indptr[term + 1]]
+            impacts = self.impacts[self.indptr[term]:self.indptr[term + 1]]
+            if candidates is None:
+                # Essential term: any job in its postings may still reach the top k
+                scores[docs] += impacts
+                touched_parts.append(docs)
+                touched = np.unique(np.concatenate(touched_parts))
+                touched_parts = [touched]
+                threshold = self._kth_best(scores[touched], k)
+                if rest < threshold:
+                    candidates = touched[scores[touched] + rest >= threshold]
+            else:
+                # Non-essential term: only probe the postings of the remaining candidates
+                positions = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                hit = docs[positions] == candidates
+                scores[candidates[hit]] += impacts[positions[hit]]
+                threshold = max(threshold, self._kth_best(scores[candidates], k))
+                candidates = candidates[scores[candidates] + rest >= threshold]
+
+        rows = touched if candidates is None else candidates
+        best = scores[rows]
+        if len(best) > k:
+            keep = np.argpartition(best, -k)[-k:]
+            rows, best = rows[keep], best[keep]
+        order = np.argsort(-best, kind="stable")
+        return best[order] / float(upper.sum()), rows[order].astype(np.int64)
@@ -0,0 +1,209 @@
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.utils.lazy import LazyModule
+from src.utils.match_text import extract_strings
+
+np = LazyModule("numpy")
+
+# Low-cardinality job fields stored as integer codes into a values table
+CATEGORICAL_FIELDS = ("category", "location", "company_type")
+
+# Free-text fields kept as one list per column
+TEXT_FIELDS = ("job_id", "title", "job_summary", "salary_range", "processed_at")
+
+
+def _intern(value: Any) -> str:
+    return sys.intern(value if isinstance(value, str) else str(value or ""))
+
+
+class _Categorical:
+    """Dictionary-encoded column: one small int code per row plus the distinct values"""
+
+    __slots__ = ("values", "codes", "_lookup")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._lookup: Dict[str, int] = {}
+        self.codes = None
+
+    def encode(self, column: Iterable[Any]):
+        codes = []
+        for value in column:
+            value = _intern(value)
+            code = self._lookup.get(value)
+            if code is None:
+                code = self._lookup[value] = len(self.values)
+                self.values.append(value)
+            codes.append(code)
+        dtype = np.int16 if len(self.values) < 2 ** 15 else np.int32
+        self.codes = np.asarray(codes, dtype=dtype)
+
+    @classmethod
+    def from_codes(cls, values: Iterable[str], codes) -> "_Categorical":
+        """Wrap an already dictionary-encoded column (e.g. read from a snapshot)"""
+        column = cls()
+        column.values = [sys.intern(value) for value in values]
+        column._lookup = {value: code for code, value in enumerate(column.values)}
+        column.codes = codes
+        return column
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+
+class JobRow:
+    """Read-only view of one catalog row; a JobMatch is only built for returned rows"""
+
+    __slots__ = ("catalog", "index")
+
+    def __init__(self, catalog: "JobCatalog", index: int):
+        self.catalog = catalog
+        self.index = index
+
+    def __getitem__(self, name: str) -> Any:
+        return self.catalog.value(self.index, name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """dict-style access, so code written against job documents keeps working"""
+        try:
+            return self.catalog.value(self.index, name)
+        except KeyError:
+            return default
+
+
+class JobCatalog:
+    """
+    Columnar in-memory job catalog
+
+    Categorical fields are NumPy code arrays, seniority is an int8 array,
+    technical skills are interned lowercase ids stored CSR-style
+    (skill_offsets/skill_ids), and the few display strings are plain
+    per-column lists. Rows are read through JobRow views. Near-duplicate
+    postings share a cluster code (their duplicate_of, else their own id).
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, List[str]] = {name: [] for name in TEXT_FIELDS}
+        self.categoricals: Dict[str, _Categorical] = {name: _Categorical() for name in CATEGORICAL_FIELDS}
+        self.seniority = None
+        self.clusters = _Categorical()
+        self.skill_vocab: List[str] = []
+        self._skill_lookup: Dict[str, int] = {}
+        self.skill_offsets = None
+        self.skill_ids = None
+        self._rows: Dict[str, int] = {}
+
+    @classmethod
+    def from_jobs(cls, jobs: List[Dict[str, Any]]) -> "JobCatalog":
+        """Build a catalog from job documents (the documents can be dropped afterwards)"""
+        catalog = cls()
+        for name in TEXT_FIELDS:
+            catalog.columns[name] = [_intern(job.get(name, "")) for job in jobs]
+        for name in CATEGORICAL_FIELDS:
+            catalog.categoricals[name].encode(job.get(name, "") for job in jobs)
+        catalog.seniority = np.asarray([int(job.get("seniority_level") or 0) for job in jobs], dtype=np.int8)
+        catalog.clusters.encode(job.get("duplicate_of") or job.get("job_id", "") for job in jobs)
+
+        offsets = [0]
+        ids: List[int] = []
+        for job in jobs:
+            seen = set()
+            for skill in extract_strings(job.get("technical_skills", [])):
+                skill_id = catalog.intern_skill(skill)
+                if skill_id not in seen:
+                    seen.add(skill_id)
+                    ids.append(skill_id)
+            offsets.append(len(ids))
+        catalog.skill_offsets = np.asarray(offsets, dtype=np.int64)
+        catalog.skill_ids = np.asarray(ids, dtype=np.int32)
+        catalog._rows = {job_id: i for i, job_id in enumerate(catalog.columns["job_id"])}
+        return catalog
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[str]], categoricals: Dict[str, _Categorical], seniority,
+                     clusters: _Categorical, skill_vocab: List[str], skill_offsets, skill_ids) -> "JobCatalog":
+        """Assemble a catalog from prebuilt columns (skill names already lowercased and unique per job)"""
+        catalog = cls()
+        catalog.columns = {name: [_intern(value) for value in columns[name]] for name in TEXT_FIELDS}
+        catalog.categoricals = categoricals
+        catalog.seniority = seniority
+        catalog.clusters = clusters
+        catalog.skill_vocab = [sys.intern(skill) for skill in skill_vocab]
+        catalog._skill_lookup = {skill: skill_id for skill_id, skill in enumerate(catalog.skill_vocab)}
+        catalog.skill_offsets = skill_offsets
+        catalog.skill_ids = skill_ids
+        catalog._rows = {job_id: i for i, job_id in enumerate(catalog.columns["job_id"])}
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.columns["job_id"])
+
+    @property
+    def job_ids(self) -> List[str]:
+        return self.columns["job_id"]
+
+    @property
+    def has_duplicates(self) -> bool:
+        """Whether any rows are near-duplicates of another row"""
+        return len(self.clusters.values) < len(self)
+
+    def collapse_duplicates(self, rows: "np.ndarray") -> "np.ndarray":
+        """Positions in rows (best first) of the first row of each near-duplicate cluster"""
+        if not self.has_duplicates:
+            return np.arange(len(rows))
+        _, first = np.unique(self.clusters.codes[np.asarray(rows, dtype=np.int64)], return_index=True)
+        return np.sort(first)
+
+    def intern_skill(self, skill: str) -> int:
+        """Return the id of a (lowercased) skill name, adding it to the vocabulary if new"""
+        key = sys.intern(skill.strip().lower())
+        skill_id = self._skill_lookup.get(key)
+        if skill_id is None:
+            skill_id = self._skill_lookup[key] = len(self.skill_vocab)
+            self.skill_vocab.append(key)
+        return skill_id
+
+    def lookup_skill_ids(self, skills: Iterable[str]) -> set:
+        """Ids of the given skills that occur in the catalog (unknown skills are ignored)"""
+        ids = set()
+        for skill in skills:
+            skill_id = self._skill_lookup.get(skill.strip().lower())
+            if skill_id is not None:
+                ids.add(skill_id)
+        return ids
+
+    def skill_ids_of(self, row: int):
+        return self.skill_ids[self.skill_offsets[row]:self.skill_offsets[row + 1]]
+
+    def skill_names(self, ids: Iterable[int]) -> List[str]:
+        return [self.skill_vocab[skill_id] for skill_id in ids]
+
+    def row_of(self, job_id: str) -> Optional[int]:
+        return self._rows.get(job_id)
+
+    def row(self, index: int) -> JobRow:
+        return JobRow(self, int(index))
+
+    def value(self, row: int, name: str) -> Any:
+        """Decode one field of a row"""
+        if name in self.columns:
+            return self.columns[name][row]
+        if name in self.categoricals:
+            return self.categoricals[name][row]
+        if name == "seniority_level":
+            return int(self.seniority[row])
+        if name == "technical_skills":
+            return self.skill_names(self.skill_ids_of(row))
+        raise KeyError(name)
+
+    def skill_overlap(self, row: int, resume_skill_ids: set) -> Tuple[List[str], List[str]]:
+        """Return (matching, missing) skill names for a row, in the job's skill order"""
+        matching, missing = [], []
+        for skill_id in self.skill_ids_of(row).tolist():
+            (matching if skill_id in resume_skill_ids else missing).append(self.skill_vocab[skill_id])
+        return matching, missing
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the numeric columns (strings are shared through interning)"""
+        arrays = [self.seniority, self.clusters.codes, self.skill_offsets, self.skill_ids] + [c.codes for c in self.categoricals.values()]
+        return sum(array.nbytes for array in arrays if array is not None)
@@ -1,18 +1,70 @@
-import json
+import os
+import time
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator, Tuple, Union
 from datetime import datetime
-import openai
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-import streamlit as st
-from .models import ProcessedResume, JobMatch
+from dataclasses import asdict, dataclass, replace
+from .models import ProcessedResume, JobMatch, MatchProgress, CandidateMatch, resume_from_dict
+from .resume_parser import RuleBasedResumeParser
+from .catalog import CATEGORICAL_FIELDS, TEXT_FIELDS, JobCatalog, JobRow
+from .reranker import FeatureReranker, parse_weights
+from .snapshot import collection_watermark, read_job_snapshot, write_job_snapshot
+from .sharding import ShardedJobIndex
+from .bm25 import BM25Index
+from .match_cache import MatchCache, resume_fingerprint
+from src import config
+from src.utils.lazy import LazyModule
+from src.utils.match_text import (
+    MATCH_TEXT_VERSION, build_job_match_text, extract_strings, identity, tokenize_match_text
+)
+from src.utils.text_budget import prepare_for_prompt
+from src.utils.metrics import metrics
+from src.utils.parallel_scan import parallel_scan
+from src.utils.text_compression import JOB_TEXT_FIELDS, TextCodec
+from src.utils.structured_output import (
+    dataclass_json_schema, extract_structured, build_field_repair_prompt, subschema
+)
+
+# Heavy dependencies are imported on first use
+np = LazyModule("numpy")
+openai = LazyModule("openai")
+pymongo = LazyModule("pymongo")
+pymongo_errors = LazyModule("pymongo.errors")
+scipy_sparse = LazyModule("scipy.sparse")
+sklearn_pairwise = LazyModule("sklearn.metrics.pairwise")
 
 logger = logging.getLogger(__name__)
 
+RESUME_EXTRACTION_SCHEMA = dataclass_json_schema(ProcessedResume, exclude=("resume_text", "processed_at"))
+
+# Job fields read to build the index: catalog columns, stored match input and
+# the fields build_job_match_text falls back to for jobs without it
+JOB_INDEX_FIELDS = TEXT_FIELDS + CATEGORICAL_FIELDS + (
+    "seniority_level", "technical_skills", "duplicate_of", "soft_skills", "responsibilities", "keywords",
+    "match_text", "match_tokens", "match_text_version"
+)
+
+# Cosine candidates kept per requested match when near-duplicates get collapsed
+DUPLICATE_POOL_FACTOR = 3
+
+# First-stage scorers: TF-IDF cosine over every job, or BM25 over an inverted index
+MATCH_SCORERS = ("tfidf", "bm25")
+
+
+@dataclass(frozen=True)
+class JobIndex:
+    """One version of the job index; a query pins it so a rebuild can swap in the next one"""
+    catalog: JobCatalog
+    vectorizer: Any
+    job_vectors: Any
+    sharded_index: Optional[ShardedJobIndex]
+    version: int
+    bm25: Optional[BM25Index] = None
+
+
 class RAGJobMatcher:
     """RAG-based job matching system"""
     
@@ -22,154 +74,378 @@ class RAGJobMatcher:
         retries = 3
         for attempt in range(retries):
             try:
-                self.mongo_client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
+                self.mongo_client = pymongo.MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
                 self.mongo_client.admin.command("ping")  # Test connection
                 self.db = self.mongo_client[database_name]
                 self.collection = self.db.job_descriptions
+                self.resume_collection = self.db.resumes
+                self.text_codec = TextCodec(self.db.text_dictionaries)
+                self.resume_collection.create_index("content_hash", unique=True)
                 logger.info("Connected to MongoDB Atlas successfully")
                 break
-            except ConnectionFailure as e:
+            except pymongo_errors.ConnectionFailure as e:
                 logger.error(f"Attempt {attempt + 1}/{retries} failed: {e}")
                 if attempt == retries - 1:
                     raise
         
-        self.vectorizer = TfidfVectorizer(
+        # Replaced as a whole by each rebuild; builds are serialized by _build_lock
+        self.index: Optional[JobIndex] = None
+        self._build_lock = threading.RLock()
+        self._building = False
+        self._build_error: Optional[str] = None
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self._warm_up_lock = threading.Lock()
+        # Queries pin the version they run on; a replaced version's shards
+        # are closed once its last pin is released
+        self._pin_lock = threading.Lock()
+        self._pins: Dict[int, int] = {}
+        self._retired: Dict[int, JobIndex] = {}
+        # Rows of candidate_vectors line up with candidate_documents; writers
+        # assign the documents before the vectors, readers read the vectors first
+        self.candidate_vectors = None
+        self._candidate_index_version = 0
+        self.candidate_documents = []
+        self._candidate_lock = threading.Lock()
+        self._resume_parser = None
+        self.match_cache: Optional[MatchCache] = None
+        if config.MATCH_CACHE_SIZE > 0:
+            self.match_cache = MatchCache(config.MATCH_CACHE_SIZE, config.MATCH_CACHE_TTL_SECONDS,
+                                          config.MATCH_CACHE_DEPTH)
+        if config.MATCH_SCORER not in MATCH_SCORERS:
+            raise ValueError(f"Unknown MATCH_SCORER {config.MATCH_SCORER!r}; expected one of {MATCH_SCORERS}")
+        self.reranker: Optional[FeatureReranker] = None
+        if config.RERANK_CANDIDATES > 0:
+            self.reranker = FeatureReranker(parse_weights(config.RERANK_WEIGHTS), config.RERANK_CANDIDATES)
+
+    def _extract_strings(self, field):
+        """Helper to extract strings from a list of strings or dicts."""
+        return extract_strings(field)
+
+    def _get_resume_parser(self) -> RuleBasedResumeParser:
+        """Build the rule-based resume parser from the catalog's known technical skills"""
+        if self._resume_parser is None:
+            known_skills = self.collection.distinct("technical_skills")
+            self._resume_parser = RuleBasedResumeParser(known_skills)
+            logger.info(f"Rule-based resume parser loaded {len(known_skills)} known skills")
+        return self._resume_parser
+
+    def _build_job_text(self, job: Dict) -> str:
+        """Build the match text for a stored job"""
+        return build_job_match_text(job)
+
+    def _job_match_input(self, job: Dict) -> Union[str, List[str]]:
+        """
+        Take the match tokens (or text) precomputed at ingest off a job document,
+        falling back to building the text for jobs stored before it existed
+        (text fields compressed at ingest are decompressed in place first)
+        """
+        self.text_codec.decompress_fields(job, JOB_TEXT_FIELDS)
+        tokens = job.pop('match_tokens', None)
+        text = job.pop('match_text', None)
+        if job.pop('match_text_version', None) == MATCH_TEXT_VERSION:
+            if tokens is not None:
+                return tokens
+            if text:
+                return text
+        return self._build_job_text(job)
+
+    @property
+    def catalog(self) -> Optional[JobCatalog]:
+        return self.index.catalog if self.index is not None else None
+
+    @property
+    def vectorizer(self):
+        return self.index.vectorizer if self.index is not None else None
+
+    @property
+    def job_vectors(self):
+        return self.index.job_vectors if self.index is not None else None
+
+    @property
+    def sharded_index(self) -> Optional[ShardedJobIndex]:
+        return self.index.sharded_index if self.index is not None else None
+
+    @property
+    def index_version(self) -> int:
+        return self.index.version if self.index is not None else 0
+
+    def _load_job_documents(self) -> Optional[Tuple[JobCatalog, List[Union[str, List[str]]]]]:
+        """Load jobs from MongoDB with the match tokens stored at ingest"""
+        with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="load_jobs"):
+            jobs = parallel_scan(self.collection, dict.fromkeys(JOB_INDEX_FIELDS, 1) | {"_id": 0},
+                                 config.JOB_SCAN_WORKERS, config.JOB_SCAN_BATCH_SIZE)
+        if not jobs:
+            logger.error("No jobs found in database. Please run Task 2 first.")
+            return None
+        
+        # Match inputs are only needed until the vectorizer is fitted; the job
+        # documents themselves are replaced by the columnar catalog
+        job_texts = [self._job_match_input(job) for job in jobs]
+        return JobCatalog.from_jobs(jobs), job_texts
+
+    @staticmethod
+    def _create_vectorizer():
+        """
+        Build the TF-IDF vectorizer (sklearn is only imported once jobs are vectorized)
+
+        Documents may be raw text or token lists stored at ingest; both go
+        through tokenize_match_text, which matches sklearn's default analyzer.
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        return TfidfVectorizer(
             stop_words='english',
             max_features=5000,
             ngram_range=(1, 3),
-            lowercase=True
+            preprocessor=identity,
+            tokenizer=tokenize_match_text,
+            token_pattern=None
         )
-        self.job_vectors = None
-        self.job_documents = []
 
-    def _extract_strings(self, field):
-        """Helper to extract strings from a list of strings or dicts."""
-        if isinstance(field, list):
-            if field and isinstance(field[0], dict):
-                # Try 'name' key, fallback to first value
-                return [str(item.get('name', next(iter(item.values()), ''))) for item in field]
-            return [str(item) for item in field]
-        return []
-
-    def load_and_vectorize_jobs(self):
-        """Load jobs from MongoDB and create TF-IDF vectors"""
+    def _vectorize_job_documents(self, catalog: JobCatalog, job_texts: List[Union[str, List[str]]]):
+        """Fit a fresh TF-IDF vectorizer on the loaded job documents and install the index"""
+        from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+        vectorizer = self._create_vectorizer()
+        counts = None
+        with metrics.timer("vectorize_seconds", "TF-IDF vectorization time", target="jobs"):
+            if config.MATCH_SCORER == "bm25":
+                # One analyzer pass: BM25 keeps the raw term counts and TF-IDF is derived from them
+                counts = CountVectorizer.fit_transform(vectorizer, job_texts)
+                transformer = TfidfTransformer(norm=vectorizer.norm, use_idf=vectorizer.use_idf,
+                                               smooth_idf=vectorizer.smooth_idf, sublinear_tf=vectorizer.sublinear_tf)
+                job_vectors = transformer.fit_transform(counts)
+                vectorizer.idf_ = transformer.idf_
+            else:
+                job_vectors = vectorizer.fit_transform(job_texts)
+        self._install_index(catalog, vectorizer, job_vectors, counts)
+        logger.info(f"Loaded and vectorized {len(catalog)} jobs")
+
+    @staticmethod
+    def _build_sharded_index(job_vectors, catalog: JobCatalog) -> Optional[ShardedJobIndex]:
+        """Partition the job vectors over shard processes when JOB_INDEX_SHARDS > 1 (rebalanced on every rebuild)"""
+        if config.JOB_INDEX_SHARDS <= 1:
+            return None
+        sharded_index = ShardedJobIndex(config.JOB_INDEX_SHARDS, config.JOB_SHARD_STRATEGY)
+        sharded_index.build(job_vectors, catalog)
+        return sharded_index
+
+    def _install_index(self, catalog: JobCatalog, vectorizer, job_vectors, counts=None):
+        """
+        Swap in a new index version with a single assignment
+
+        Queries that already pinned the previous version finish on it; its
+        shard workers are stopped when the last of them releases it.
+        Term counts, when given, are turned into the BM25 inverted index.
+        """
+        bm25 = None
+        if counts is not None:
+            with metrics.timer("vectorize_seconds", "TF-IDF vectorization time", target="bm25"):
+                bm25 = BM25Index(counts, vectorizer.vocabulary_, vectorizer.build_analyzer(),
+                                 config.BM25_K1, config.BM25_B)
+        sharded_index = None
+        if bm25 is None:
+            sharded_index = self._build_sharded_index(job_vectors, catalog)
+        elif config.JOB_INDEX_SHARDS > 1:
+            logger.info("JOB_INDEX_SHARDS is ignored with MATCH_SCORER=bm25; queries read the inverted index")
+        index = JobIndex(catalog, vectorizer, job_vectors, sharded_index, self.index_version + 1, bm25)
+        with self._pin_lock:
+            previous, self.index = self.index, index
+            if previous is not None and self._pins.get(previous.version):
+                self._retired[previous.version] = previous
+                previous = None
+        # Candidate vectors live in the job vocabulary and must be rebuilt with it
+        self.candidate_vectors = None
+        if self.match_cache is not None:
+            self.match_cache.clear()
+        if previous is not None and previous.sharded_index is not None:
+            previous.sharded_index.close()
+
+    @contextmanager
+    def _pinned_index(self) -> Iterator[Optional[JobIndex]]:
+        """The current index version, kept open until the block exits even if a rebuild replaces it"""
+        with self._pin_lock:
+            index = self.index
+            if index is not None:
+                self._pins[index.version] = self._pins.get(index.version, 0) + 1
         try:
-            jobs = list(self.collection.find({}, {"_id": 0}))
-            if not jobs:
-                st.error("No jobs found in database. Please run Task 2 first.")
-                return False
-            
-            self.job_documents = []
-            for job in jobs:
-                job_text = f"""
-                {job.get('title', '')} {job.get('category', '')} 
-                {' '.join(self._extract_strings(job.get('technical_skills', [])))}
-                {' '.join(self._extract_strings(job.get('soft_skills', [])))}
-                {' '.join(self._extract_strings(job.get('responsibilities', [])))}
-                {' '.join(self._extract_strings(job.get('keywords', [])))}
-                {job.get('job_summary', '')}
-                """.strip()
-                
-                self.job_documents.append({
-                    'job_data': job,
-                    'text': job_text
-                })
-            
-            job_texts = [doc['text'] for doc in self.job_documents]
-            self.job_vectors = self.vectorizer.fit_transform(job_texts)
-            logger.info(f"Loaded and vectorized {len(jobs)} jobs")
-            return True
-            
+            yield index
+        finally:
+            if index is not None:
+                with self._pin_lock:
+                    self._pins[index.version] -= 1
+                    retired = None
+                    if not self._pins[index.version]:
+                        del self._pins[index.version]
+                        retired = self._retired.pop(index.version, None)
+                if retired is not None and retired.sharded_index is not None:
+                    retired.sharded_index.close()
+
+    def _match_cache_key(self, processed_resume: ProcessedResume, index: JobIndex) -> tuple:
+        return (resume_fingerprint(processed_resume), index.version)
+
+    def _load_job_snapshot(self) -> bool:
+        """
+        Load the job index from JOB_SNAPSHOT_PATH when one is configured and current
+
+        The snapshot must have been exported at the collection's current
+        watermark (job count and newest processed_at); otherwise jobs ingested
+        or removed since would be missed and the index is built from MongoDB.
+        """
+        path = config.JOB_SNAPSHOT_PATH
+        if not path or not os.path.isdir(path):
+            return False
+        if config.MATCH_SCORER == "bm25":
+            logger.info("Job snapshots hold no term counts for BM25; building the index from MongoDB")
+            return False
+        try:
+            catalog, vocabulary, idf, job_vectors = read_job_snapshot(path, collection_watermark(self.collection))
+        except Exception as e:
+            logger.warning(f"Ignoring job snapshot at {path}: {e}")
+            return False
+        vectorizer = self._create_vectorizer()
+        vectorizer.vocabulary_ = vocabulary
+        vectorizer.idf_ = idf
+        self._install_index(catalog, vectorizer, job_vectors)
+        return True
+
+    def export_job_snapshot(self, path: str) -> Dict[str, Any]:
+        """Write the loaded job index to an Arrow snapshot directory"""
+        index = self.index
+        return write_job_snapshot(path, index.catalog, index.vectorizer, index.job_vectors)
+
+    def _build_index(self, use_snapshot: bool = True) -> bool:
+        """
+        Load (from the snapshot unless use_snapshot is False, else MongoDB) and
+        install a new index version
+
+        Returns whether an index was installed. The current index keeps
+        serving queries until then.
+        """
+        with self._build_lock:
+            self._building = True
+            try:
+                if use_snapshot and self._load_job_snapshot():
+                    self._build_error = None
+                    return True
+                loaded = self._load_job_documents()
+                if loaded is None:
+                    self._build_error = "No jobs found"
+                    return False
+                self._vectorize_job_documents(*loaded)
+                self._build_error = None
+                return True
+            except Exception as e:
+                self._build_error = str(e)
+                raise
+            finally:
+                self._building = False
+
+    def load_and_vectorize_jobs(self, use_snapshot: bool = True) -> bool:
+        """Load jobs (from the snapshot unless use_snapshot is False, else MongoDB) and create TF-IDF vectors"""
+        try:
+            return self._build_index(use_snapshot)
         except Exception as e:
             logger.error(f"Error loading jobs: {e}")
-            st.error(f"Error loading jobs from database: {e}")
             return False
-        
-    # def load_and_vectorize_jobs(self):
-    #     """Load jobs from MongoDB and create TF-IDF vectors"""
-    #     try:
-    #         jobs = list(self.collection.find({}, {"_id": 0}))
-    #         if not jobs:
-    #             st.error("No jobs found in database. Please run Task 2 first.")
-        #         return False
-            
-        #     self.job_documents = []
-        #     for job in jobs:
-        #         job_text = f"""
-        #         {job.get('title', '')} {job.get('category', '')} 
-        #         {' '.join(job.get('technical_skills', []))} 
-        #         {' '.join(job.get('soft_skills', []))} 
-        #         {' '.join(job.get('responsibilities', []))} 
-        #         {' '.join(job.get('keywords', []))}
-        #         {job.get('job_summary', '')}
-        #         """.strip()
-                
-        #         self.job_documents.append({
-        #             'job_data': job,
-        #             'text': job_text
-        #         })
-            
-        #     job_texts = [doc['text'] for doc in self.job_documents]
-        #     self.job_vectors = self.vectorizer.fit_transform(job_texts)
-        #     logger.info(f"Loaded and vectorized {len(jobs)} jobs")
-        #     return True
-            
-        # except Exception as e:
-        #     logger.error(f"Error loading jobs: {e}")
-        #     st.error(f"Error loading jobs from database: {e}")
-        #     return False
+
+    def _ensure_index(self) -> Optional[JobIndex]:
+        """The current index, waiting for a build in progress (or running one) when there is none yet"""
+        if self.index is None:
+            with self._build_lock:
+                if self.index is None:
+                    self.load_and_vectorize_jobs()
+        return self.index
+
+    def start_warm_up(self, use_snapshot: bool = True) -> threading.Thread:
+        """
+        Build (or rebuild) the job index on a background thread
+
+        Queries keep using the current index, or wait for this build when
+        there is none yet. Calling it while a warm-up runs returns that thread.
+        """
+        # Concurrent /reload requests must not both see no live thread and start two builds
+        with self._warm_up_lock:
+            if self._warm_up_thread is None or not self._warm_up_thread.is_alive():
+                self._warm_up_thread = threading.Thread(target=self.load_and_vectorize_jobs, args=(use_snapshot,),
+                                                        name="job-index-warm-up", daemon=True)
+                self._warm_up_thread.start()
+            return self._warm_up_thread
+
+    def index_status(self) -> Dict[str, Any]:
+        """Readiness of the job index: whether one is serving, whether a build is running, and its size"""
+        index = self.index
+        return {
+            "ready": index is not None,
+            "building": self._building,
+            "version": index.version if index is not None else 0,
+            "jobs": len(index.catalog) if index is not None else 0,
+            "error": self._build_error,
+        }
     
     def process_resume_with_llm(self, resume_text: str) -> Optional[ProcessedResume]:
-        """Process resume using LLM to extract structured information"""
+        """Process resume to extract structured information, using the LLM only where rules fall short"""
         try:
-            prompt = f"""
-            Analyze the following resume and extract structured information. 
-            Return the information in JSON format with the following exact keys:
-
-            Resume Text:
-            {resume_text}
-
-            Extract and return JSON with these keys:
-            {{
-                "name": "full name of the person",
-                "email": "email address",
-                "phone": "phone number",
-                "location": "city, state or location",
-                "summary": "professional summary or objective",
-                "experience_years": "total years of experience or estimate",
-                "education": ["degree", "university", "certifications"],
-                "technical_skills": ["programming languages", "tools", "technologies"],
-                "soft_skills": ["communication", "leadership", "teamwork"],
-                "work_experience": ["job titles", "companies", "key achievements"],
-                "certifications": ["professional certifications", "licenses"],
-                "keywords": ["relevant keywords for job matching"]
-            }}
-
-            Guidelines:
-            - Extract only information that is explicitly mentioned
-            - For technical_skills, focus on hard skills, tools, and technologies
-            - For keywords, include important terms that would help in job matching
-            - If information is not available, use empty array [] or "Not specified"
-            - Return only valid JSON, no additional text
-            """
+            extracted_data = {}
+            pending = list(RESUME_EXTRACTION_SCHEMA['properties'])
+            if config.RESUME_PARSER_MODE in ("hybrid", "rules"):
+                extracted_data, pending = self._get_resume_parser().parse(resume_text)
+                logger.info(f"Rule-based parser filled {len(extracted_data)} field(s), undetermined: {pending}")
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume parser. Extract structured information and return only valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.3
-            )
-            
-            extracted_text = response.choices[0].message.content.strip()
-            start_idx = extracted_text.find('{')
-            end_idx = extracted_text.rfind('}')
-            if start_idx != -1 and end_idx != -1:
-                extracted_text = extracted_text[start_idx:end_idx + 1]
+            if pending and config.RESUME_PARSER_MODE != "rules":
+                prompt_text = prepare_for_prompt(resume_text, config.RESUME_TOKEN_BUDGET)
+                if extracted_data:
+                    # Only ask for what the rules could not determine
+                    schema = subschema(RESUME_EXTRACTION_SCHEMA, pending)
+                    prompt = build_field_repair_prompt(pending, RESUME_EXTRACTION_SCHEMA, "Resume Text", prompt_text)
+                else:
+                    schema = RESUME_EXTRACTION_SCHEMA
+                    prompt = f"""
+                    Analyze the following resume and extract structured information. 
+                    Return the information in JSON format with the following exact keys:
+
+                    Resume Text:
+                    {prompt_text}
+
+                    Extract and return JSON with these keys:
+                    {{
+                        "name": "full name of the person",
+                        "email": "email address",
+                        "phone": "phone number",
+                        "location": "city, state or location",
+                        "summary": "professional summary or objective",
+                        "experience_years": "total years of experience or estimate",
+                        "education": ["degree", "university", "certifications"],
+                        "technical_skills": ["programming languages", "tools", "technologies"],
+                        "soft_skills": ["communication", "leadership", "teamwork"],
+                        "work_experience": ["job titles", "companies", "key achievements"],
+                        "certifications": ["professional certifications", "licenses"],
+                        "keywords": ["relevant keywords for job matching"]
+                    }}
+
+                    Guidelines:
+                    - Extract only information that is explicitly mentioned
+                    - For technical_skills, focus on hard skills, tools, and technologies
+                    - For keywords, include important terms that would help in job matching
+                    - If information is not available, use empty array [] or "Not specified"
+                    - Return only valid JSON, no additional text
+                    """
+                
+                llm_data = extract_structured(
+                    self.client,
+                    model=config.EXTRACTION_MODEL,
+                    system_prompt="You are an expert resume parser. Extract structured information and return only valid JSON.",
+                    prompt=prompt,
+                    schema=schema,
+                    schema_name="resume",
+                    source_label="Resume Text",
+                    source_text=prompt_text,
+                    max_tokens=1500,
+                    temperature=0.3
+                )
+                extracted_data.update(llm_data)
             
-            extracted_data = json.loads(extracted_text)
+            if not extracted_data:
+                logger.error("No valid fields extracted from resume")
+                return None
             
             processed_resume = ProcessedResume(
                 name=extracted_data.get('name', 'Not specified'),
@@ -194,62 +470,392 @@ class RAGJobMatcher:
             logger.error(f"Error processing resume with LLM: {e}")
             return None
     
-    def find_matching_jobs(self, processed_resume: ProcessedResume, top_k: int = 10) -> List[JobMatch]:
-        """Find matching jobs using RAG approach"""
-        try:
-            if self.job_vectors is None:
-                if not self.load_and_vectorize_jobs():
-                    return []
-            
-            resume_text = f"""
+    def _build_resume_text(self, processed_resume: ProcessedResume) -> str:
+        """Build the query text for a processed resume"""
+        return f"""
             {processed_resume.summary}
             {' '.join(self._extract_strings(processed_resume.technical_skills))}
             {' '.join(self._extract_strings(processed_resume.soft_skills))}
             {' '.join(self._extract_strings(processed_resume.work_experience))}
             {' '.join(self._extract_strings(processed_resume.keywords))}
             """
+
+    def _resume_skill_ids(self, processed_resume: ProcessedResume, catalog: Optional[JobCatalog] = None) -> set:
+        """Catalog skill ids of a resume's technical skills"""
+        catalog = self.catalog if catalog is None else catalog
+        return catalog.lookup_skill_ids(self._extract_strings(processed_resume.technical_skills))
+
+    def _build_job_match(self, processed_resume: ProcessedResume, idx: int, similarity_score: float,
+                         resume_skill_ids: Optional[set] = None, rank_score: Optional[float] = None,
+                         catalog: Optional[JobCatalog] = None) -> JobMatch:
+        """Materialize a JobMatch for the job at row idx"""
+        catalog = self.catalog if catalog is None else catalog
+        job = catalog.row(idx)
+        if resume_skill_ids is None:
+            resume_skill_ids = self._resume_skill_ids(processed_resume, catalog)
+        matching_skills, missing_skills = catalog.skill_overlap(job.index, resume_skill_ids)
+        
+        match_reasons = self._generate_match_reasons(
+            processed_resume, job, similarity_score, matching_skills
+        )
+        
+        return JobMatch(
+            job_id=job['job_id'],
+            title=job['title'],
+            category=job['category'],
+            company_type=job['company_type'],
+            location=job['location'],
+            similarity_score=float(similarity_score),
+            matching_skills=matching_skills,
+            missing_skills=missing_skills[:5],
+            job_summary=job['job_summary'],
+            salary_range=job['salary_range'] or 'Not specified',
+            match_reasons=match_reasons,
+            rank_score=float(similarity_score if rank_score is None else rank_score)
+        )
+
+    def _pool_size(self, top_k: int, catalog: Optional[JobCatalog] = None) -> int:
+        """Candidates kept from the cosine stage (with slack for collapsed near-duplicates)"""
+        pool_size = self.reranker.pool_size(top_k) if self.reranker else top_k
+        catalog = self.catalog if catalog is None else catalog
+        if catalog is not None and catalog.has_duplicates:
+            pool_size = max(pool_size, top_k * DUPLICATE_POOL_FACTOR)
+        return pool_size
+
+    def _rank_candidates(self, processed_resume: ProcessedResume, scores: "np.ndarray", indices: "np.ndarray",
+                         top_k: int, resume_skill_ids: set, catalog: JobCatalog) -> List[JobMatch]:
+        """
+        Rerank the cosine candidates (when enabled), keep the best posting of
+        each near-duplicate cluster and build JobMatch results for the top_k
+        """
+        rank_scores = scores
+        if self.reranker is not None:
+            rank_scores, indices, scores = self.reranker.rerank(
+                catalog, indices, scores, processed_resume, resume_skill_ids, len(indices)
+            )
+        keep = catalog.collapse_duplicates(indices)[:top_k]
+        return [self._build_job_match(processed_resume, idx, score, resume_skill_ids, rank_score, catalog)
+                for rank_score, idx, score in zip(rank_scores[keep], indices[keep], scores[keep])]
+
+    @staticmethod
+    def _top_k(scores: "np.ndarray", indices: "np.ndarray", top_k: int):
+        """Return the top_k (scores, indices) pairs in descending score order"""
+        if len(scores) > top_k:
+            keep = np.argpartition(scores, -top_k)[-top_k:]
+            scores, indices = scores[keep], indices[keep]
+        order = np.argsort(scores)[::-1]
+        return scores[order], indices[order]
+
+    def iter_matching_jobs(self, processed_resume: ProcessedResume, top_k: int = 10,
+                           chunk_size: int = 2000) -> Iterator[MatchProgress]:
+        """
+        Find matching jobs, yielding stage progress and partial top-k results
+
+        The job matrix is scored in chunks of chunk_size rows, keeping the best
+        cosine candidates (the reranker's pool); after each chunk the reranked
+        best matches seen so far are yielded so a UI can render them early.
+        The last event has stage "done" and holds the final matches.
+        
+        With the match cache enabled a repeated resume is answered from the
+        cache without scoring; on a miss the ranking is computed deep enough
+        (MATCH_CACHE_DEPTH) to answer later requests for fewer matches too.
+        The whole query runs against the index version current when it starts.
+        """
+        try:
+            if self.index is None:
+                yield MatchProgress("loading", 0.05, "Loading job catalog...")
+                # Builds (or waits for a warm-up already running) without yielding, so a
+                # consumer that stops reading here cannot leave the build lock held
+                self._ensure_index()
+                if self.index is not None:
+                    yield MatchProgress("vectorizing", 0.3, f"Indexed {len(self.index.catalog)} jobs")
+            with self._pinned_index() as index:
+                if index is None:
+                    yield MatchProgress("done", 1.0, "No jobs available", done=True)
+                    return
+                yield from self._iter_scored_matches(processed_resume, index, top_k, chunk_size)
+        except Exception as e:
+            logger.error(f"Error finding matching jobs: {e}")
+            yield MatchProgress("done", 1.0, "Matching failed", done=True)
+
+    def _iter_scored_matches(self, processed_resume: ProcessedResume, index: JobIndex, top_k: int,
+                             chunk_size: int) -> Iterator[MatchProgress]:
+        """Scoring part of iter_matching_jobs, on a pinned index version"""
+        catalog = index.catalog
+        
+        cache_key = fetch_k = None
+        if self.match_cache is not None:
+            cache_key = self._match_cache_key(processed_resume, index)
+            cached = self.match_cache.get(cache_key, top_k)
+            metrics.counter("match_cache_requests_total", "Match cache lookups").inc(
+                result="miss" if cached is None else "hit")
+            if cached is not None:
+                yield MatchProgress("done", 1.0, "Served from cache", cached, done=True)
+                return
+            fetch_k = self.match_cache.fetch_size(top_k)
+        requested_k, top_k = top_k, fetch_k or top_k
+        
+        # Time only the scoring work, not the consumer's handling of yielded events
+        scoring_started = time.perf_counter()
+        resume_text = self._build_resume_text(processed_resume)
+        resume_skill_ids = self._resume_skill_ids(processed_resume, catalog)
+        num_jobs = index.job_vectors.shape[0]
+        pool_size = self._pool_size(top_k, catalog)
+        best_scores = np.empty(0)
+        best_indices = np.empty(0, dtype=np.int64)
+        scoring_time = 0.0
+        
+        if index.bm25 is not None:
+            # Only the resume's terms' postings are read, so there are no partial results to stream
+            best_scores, best_indices = index.bm25.search(resume_text, pool_size)
+            scoring_time = time.perf_counter() - scoring_started
+        elif index.sharded_index is not None:
+            # Shards score in parallel, so there are no partial results to stream
+            resume_vector = index.vectorizer.transform([resume_text])
+            best_scores, best_indices = index.sharded_index.top_k(resume_vector, pool_size)[0]
+            scoring_time = time.perf_counter() - scoring_started
+        else:
+            resume_vector = index.vectorizer.transform([resume_text])
+            for start in range(0, num_jobs, chunk_size):
+                end = min(start + chunk_size, num_jobs)
+                chunk_scores = sklearn_pairwise.cosine_similarity(resume_vector, index.job_vectors[start:end]).flatten()
+                best_scores, best_indices = self._top_k(
+                    np.concatenate([best_scores, chunk_scores]),
+                    np.concatenate([best_indices, np.arange(start, end)]),
+                    pool_size
+                )
+                scoring_time += time.perf_counter() - scoring_started
+                if end < num_jobs:
+                    partial = self._rank_candidates(processed_resume, best_scores, best_indices,
+                                                    top_k, resume_skill_ids, catalog)[:requested_k]
+                    yield MatchProgress("scoring", 0.4 + 0.6 * end / num_jobs,
+                                        f"Scored {end}/{num_jobs} jobs", partial)
+                scoring_started = time.perf_counter()
+        
+        metrics.histogram("scoring_seconds", "Similarity scoring time").observe(scoring_time, mode="single", status="ok")
+        matches = self._rank_candidates(processed_resume, best_scores, best_indices, top_k,
+                                        resume_skill_ids, catalog)
+        if cache_key is not None:
+            self.match_cache.put(cache_key, fetch_k, matches)
+        yield MatchProgress("done", 1.0, f"Scored {num_jobs} jobs", matches[:requested_k], done=True)
+        
+
+    def find_matching_jobs(self, processed_resume: ProcessedResume, top_k: int = 10) -> List[JobMatch]:
+        """Find matching jobs using RAG approach"""
+        matches = []
+        for event in self.iter_matching_jobs(processed_resume, top_k):
+            matches = event.matches
+        return matches
+
+    @staticmethod
+    def _search_bm25(index: JobIndex, text: str, k: int):
+        """BM25 candidates for one batched resume, or the exception its search raised"""
+        try:
+            return index.bm25.search(text, k)
+        except Exception as e:
+            return e
+
+    def find_matching_jobs_batch(self, processed_resumes: List[ProcessedResume],
+                                 top_k: int = 10) -> List[List[JobMatch]]:
+        """
+        Score several resumes against the job index with one sparse matrix multiply
+
+        TF-IDF rows are L2-normalized, so the product of the resume matrix and
+        the transposed job matrix is the cosine similarity of every pair
+        (with MATCH_SCORER=bm25 each resume is a BM25 search instead).
+        Resumes answered by the match cache are left out of the multiply.
+        """
+        if not processed_resumes:
+            return []
+        try:
+            if self._ensure_index() is None:
+                return [[] for _ in processed_resumes]
+            with self._pinned_index() as index:
+                results: List[Optional[List[JobMatch]]] = [None] * len(processed_resumes)
+                cache_keys = [None] * len(processed_resumes)
+                fetch_k = top_k
+                if self.match_cache is not None:
+                    cache_requests = metrics.counter("match_cache_requests_total", "Match cache lookups")
+                    for position, resume in enumerate(processed_resumes):
+                        cache_keys[position] = self._match_cache_key(resume, index)
+                        results[position] = self.match_cache.get(cache_keys[position], top_k)
+                        cache_requests.inc(result="miss" if results[position] is None else "hit")
+                    fetch_k = self.match_cache.fetch_size(top_k)
+                pending = [position for position, matches in enumerate(results) if matches is None]
+                if not pending:
+                    return results
             
-            resume_vector = self.vectorizer.transform([resume_text])
-            similarities = cosine_similarity(resume_vector, self.job_vectors).flatten()
-            top_indices = np.argsort(similarities)[::-1][:top_k]
+                pool_size = self._pool_size(fetch_k, index.catalog)
+                with metrics.timer("scoring_seconds", "Similarity scoring time", mode="batch"):
+                    resume_texts = [self._build_resume_text(processed_resumes[position]) for position in pending]
+                    if index.bm25 is not None:
+                        candidates = [self._search_bm25(index, text, pool_size) for text in resume_texts]
+                    elif index.sharded_index is not None:
+                        candidates = index.sharded_index.top_k(index.vectorizer.transform(resume_texts), pool_size)
+                    else:
+                        resume_vectors = index.vectorizer.transform(resume_texts)
+                        scores = (resume_vectors @ index.job_vectors.T).toarray()
+                        all_indices = np.arange(scores.shape[1])
+                        candidates = [self._top_k(row, all_indices, pool_size) for row in scores]
+                metrics.histogram("match_batch_size", "Resumes per scoring batch", buckets=(1, 2, 4, 8, 16, 32, 64, 128)).observe(len(pending))
+            
+                for position, candidate in zip(pending, candidates):
+                    # A resume that fails here gets no matches without costing the rest of the batch theirs
+                    resume = processed_resumes[position]
+                    try:
+                        if isinstance(candidate, Exception):
+                            raise candidate
+                        best_scores, best_indices = candidate
+                        matches = self._rank_candidates(resume, best_scores, best_indices, fetch_k,
+                                                        self._resume_skill_ids(resume, index.catalog), index.catalog)
+                    except Exception as e:
+                        logger.error(f"Error ranking matches for batched resume {position}: {e}")
+                        results[position] = []
+                        continue
+                    if cache_keys[position] is not None:
+                        self.match_cache.put(cache_keys[position], fetch_k, matches)
+                    results[position] = matches[:top_k]
+                return results
+            
+        except Exception as e:
+            logger.error(f"Error finding matching jobs for batch: {e}")
+            return [[] for _ in processed_resumes]
+
+    @staticmethod
+    def resume_content_hash(resume_text: str) -> str:
+        """Hash resume text with whitespace and case normalized, for deduplication"""
+        normalized = ' '.join(resume_text.lower().split())
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def store_resume(self, processed_resume: ProcessedResume) -> Optional[str]:
+        """
+        Store a processed resume, deduplicated by content hash
+
+        Returns:
+            Optional[str]: Resume id (the content hash) or None if storing failed
+        """
+        try:
+            content_hash = self.resume_content_hash(processed_resume.resume_text)
+            resume_doc = asdict(processed_resume)
+            resume_doc['content_hash'] = content_hash
+            with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="store_resume"):
+                self.resume_collection.replace_one({"content_hash": content_hash}, resume_doc, upsert=True)
+            logger.info(f"Stored resume {content_hash[:12]}")
+            self._add_candidate(content_hash, processed_resume)
+            return content_hash
+        except Exception as e:
+            logger.error(f"Error storing resume: {e}")
+            return None
+
+    def _add_candidate(self, resume_id: str, processed_resume: ProcessedResume):
+        """Add a stored resume to the loaded candidate vectors (replacing its row if it was stored before)"""
+        index = self.index
+        if index is None:
+            return
+        # Loaded candidates are kept without their raw text
+        resume = replace(processed_resume, resume_text="")
+        vector = index.vectorizer.transform([self._build_resume_text(resume)])
+        with self._candidate_lock:
+            if self.candidate_vectors is None or self._candidate_index_version != index.version:
+                # Not loaded for this index version; the next load reads the resume from MongoDB
+                return
+            documents = list(self.candidate_documents)
+            vectors = self.candidate_vectors
+            row = next((i for i, candidate in enumerate(documents) if candidate['resume_id'] == resume_id), None)
+            if row is None:
+                documents.append({'resume_id': resume_id, 'resume': resume})
+                vectors = scipy_sparse.vstack([vectors, vector], format="csr")
+            else:
+                documents[row] = {'resume_id': resume_id, 'resume': resume}
+                vectors = scipy_sparse.vstack([vectors[:row], vector, vectors[row + 1:]], format="csr")
+            self.candidate_documents = documents
+            self.candidate_vectors = vectors
+
+    def load_and_vectorize_candidates(self) -> bool:
+        """Load stored resumes and vectorize them in the job index vocabulary"""
+        try:
+            index = self._ensure_index()
+            if index is None:
+                return False
+            
+            with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="load_resumes"):
+                resumes = list(self.resume_collection.find({}, {"_id": 0, "resume_text": 0}))
+            candidate_documents = []
+            candidate_texts = []
+            for resume_doc in resumes:
+                try:
+                    resume = resume_from_dict(resume_doc)
+                except ValueError as e:
+                    logger.warning(f"Skipping stored resume {resume_doc.get('content_hash', '')[:12]}: {e}")
+                    continue
+                candidate_documents.append({
+                    'resume_id': resume_doc.get('content_hash', ''),
+                    'resume': resume
+                })
+                candidate_texts.append(self._build_resume_text(resume))
+            
+            if candidate_texts:
+                with metrics.timer("vectorize_seconds", "TF-IDF vectorization time", target="candidates"):
+                    candidate_vectors = index.vectorizer.transform(candidate_texts)
+            else:
+                # No resumes stored yet: an empty pool that store_resume appends to
+                candidate_vectors = scipy_sparse.csr_matrix((0, len(index.vectorizer.vocabulary_)))
+            with self._candidate_lock:
+                self.candidate_documents = candidate_documents
+                self.candidate_vectors = candidate_vectors
+                self._candidate_index_version = index.version
+            logger.info(f"Loaded and vectorized {len(candidate_documents)} candidates")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error loading candidates: {e}")
+            return False
+
+    def find_matching_candidates(self, job_id: str, top_k: int = 10) -> List[CandidateMatch]:
+        """Rank stored candidates for a job posting"""
+        try:
+            index = self.index
+            if self.candidate_vectors is None or index is None or self._candidate_index_version != index.version:
+                if not self.load_and_vectorize_candidates():
+                    return []
+                index = self.index
+            
+            row = index.catalog.row_of(job_id)
+            if row is None:
+                logger.warning(f"Job {job_id} is not in the job index")
+                return []
+            candidate_vectors = self.candidate_vectors
+            candidate_documents = self.candidate_documents
+            if not candidate_documents:
+                return []
+            
+            with metrics.timer("scoring_seconds", "Similarity scoring time", mode="candidates"):
+                scores = (candidate_vectors @ index.job_vectors[row].T).toarray().ravel()
+            best_scores, best_indices = self._top_k(scores, np.arange(len(scores)), top_k)
             
             matches = []
-            for idx in top_indices:
-                job_data = self.job_documents[idx]['job_data']
-                similarity_score = similarities[idx]
-                
-                resume_skills = set([skill.lower() for skill in self._extract_strings(processed_resume.technical_skills)])
-                job_skills = set([skill.lower() for skill in self._extract_strings(job_data.get('technical_skills', []))])
-                
-                matching_skills = list(resume_skills.intersection(job_skills))
-                missing_skills = list(job_skills.difference(resume_skills))
-                
-                match_reasons = self._generate_match_reasons(
-                    processed_resume, job_data, similarity_score, matching_skills
-                )
-                
-                match = JobMatch(
-                    job_id=job_data.get('job_id', ''),
-                    title=job_data.get('title', ''),
-                    category=job_data.get('category', ''),
-                    company_type=job_data.get('company_type', ''),
-                    location=job_data.get('location', ''),
-                    similarity_score=similarity_score,
+            for score, idx in zip(best_scores, best_indices):
+                candidate = candidate_documents[idx]
+                resume = candidate['resume']
+                matching_skills, missing_skills = index.catalog.skill_overlap(row, self._resume_skill_ids(resume, index.catalog))
+                matches.append(CandidateMatch(
+                    resume_id=candidate['resume_id'],
+                    name=resume.name,
+                    email=resume.email,
+                    location=resume.location,
+                    experience_years=resume.experience_years,
+                    similarity_score=float(score),
                     matching_skills=matching_skills,
                     missing_skills=missing_skills[:5],
-                    job_summary=job_data.get('job_summary', ''),
-                    salary_range=job_data.get('salary_range', 'Not specified'),
-                    match_reasons=match_reasons
-                )
-                
-                matches.append(match)
-            
+                    summary=resume.summary
+                ))
             return matches
             
         except Exception as e:
-            logger.error(f"Error finding matching jobs: {e}")
+            logger.error(f"Error finding matching candidates: {e}")
             return []
-    def _generate_match_reasons(self, resume: ProcessedResume, job: Dict, 
+
+    def _generate_match_reasons(self, resume: ProcessedResume, job: Union[Dict, JobRow], 
                               similarity_score: float, matching_skills: List[str]) -> List[str]:
         """Generate human-readable match reasons"""
         reasons = []
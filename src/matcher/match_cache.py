@@ -0,0 +1,84 @@
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Hashable, List, Optional, Tuple
+from .models import JobMatch, ProcessedResume
+
+# Resume fields that do not influence matching
+_UNRANKED_FIELDS = ("resume_text", "processed_at")
+
+
+def resume_fingerprint(processed_resume: ProcessedResume) -> str:
+    """Hash the resume fields that feed scoring, reranking and match reasons"""
+    fields = asdict(processed_resume)
+    for name in _UNRANKED_FIELDS:
+        fields.pop(name, None)
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class MatchCache:
+    """
+    Bounded LRU of ranked job matches with a time-to-live
+
+    Entries hold a ranked list at least `depth` long, so a later request for
+    any smaller top_k is answered by slicing. Keys include the job index
+    version, and clear() is called whenever the index is rebuilt.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600.0, depth: int = 50):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted
+            ttl_seconds (float): Entry lifetime (0 keeps entries until evicted)
+            depth (int): Minimum number of matches computed and stored per entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.depth = depth
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, List[JobMatch]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch_size(self, top_k: int) -> int:
+        """Matches to compute on a miss so smaller requests can be sliced"""
+        return max(top_k, self.depth)
+
+    def get(self, key: Hashable, top_k: int) -> Optional[List[JobMatch]]:
+        """
+        Return the cached top_k matches, or None on a miss
+
+        An entry shorter than top_k only answers if the index had no more
+        matches to give (it was computed with a larger fetch size).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, fetched, matches = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            if top_k > fetched:
+                return None
+            self._entries.move_to_end(key)
+            return matches[:top_k]
+
+    def put(self, key: Hashable, fetched: int, matches: List[JobMatch]):
+        """Store the ranked matches computed for a fetch size of `fetched`"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), fetched, list(matches))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry (the job index changed)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
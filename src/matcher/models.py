@@ -1,7 +1,8 @@
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, List
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedResume:
     """Data class for processed resume information"""
     name: str
@@ -19,7 +20,7 @@ class ProcessedResume:
     resume_text: str
     processed_at: str
 
-@dataclass
+@dataclass(slots=True)
 class JobMatch:
     """Data class for job matching results"""
     job_id: str
@@ -32,4 +33,72 @@ class JobMatch:
     missing_skills: List[str]
     job_summary: str
     salary_range: str
-    match_reasons: List[str]
\ No newline at end of file
+    match_reasons: List[str]
+    rank_score: float = 0.0
+
+@dataclass(slots=True)
+class MatchProgress:
+    """Progress event yielded while matching jobs"""
+    stage: str
+    progress: float
+    message: str
+    matches: List[JobMatch] = field(default_factory=list)
+    done: bool = False
+
+
+@dataclass(slots=True)
+class CandidateMatch:
+    """Data class for candidate ranking results"""
+    resume_id: str
+    name: str
+    email: str
+    location: str
+    experience_years: str
+    similarity_score: float
+    matching_skills: List[str]
+    missing_skills: List[str]
+    summary: str
+
+def _coerce_text(name: str, value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError(f"Resume field {name!r} must be a string, got {type(value).__name__}")
+
+
+def _coerce_list(name: str, value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value] if value else []
+    if not isinstance(value, list):
+        raise ValueError(f"Resume field {name!r} must be a list of strings, got {type(value).__name__}")
+    items = []
+    for item in value:
+        if isinstance(item, dict):
+            # LLM output sometimes nests entries as objects; keep their name (or first value)
+            item = item.get("name", next(iter(item.values()), ""))
+        items.append(_coerce_text(name, item))
+    return items
+
+
+def resume_from_dict(data: Dict[str, Any]) -> ProcessedResume:
+    """
+    Build a ProcessedResume from a dict (JSON payload or stored document), filling missing fields
+
+    Numbers are accepted as text and a lone string as a one-item list.
+
+    Raises:
+        ValueError: If data is not a dict or a field has an unusable type
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Resume must be an object, got {type(data).__name__}")
+    values = {}
+    for f in fields(ProcessedResume):
+        is_list = f.type == List[str]
+        value = data.get(f.name)
+        if value is None:
+            values[f.name] = [] if is_list else ""
+        else:
+            values[f.name] = _coerce_list(f.name, value) if is_list else _coerce_text(f.name, value)
+    values["processed_at"] = values["processed_at"] or datetime.now().isoformat()
+    return ProcessedResume(**values)
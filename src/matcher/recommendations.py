@@ -0,0 +1,200 @@
+import heapq
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from .job_matcher import RAGJobMatcher
+from src.utils.lazy import LazyModule
+
+np = LazyModule("numpy")
+pymongo = LazyModule("pymongo")
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_ID = "recommendations_watermark"
+
+
+class RecommendationStore:
+    """Materialized top-k job recommendations for every stored resume"""
+
+    def __init__(self, matcher: RAGJobMatcher, top_k: int = 20, resume_chunk_size: int = 2048):
+        """
+        Initialize the store
+
+        Args:
+            matcher (RAGJobMatcher): Matcher providing the job vocabulary and candidate index
+            top_k (int): Recommendations kept per resume
+            resume_chunk_size (int): Resumes scored per matrix multiply during a rebuild
+        """
+        self.matcher = matcher
+        self.top_k = top_k
+        self.resume_chunk_size = resume_chunk_size
+        self.collection = matcher.db.resume_recommendations
+        self.meta_collection = matcher.db.pipeline_state
+        self.collection.create_index("resume_id", unique=True)
+
+    def _ensure_candidates(self) -> bool:
+        if self.matcher.candidate_vectors is None:
+            return self.matcher.load_and_vectorize_candidates()
+        return True
+
+    def _write(self, recommendations: Dict[str, List[Dict[str, Any]]]) -> int:
+        """Replace the stored recommendations for the given resumes"""
+        if not recommendations:
+            return 0
+        now = datetime.now().isoformat()
+        operations = [
+            pymongo.ReplaceOne(
+                {"resume_id": resume_id},
+                {"resume_id": resume_id, "matches": matches, "updated_at": now},
+                upsert=True
+            )
+            for resume_id, matches in recommendations.items()
+        ]
+        self.collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def _set_watermark(self, processed_at: str):
+        self.meta_collection.update_one(
+            {"_id": WATERMARK_ID},
+            {"$set": {"processed_at": processed_at, "updated_at": datetime.now().isoformat()}},
+            upsert=True
+        )
+
+    def _score_against_index(self, vectors, exclude: Iterable[str] = ()) -> Iterable[List[tuple]]:
+        """
+        Score resume vectors against the whole job index in chunks, yielding
+        each resume's top-k as (score, job_id) pairs, best first
+
+        Jobs in exclude are left out (their scores are about to be replaced).
+        """
+        index = self.matcher.index
+        job_ids = index.catalog.job_ids
+        job_matrix_t = index.job_vectors.T
+        all_indices = np.arange(len(job_ids))
+        exclude = set(exclude)
+        keep = self.top_k + len(exclude)
+        for start in range(0, vectors.shape[0], self.resume_chunk_size):
+            scores = (vectors[start:start + self.resume_chunk_size] @ job_matrix_t).toarray()
+            for row in scores:
+                best_scores, best_indices = self.matcher._top_k(row, all_indices, keep)
+                yield [(float(score), job_ids[idx]) for score, idx in zip(best_scores, best_indices)
+                       if job_ids[idx] not in exclude][:self.top_k]
+
+    def rebuild_all(self) -> int:
+        """
+        Recompute every resume's top-k against the full job index
+
+        Returns:
+            int: Number of resumes written
+        """
+        # Always from MongoDB: a rebuild must see every job, not a snapshot's
+        if not self.matcher.load_and_vectorize_jobs(use_snapshot=False) or not self._ensure_candidates():
+            return 0
+
+        index = self.matcher.index
+        candidate_vectors = self.matcher.candidate_vectors
+        candidates = self.matcher.candidate_documents
+        written = 0
+        recommendations = {}
+        for candidate, best in zip(candidates, self._score_against_index(candidate_vectors)):
+            recommendations[candidate['resume_id']] = [{"job_id": job_id, "score": score} for score, job_id in best]
+            if len(recommendations) >= self.resume_chunk_size:
+                written += self._write(recommendations)
+                recommendations = {}
+        written += self._write(recommendations)
+
+        latest = max(index.catalog.columns['processed_at'], default='')
+        self._set_watermark(latest)
+        logger.info(f"Rebuilt recommendations for {written} resumes")
+        return written
+
+    def refresh_for_jobs(self, job_ids: Iterable[str]) -> int:
+        """
+        Score only the given (new or updated) jobs against all resumes and merge
+        them into each resume's stored top-k
+
+        Resumes with no stored recommendations yet (stored after the last
+        rebuild) are scored against the whole job index first, so their top-k
+        is complete rather than drawn from the new jobs alone.
+
+        Args:
+            job_ids (Iterable[str]): Job ids upserted since the last refresh
+
+        Returns:
+            int: Number of resumes whose recommendations changed
+        """
+        job_ids = list(dict.fromkeys(job_ids))
+        if not job_ids:
+            return 0
+        if self.matcher.job_vectors is None and not self.matcher.load_and_vectorize_jobs():
+            return 0
+        if not self._ensure_candidates():
+            return 0
+        candidate_vectors = self.matcher.candidate_vectors
+        # A resume stored meanwhile may be in the documents but not yet in the vectors
+        candidates = self.matcher.candidate_documents[:candidate_vectors.shape[0]]
+        if not candidates:
+            return 0
+
+        jobs = list(self.matcher.collection.find({"job_id": {"$in": job_ids}}, {"_id": 0, "original_description": 0}))
+        if not jobs:
+            return 0
+
+        # New jobs are projected into the existing vocabulary; rebuild_all refits it
+        new_ids = [job.get('job_id', '') for job in jobs]
+        new_vectors = self.matcher.vectorizer.transform([self.matcher._job_match_input(job) for job in jobs])
+        scores = (candidate_vectors @ new_vectors.T).toarray()
+
+        resume_ids = [candidate['resume_id'] for candidate in candidates]
+        existing = {
+            doc["resume_id"]: doc.get("matches", [])
+            for doc in self.collection.find({"resume_id": {"$in": resume_ids}}, {"_id": 0, "resume_id": 1, "matches": 1})
+        }
+
+        refreshed = set(new_ids)
+        unmaterialized = [row for row, resume_id in enumerate(resume_ids) if resume_id not in existing]
+        full_scores = {}
+        if unmaterialized:
+            best_lists = self._score_against_index(candidate_vectors[unmaterialized], exclude=refreshed)
+            full_scores = dict(zip(unmaterialized, best_lists))
+            logger.info(f"Scoring {len(unmaterialized)} resume(s) without recommendations against all jobs")
+
+        recommendations = {}
+        for row, (resume_id, new_scores) in enumerate(zip(resume_ids, scores)):
+            current = existing.get(resume_id)
+            if current is None:
+                heap = full_scores[row]
+            else:
+                # Updated jobs replace their old entry instead of appearing twice
+                heap = [(match["score"], match["job_id"]) for match in current if match["job_id"] not in refreshed]
+            heap.extend((float(score), job_id) for score, job_id in zip(new_scores, new_ids))
+            merged = heapq.nlargest(self.top_k, heap)
+            new_matches = [{"job_id": job_id, "score": score} for score, job_id in merged]
+            if new_matches != current:
+                recommendations[resume_id] = new_matches
+
+        written = self._write(recommendations)
+        latest = max((job.get('processed_at', '') for job in jobs), default='')
+        if latest:
+            self._set_watermark(max(latest, self.get_watermark() or ''))
+        logger.info(f"Merged {len(jobs)} new job(s) into recommendations for {written} resume(s)")
+        return written
+
+    def get_watermark(self) -> Optional[str]:
+        """Return the processed_at timestamp of the newest job already merged"""
+        state = self.meta_collection.find_one({"_id": WATERMARK_ID})
+        return state.get("processed_at") if state else None
+
+    def refresh_since_watermark(self) -> int:
+        """Merge every job processed after the stored watermark (rebuild if there is none)"""
+        watermark = self.get_watermark()
+        if not watermark:
+            return self.rebuild_all()
+        job_ids = [job["job_id"] for job in
+                   self.matcher.collection.find({"processed_at": {"$gt": watermark}}, {"_id": 0, "job_id": 1})]
+        return self.refresh_for_jobs(job_ids)
+
+    def get_recommendations(self, resume_id: str) -> List[Dict[str, Any]]:
+        """Return the materialized matches ({job_id, score}) for a resume"""
+        doc = self.collection.find_one({"resume_id": resume_id}, {"_id": 0, "matches": 1})
+        return doc.get("matches", []) if doc else []
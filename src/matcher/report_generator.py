@@ -1,19 +1,79 @@
 import io
-import pandas as pd
-from typing import List
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Callable, List, Optional, Union
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
 from .models import JobMatch
+from src.utils.lazy import LazyModule
+
+pd = LazyModule("pandas")
 
 class ReportGenerator:
     """Generate PDF and CSV reports"""
     
+    # Rendered reports keyed by (format, fingerprint); bounded LRU shared by all sessions
+    CACHE_SIZE = 32
+    _cache: "OrderedDict[tuple, Union[bytes, str]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    @staticmethod
+    def matches_fingerprint(matches: List[JobMatch], resume_name: str) -> str:
+        """Hash the report inputs (matches, resume name and report date)"""
+        hasher = hashlib.sha256()
+        hasher.update(f"{resume_name}|{datetime.now().date().isoformat()}".encode('utf-8'))
+        for match in matches:
+            hasher.update(json.dumps(asdict(match), sort_keys=True, default=str).encode('utf-8'))
+        return hasher.hexdigest()
+    
+    @classmethod
+    def is_cached(cls, report_format: str, fingerprint: str) -> bool:
+        """Check whether a report has already been rendered"""
+        with cls._cache_lock:
+            return (report_format, fingerprint) in cls._cache
+    
+    @classmethod
+    def _get_or_render(cls, report_format: str, fingerprint: str,
+                       render: Callable[[], Union[bytes, str]]) -> Union[bytes, str]:
+        """Return a cached report or render and cache it"""
+        key = (report_format, fingerprint)
+        with cls._cache_lock:
+            if key in cls._cache:
+                cls._cache.move_to_end(key)
+                return cls._cache[key]
+        
+        report = render()
+        with cls._cache_lock:
+            cls._cache[key] = report
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return report
+    
+    @classmethod
+    def get_pdf_report(cls, matches: List[JobMatch], resume_name: str,
+                       fingerprint: Optional[str] = None) -> bytes:
+        """Return the PDF report, rendering it only if it is not cached"""
+        fingerprint = fingerprint or cls.matches_fingerprint(matches, resume_name)
+        return cls._get_or_render("pdf", fingerprint, lambda: cls.generate_pdf_report(matches, resume_name))
+    
+    @classmethod
+    def get_csv_report(cls, matches: List[JobMatch], resume_name: str,
+                       fingerprint: Optional[str] = None) -> str:
+        """Return the CSV report, rendering it only if it is not cached"""
+        fingerprint = fingerprint or cls.matches_fingerprint(matches, resume_name)
+        return cls._get_or_render("csv", fingerprint, lambda: cls.generate_csv_report(matches))
+    
     @staticmethod
     def generate_pdf_report(matches: List[JobMatch], resume_name: str) -> bytes:
         """Generate PDF report of job matches"""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib import colors
+
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
         styles = getSampleStyleSheet()
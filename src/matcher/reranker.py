@@ -0,0 +1,130 @@
+import re
+from typing import Dict, Iterable, Optional, Tuple
+from .catalog import JobCatalog
+from .models import ProcessedResume
+from src.utils.lazy import LazyModule
+
+np = LazyModule("numpy")
+
+FEATURES = ("cosine", "skills", "seniority", "location", "category")
+
+DEFAULT_WEIGHTS = {"cosine": 0.6, "skills": 0.25, "seniority": 0.05, "location": 0.05, "category": 0.05}
+
+_YEARS = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parse "cosine=0.6,skills=0.3" into a weight dict (unknown names are rejected)"""
+    weights = {}
+    for part in filter(None, (item.strip() for item in spec.split(","))):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in FEATURES:
+            raise ValueError(f"Unknown rerank feature {name!r}; expected one of {FEATURES}")
+        weights[name] = float(value)
+    return weights
+
+
+def estimate_seniority(experience_years: str) -> int:
+    """Map free-text years of experience onto the 1-4 job seniority scale (0 if unknown)"""
+    match = _YEARS.search(experience_years or "")
+    if not match:
+        return 0
+    years = float(match.group(0))
+    if years < 3:
+        return 1
+    if years < 6:
+        return 2
+    if years < 10:
+        return 3
+    return 4
+
+
+class FeatureReranker:
+    """
+    Second retrieval stage: re-score the top-N cosine candidates with
+    structured features computed as NumPy arrays over the catalog columns
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, candidate_pool: int = 200):
+        """
+        Initialize the reranker
+
+        Args:
+            weights (Optional[Dict[str, float]]): Feature weights; missing features use DEFAULT_WEIGHTS
+            candidate_pool (int): Cosine candidates kept from the first stage
+        """
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.candidate_pool = candidate_pool
+
+    def pool_size(self, top_k: int) -> int:
+        return max(top_k, self.candidate_pool)
+
+    @staticmethod
+    def _value_table(values: Iterable[str], predicate) -> "np.ndarray":
+        """Evaluate a predicate once per distinct categorical value"""
+        return np.asarray([1.0 if predicate(value.lower()) else 0.0 for value in values], dtype=np.float64)
+
+    def features(self, catalog: JobCatalog, rows: "np.ndarray", cosine: "np.ndarray",
+                 resume: ProcessedResume, resume_skill_ids: set) -> "np.ndarray":
+        """
+        Build the (len(rows), len(FEATURES)) feature matrix for candidate rows
+
+        Features are in [0, 1]: cosine similarity, share of the job's skills
+        the resume has, seniority closeness, location match and whether a
+        resume keyword names the job category.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = catalog.skill_offsets[rows]
+        lengths = catalog.skill_offsets[rows + 1] - starts
+        total = int(lengths.sum())
+        skill_share = np.zeros(len(rows))
+        if total and resume_skill_ids:
+            # Gather every candidate's skill id slice in one flat array
+            owner = np.repeat(np.arange(len(rows)), lengths)
+            positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+            hits = np.isin(catalog.skill_ids[positions], np.fromiter(resume_skill_ids, dtype=np.int32))
+            matched = np.bincount(owner, weights=hits, minlength=len(rows))
+            skill_share = np.divide(matched, lengths, out=np.zeros(len(rows)), where=lengths > 0)
+
+        resume_level = estimate_seniority(resume.experience_years)
+        job_levels = catalog.seniority[rows].astype(np.float64)
+        if resume_level:
+            seniority = np.where(job_levels > 0, 1.0 - np.abs(job_levels - resume_level) / 3.0, 0.5)
+        else:
+            seniority = np.full(len(rows), 0.5)
+
+        city = (resume.location or "").split(",")[0].strip().lower()
+        locations = catalog.categoricals["location"]
+        location_table = self._value_table(
+            locations.values, lambda value: value == "remote" or bool(city) and city in value
+        )
+
+        keywords = [keyword.lower() for keyword in resume.keywords if keyword]
+        categories = catalog.categoricals["category"]
+        category_table = self._value_table(
+            categories.values, lambda value: any(keyword in value for keyword in keywords)
+        )
+
+        return np.column_stack([
+            np.asarray(cosine, dtype=np.float64),
+            skill_share,
+            np.clip(seniority, 0.0, 1.0),
+            location_table[locations.codes[rows]],
+            category_table[categories.codes[rows]],
+        ])
+
+    def rerank(self, catalog: JobCatalog, rows: "np.ndarray", cosine: "np.ndarray", resume: ProcessedResume,
+               resume_skill_ids: set, top_k: int) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Order candidate rows by the weighted feature score
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (rank scores, rows, cosine scores) of the top_k, best first
+        """
+        if len(rows) == 0:
+            return np.empty(0), np.empty(0, dtype=np.int64), np.empty(0)
+        feature_matrix = self.features(catalog, rows, cosine, resume, resume_skill_ids)
+        scores = feature_matrix @ np.asarray([self.weights[name] for name in FEATURES], dtype=np.float64)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return scores[order], np.asarray(rows)[order], np.asarray(cosine)[order]
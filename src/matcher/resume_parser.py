@@ -0,0 +1,222 @@
+import re
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.generator.config import JobConfig
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}")
+PHONE_PATTERN = re.compile(r"(?<![\w])(?:\+?\d{1,3}[\s.\-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.\-]?\d{3,4}[\s.\-]?\d{3,4}(?![\w])")
+YEARS_PATTERN = re.compile(r"(\d{1,2})\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+DATE_RANGE_PATTERN = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now)\b",
+    re.IGNORECASE
+)
+CITY_STATE_PATTERN = re.compile(r"\b([A-Z][a-zA-Z.]+(?:\s[A-Z][a-zA-Z.]+)*,\s?[A-Z]{2})\b")
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#][a-z0-9+#.\-/]*", re.IGNORECASE)
+DEGREE_PATTERN = re.compile(
+    r"\b(bachelor|master|ph\.?d|doctorate|associate degree|b\.?sc?|m\.?sc?|b\.?a\.?|m\.?b\.?a|b\.?tech|m\.?tech|b\.?e\.?)\b",
+    re.IGNORECASE
+)
+CERTIFICATION_PATTERN = re.compile(r"\b(certified|certification|certificate)\b", re.IGNORECASE)
+BULLET_PATTERN = re.compile(r"^[\-•*▪●◦·]\s*")
+
+SECTION_HEADERS = {
+    "summary": ("summary", "professional summary", "profile", "objective", "about me", "career objective"),
+    "experience": ("experience", "work experience", "professional experience", "employment history", "work history"),
+    "education": ("education", "academic background", "qualifications"),
+    "skills": ("skills", "technical skills", "core competencies", "technologies"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses & certifications")
+}
+_HEADER_LOOKUP = {alias: section for section, aliases in SECTION_HEADERS.items() for alias in aliases}
+
+DEFAULT_SOFT_SKILLS = (
+    "communication", "leadership", "teamwork", "collaboration", "problem solving",
+    "problem-solving", "critical thinking", "time management", "adaptability",
+    "mentoring", "stakeholder management", "attention to detail", "creativity",
+    "analytical thinking", "presentation", "negotiation", "organization", "ownership"
+)
+
+# Fields the rule-based parser can fill; anything left undetermined is
+# handed to the LLM in hybrid mode.
+RULE_FIELDS = (
+    "name", "email", "phone", "location", "summary", "experience_years", "education",
+    "technical_skills", "soft_skills", "work_experience", "certifications", "keywords"
+)
+
+
+class SkillTrie:
+    """Token-level trie for longest-match lookup of multi-word skill names"""
+
+    _END = "__end__"
+
+    def __init__(self, phrases: Iterable[str] = ()):
+        self.root: Dict[str, Any] = {}
+        for phrase in phrases:
+            self.add(phrase)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Split text into lowercase tokens, keeping symbols used in skill names (C++, C#, Node.js)."""
+        return [token.rstrip(".-/").lower() for token in TOKEN_PATTERN.findall(text)]
+
+    def add(self, phrase: str) -> None:
+        """Add a phrase; the canonical spelling is returned on match."""
+        tokens = self.tokenize(phrase)
+        if not tokens:
+            return
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(self._END, phrase.strip())
+
+    def find_all(self, text: str) -> List[str]:
+        """Return the canonical names of all phrases found in text, in order of first occurrence."""
+        tokens = self.tokenize(text)
+        found = {}
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            match, match_end = None, i
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if self._END in node:
+                    match, match_end = node[self._END], j
+            if match:
+                found.setdefault(match.lower(), match)
+                i = match_end
+            else:
+                i += 1
+        return list(found.values())
+
+
+class RuleBasedResumeParser:
+    """Deterministic resume field extractor used before (or instead of) the LLM"""
+
+    def __init__(self, known_skills: Iterable[str], soft_skills: Iterable[str] = DEFAULT_SOFT_SKILLS,
+                 locations: Iterable[str] = JobConfig.LOCATIONS, min_skills: int = 3):
+        """
+        Initialize the parser
+
+        Args:
+            known_skills (Iterable[str]): Technical skill names from the job catalog
+            soft_skills (Iterable[str]): Soft skill dictionary
+            locations (Iterable[str]): Known locations
+            min_skills (int): Minimum skills found for technical_skills to count as determined
+        """
+        self.skill_trie = SkillTrie(skill for skill in known_skills if isinstance(skill, str) and skill.strip())
+        self.soft_skill_trie = SkillTrie(soft_skills)
+        self.locations = list(locations)
+        self.min_skills = min_skills
+
+    def _split_sections(self, lines: List[str]) -> Dict[str, List[str]]:
+        """Group lines under recognised section headers."""
+        sections: Dict[str, List[str]] = {"header": []}
+        current = "header"
+        for line in lines:
+            key = line.strip().strip(":").lower()
+            if len(key) <= 40 and key in _HEADER_LOOKUP:
+                current = _HEADER_LOOKUP[key]
+                sections.setdefault(current, [])
+                continue
+            sections.setdefault(current, []).append(line)
+        return sections
+
+    def _find_name(self, header_lines: List[str]) -> Optional[str]:
+        for line in header_lines[:5]:
+            words = line.split()
+            if (2 <= len(words) <= 4 and not any(ch.isdigit() for ch in line) and "@" not in line
+                    and all(word[:1].isupper() for word in words)):
+                return line.strip()
+        return None
+
+    def _find_location(self, header_text: str) -> Optional[str]:
+        for location in self.locations:
+            if location.lower() in header_text.lower():
+                return location
+        match = CITY_STATE_PATTERN.search(header_text)
+        return match.group(1) if match else None
+
+    def _find_experience_years(self, text: str) -> Optional[str]:
+        stated = [int(value) for value in YEARS_PATTERN.findall(text) if int(value) <= 50]
+        if stated:
+            return str(max(stated))
+
+        current_year = datetime.now().year
+        starts, ends = [], []
+        for start, end in DATE_RANGE_PATTERN.findall(text):
+            starts.append(int(start))
+            ends.append(current_year if not end[0].isdigit() else int(end))
+        if starts:
+            return str(max(0, max(ends) - min(starts)))
+        return None
+
+    def parse(self, resume_text: str) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Extract the fields that can be determined without an LLM
+
+        Args:
+            resume_text (str): Plain resume text
+
+        Returns:
+            Tuple[Dict[str, Any], List[str]]: Determined fields and the names of undetermined fields
+        """
+        lines = [line.strip() for line in resume_text.split("\n") if line.strip()]
+        sections = self._split_sections(lines)
+        header_text = "\n".join(sections["header"][:15])
+        fields: Dict[str, Any] = {}
+
+        name = self._find_name(sections["header"])
+        if name:
+            fields["name"] = name
+
+        email = EMAIL_PATTERN.search(resume_text)
+        if email:
+            fields["email"] = email.group(0)
+
+        phone = PHONE_PATTERN.search(header_text) or PHONE_PATTERN.search(resume_text)
+        if phone:
+            fields["phone"] = phone.group(0).strip()
+
+        location = self._find_location(header_text)
+        if location:
+            fields["location"] = location
+
+        if sections.get("summary"):
+            fields["summary"] = " ".join(sections["summary"])
+
+        experience_years = self._find_experience_years(resume_text)
+        if experience_years:
+            fields["experience_years"] = experience_years
+
+        education_lines = sections.get("education") or [line for line in lines if DEGREE_PATTERN.search(line)]
+        if education_lines:
+            fields["education"] = [BULLET_PATTERN.sub("", line) for line in education_lines[:6]]
+
+        technical_skills = self.skill_trie.find_all(resume_text)
+        if len(technical_skills) >= self.min_skills:
+            fields["technical_skills"] = technical_skills
+
+        soft_skills = self.soft_skill_trie.find_all(resume_text)
+        if soft_skills:
+            fields["soft_skills"] = soft_skills
+
+        if sections.get("experience"):
+            # Non-bullet lines in the experience section are role/company headings
+            fields["work_experience"] = [line for line in sections["experience"]
+                                         if not BULLET_PATTERN.match(line)][:10]
+
+        certification_lines = sections.get("certifications") or [
+            line for line in lines if CERTIFICATION_PATTERN.search(line)
+        ]
+        if certification_lines:
+            fields["certifications"] = [BULLET_PATTERN.sub("", line) for line in certification_lines[:6]]
+
+        if technical_skills or soft_skills:
+            fields["keywords"] = technical_skills + soft_skills
+
+        undetermined = [field for field in RULE_FIELDS if field not in fields]
+        return fields, undetermined
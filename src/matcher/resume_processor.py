@@ -1,9 +1,12 @@
 import logging
-import PyPDF2
-import docx
+from src.utils.lazy import LazyModule
+from src.utils.text_budget import dedupe_page_furniture
 
 logger = logging.getLogger(__name__)
 
+PyPDF2 = LazyModule("PyPDF2")
+docx = LazyModule("docx")
+
 class ResumeProcessor:
     """Handle resume file processing and text extraction"""
     
@@ -12,10 +15,9 @@ class ResumeProcessor:
         """Extract text from PDF file"""
         try:
             pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            pages = [page.extract_text() or "" for page in pdf_reader.pages]
+            # Repeated headers/footers (name, page numbers) only waste prompt tokens
+            return "\n".join(dedupe_page_furniture(pages)) + "\n"
         except Exception as e:
             logger.error(f"Error extracting PDF text: {e}")
             return ""
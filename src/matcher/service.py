@@ -0,0 +1,265 @@
+import json
+import queue
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Any, Dict, List, Tuple
+from .job_matcher import RAGJobMatcher
+from .models import ProcessedResume, JobMatch, resume_from_dict
+from src.processor.job_queries import JobBrowser
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Coalesces concurrent match requests into batches scored together"""
+
+    def __init__(self, matcher: RAGJobMatcher, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        """
+        Initialize the batcher
+
+        Args:
+            matcher (RAGJobMatcher): Matcher with a loaded job index
+            max_batch_size (int): Maximum requests scored in one matrix multiply
+            max_wait_ms (float): How long the first request waits for others to join
+        """
+        self.matcher = matcher
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[ProcessedResume, int, Future]]" = queue.Queue()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="match-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, resume: ProcessedResume, top_k: int) -> "Future[List[JobMatch]]":
+        """Queue a resume for matching and return a future for its matches"""
+        future: "Future[List[JobMatch]]" = Future()
+        self._queue.put((resume, top_k, future))
+        return future
+
+    def _collect_batch(self) -> List[Tuple[ProcessedResume, int, Future]]:
+        """Block for one request, then gather more until the batch is full or the wait expires"""
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            try:
+                max_top_k = max(top_k for _, top_k, _ in batch)
+                results = self.matcher.find_matching_jobs_batch([resume for resume, _, _ in batch], max_top_k)
+                for (_, top_k, future), matches in zip(batch, results):
+                    future.set_result(matches[:top_k])
+                logger.debug(f"Scored micro-batch of {len(batch)} request(s)")
+            except Exception as e:
+                logger.error(f"Error scoring micro-batch: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def stop(self):
+        """Stop the worker thread"""
+        self._stopped.set()
+        self._worker.join(timeout=1)
+
+
+class MatchingService:
+    """Headless HTTP front end for the job matcher"""
+
+    def __init__(self, matcher: RAGJobMatcher, host: str = "0.0.0.0", port: int = 8600,
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0, request_timeout: float = 30.0):
+        """
+        Initialize the service
+
+        Args:
+            matcher (RAGJobMatcher): Matcher used for scoring
+            host (str): Bind address
+            port (int): Bind port
+            max_batch_size (int): Maximum micro-batch size
+            max_wait_ms (float): Micro-batch collection window in milliseconds
+            request_timeout (float): Seconds a request waits for its batch
+        """
+        self.matcher = matcher
+        self.batcher = MicroBatcher(matcher, max_batch_size, max_wait_ms)
+        self.browser = JobBrowser(matcher.collection, matcher.text_codec)
+        self.request_timeout = request_timeout
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+
+    def _make_handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send_json(self, status: int, body: Dict[str, Any]):
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/health":
+                    index_status = service.matcher.index_status()
+                    ready = index_status["ready"]
+                    self._send_json(200 if ready else 503, {"status": "ok" if ready else "loading", "index": index_status})
+                elif url.path == "/metrics":
+                    payload = metrics.to_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                elif url.path == "/jobs":
+                    params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                    status, body = service.handle_jobs(params)
+                    self._send_json(status, body)
+                elif url.path == "/candidates":
+                    params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                    status, body = service.handle_candidates(params)
+                    self._send_json(status, body)
+                else:
+                    self._send_json(404, {"error": "Not found"})
+
+            def do_POST(self):
+                if self.path == "/reload":
+                    # Rebuilds from MongoDB in the background; the current index serves until the swap
+                    service.matcher.start_warm_up(use_snapshot=False)
+                    self._send_json(202, {"index": service.matcher.index_status()})
+                    return
+                if self.path != "/match":
+                    self._send_json(404, {"error": "Not found"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except (ValueError, json.JSONDecodeError):
+                    self._send_json(400, {"error": "Request body must be JSON"})
+                    return
+                if not isinstance(request, dict):
+                    self._send_json(400, {"error": "Request body must be a JSON object"})
+                    return
+
+                status, body = service.handle_match(request)
+                self._send_json(status, body)
+
+            def log_message(self, format, *args):
+                logger.debug("%s - %s" % (self.address_string(), format % args))
+
+        return Handler
+
+    def handle_match(self, request: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handle a /match request
+
+        The body carries either a structured "resume" object or raw
+        "resume_text" (parsed with process_resume_with_llm), plus "top_k".
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status and JSON body
+        """
+        try:
+            top_k = max(1, min(int(request.get("top_k", 10)), 100))
+        except (TypeError, ValueError):
+            return 400, {"error": "top_k must be an integer"}
+
+        if isinstance(request.get("resume"), dict):
+            try:
+                resume = resume_from_dict(request["resume"])
+            except ValueError as e:
+                return 400, {"error": str(e)}
+        elif request.get("resume_text"):
+            resume = self.matcher.process_resume_with_llm(request["resume_text"])
+            if resume is None:
+                return 422, {"error": "Could not process resume text"}
+        else:
+            return 400, {"error": "Provide 'resume' or 'resume_text'"}
+
+        try:
+            with metrics.timer("service_request_seconds", "Matching service request latency", endpoint="match"):
+                matches = self.batcher.submit(resume, top_k).result(timeout=self.request_timeout)
+        except Exception as e:
+            logger.error(f"Error serving match request: {e}")
+            return 500, {"error": "Matching failed"}
+        return 200, {"matches": [asdict(match) for match in matches]}
+
+    def handle_jobs(self, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handle a /jobs?category=...&location=...&seniority_level=...&skills=a,b&limit=...&cursor=... request
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status and JSON body
+        """
+        try:
+            seniority_level = params.get("seniority_level")
+            with metrics.timer("service_request_seconds", "Matching service request latency", endpoint="jobs"):
+                page = self.browser.browse(
+                    category=params.get("category"),
+                    location=params.get("location"),
+                    seniority_level=int(seniority_level) if seniority_level else None,
+                    skills=[skill.strip() for skill in params.get("skills", "").split(",") if skill.strip()],
+                    limit=int(params.get("limit", 20)),
+                    cursor=params.get("cursor")
+                )
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            logger.error(f"Error browsing jobs: {e}")
+            return 500, {"error": "Browsing failed"}
+        return 200, {"jobs": page.jobs, "next_cursor": page.next_cursor}
+
+    def handle_candidates(self, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handle a /candidates?job_id=...&top_k=... request
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status and JSON body
+        """
+        job_id = params.get("job_id")
+        if not job_id:
+            return 400, {"error": "Provide 'job_id'"}
+        try:
+            top_k = max(1, min(int(params.get("top_k", 10)), 500))
+        except ValueError:
+            return 400, {"error": "top_k must be an integer"}
+
+        candidates = self.matcher.find_matching_candidates(job_id, top_k)
+        return 200, {"candidates": [asdict(candidate) for candidate in candidates]}
+
+    def serve_forever(self):
+        """Start loading the job index in the background and serve requests until interrupted"""
+        if self.matcher.index is None:
+            self.matcher.start_warm_up()
+        host, port = self.server.server_address[:2]
+        logger.info(f"Matching service listening on http://{host}:{port}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Stop the HTTP server, the batcher and any job index shards"""
+        self.server.server_close()
+        self.batcher.stop()
+        if self.matcher.sharded_index is not None:
+            self.matcher.sharded_index.close()
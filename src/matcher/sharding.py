@@ -0,0 +1,262 @@
+import zlib
+import logging
+import threading
+import multiprocessing
+from typing import List, Optional, Tuple
+from .catalog import JobCatalog
+from src.utils.lazy import LazyModule
+from src.utils.metrics import metrics
+
+np = LazyModule("numpy")
+
+logger = logging.getLogger(__name__)
+
+SHARD_STRATEGIES = ("hash", "category")
+
+
+def _top_k(scores: "np.ndarray", indices: "np.ndarray", k: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """The k best (scores, indices), best first"""
+    if len(scores) > k:
+        keep = np.argpartition(scores, -k)[-k:]
+        scores, indices = scores[keep], indices[keep]
+    order = np.argsort(scores)[::-1]
+    return scores[order], indices[order]
+
+
+def assign_shards(catalog: JobCatalog, num_shards: int, strategy: str = "hash") -> "np.ndarray":
+    """
+    Assign every catalog row to a shard
+
+    "hash" spreads jobs by crc32 of job_id. "category" keeps each category's
+    jobs together: categories are placed largest first on the least-loaded
+    shard, and a category larger than an even share is split into
+    share-sized pieces, so shards stay balanced as the catalog changes.
+
+    Returns:
+        np.ndarray: Shard number per row
+    """
+    if strategy not in SHARD_STRATEGIES:
+        raise ValueError(f"Unknown shard strategy {strategy!r}; expected one of {SHARD_STRATEGIES}")
+    if strategy == "hash":
+        return np.fromiter((zlib.crc32(job_id.encode("utf-8")) % num_shards for job_id in catalog.job_ids),
+                           dtype=np.int32, count=len(catalog))
+
+    codes = catalog.categoricals["category"].codes
+    share = -(-len(catalog) // num_shards)
+    loads = np.zeros(num_shards, dtype=np.int64)
+    assignment = np.empty(len(catalog), dtype=np.int32)
+    counts = np.bincount(codes)
+    for code in np.argsort(-counts, kind="stable"):
+        rows = np.flatnonzero(codes == code)
+        for start in range(0, len(rows), share):
+            piece = rows[start:start + share]
+            shard = int(np.argmin(loads))
+            assignment[piece] = shard
+            loads[shard] += len(piece)
+    return assignment
+
+
+def _shard_worker(connection, vectors):
+    """Hold one shard's job vectors and answer top-k queries until told to stop"""
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            # The coordinator exited without closing the index
+            break
+        if message is None:
+            break
+        query_vectors, k = message
+        scores = (query_vectors @ vectors.T).toarray()
+        local = np.arange(scores.shape[1])
+        connection.send([_top_k(row, local, k) for row in scores])
+    connection.close()
+
+
+class _Shard:
+    """One worker process and the catalog rows it scores; the lock serializes its pipe"""
+
+    def __init__(self, number: int, rows: "np.ndarray"):
+        self.number = number
+        self.rows = rows
+        self.process = None
+        self.connection = None
+        self.lock = threading.Lock()
+        self.closed = False
+        self.restarting = False
+
+
+class ShardedJobIndex:
+    """
+    Job vectors partitioned over worker processes
+
+    The vectorizer is fitted once over all jobs, so every shard scores in the
+    same TF-IDF space; a query is sent to all shards, each returns its local
+    top-k, and the coordinator merges them into the global top-k. Rebuilding
+    re-assigns rows, which rebalances the shards.
+
+    Each shard has its own lock, so concurrent queries pipeline through the
+    shards rather than queueing for all of them. A shard whose worker has
+    died is scored in the coordinator while a replacement worker starts.
+    """
+
+    def __init__(self, num_shards: int, strategy: str = "hash"):
+        """
+        Initialize the index
+
+        Args:
+            num_shards (int): Worker processes
+            strategy (str): "hash" or "category" (see assign_shards)
+        """
+        self.num_shards = num_shards
+        self.strategy = strategy
+        self.shard_rows: List["np.ndarray"] = []
+        self._shards: List[_Shard] = []
+        self._job_vectors = None
+        self._closed = False
+
+    def _spawn(self, shard: _Shard):
+        # Spawned, not forked: the caller may be running server threads
+        context = multiprocessing.get_context("spawn")
+        parent, child = context.Pipe()
+        process = context.Process(target=_shard_worker, args=(child, self._job_vectors[shard.rows]),
+                                  name=f"job-shard-{shard.number}", daemon=True)
+        process.start()
+        child.close()
+        return process, parent
+
+    def build(self, job_vectors, catalog: JobCatalog):
+        """(Re)partition the job vectors and start one worker per non-empty shard"""
+        self.close()
+        assignment = assign_shards(catalog, self.num_shards, self.strategy)
+        self._job_vectors = job_vectors
+        shards = []
+        for number in range(self.num_shards):
+            rows = np.flatnonzero(assignment == number)
+            if not len(rows):
+                continue
+            shard = _Shard(number, rows)
+            shard.process, shard.connection = self._spawn(shard)
+            shards.append(shard)
+        self._shards = shards
+        self.shard_rows = [shard.rows for shard in shards]
+        self._closed = False
+        logger.info(f"Started {len(shards)} job index shards ({self.strategy}), "
+                    f"sizes {[len(rows) for rows in self.shard_rows]}")
+
+    def _score_locally(self, shard: _Shard, query_vectors, k: int) -> List[Tuple["np.ndarray", "np.ndarray"]]:
+        """What the shard's worker would reply, computed in this process"""
+        scores = (query_vectors @ self._job_vectors[shard.rows].T).toarray()
+        local = np.arange(scores.shape[1])
+        return [_top_k(row, local, k) for row in scores]
+
+    def _restart(self, shard: _Shard):
+        """Replace a dead worker in the background (called with the shard's lock held)"""
+        if shard.restarting or shard.closed:
+            return
+        exit_code = shard.process.exitcode if shard.process is not None else None
+        logger.warning(f"Job shard {shard.number} worker is down (exit code {exit_code}); "
+                       f"scoring it locally until it is restarted")
+        metrics.counter("shard_restarts_total", "Job index shard worker restarts").inc(shard=shard.number)
+        if shard.connection is not None:
+            shard.connection.close()
+            shard.connection = None
+        shard.restarting = True
+        threading.Thread(target=self._replace_worker, args=(shard,),
+                         name=f"job-shard-{shard.number}-restart", daemon=True).start()
+
+    def _replace_worker(self, shard: _Shard):
+        try:
+            process, connection = self._spawn(shard)
+        except Exception as e:
+            logger.error(f"Could not restart job shard {shard.number}: {e}")
+            with shard.lock:
+                shard.restarting = False
+            return
+        with shard.lock:
+            shard.restarting = False
+            if not shard.closed:
+                shard.process, shard.connection = process, connection
+                return
+        # Closed while the replacement was starting
+        connection.send(None)
+        process.join(timeout=5)
+
+    def _send(self, shard: _Shard, message) -> bool:
+        """Send a query to a shard's worker; False if it is down"""
+        if shard.connection is None or not shard.process.is_alive():
+            self._restart(shard)
+            return False
+        try:
+            shard.connection.send(message)
+            return True
+        except (BrokenPipeError, EOFError, OSError):
+            self._restart(shard)
+            return False
+
+    def _receive(self, shard: _Shard, query_vectors, k: int) -> List[Tuple["np.ndarray", "np.ndarray"]]:
+        try:
+            return shard.connection.recv()
+        except (EOFError, OSError):
+            self._restart(shard)
+            return self._score_locally(shard, query_vectors, k)
+
+    def top_k(self, query_vectors, k: int) -> List[Tuple["np.ndarray", "np.ndarray"]]:
+        """
+        Scatter the query rows to every shard and merge the per-shard top-k
+
+        Shard locks are taken in shard order and each is released as soon as
+        that shard has replied, so a second query starts on the first shard
+        while this one still waits on the others.
+
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: Per query row, (scores, global row indices) best first
+
+        Raises:
+            RuntimeError: If the index has been closed
+        """
+        shards = self._shards
+        if self._closed:
+            raise RuntimeError("Sharded job index is closed")
+        replies: List[Optional[list]] = [None] * len(shards)
+        held: List[_Shard] = []
+        with metrics.timer("shard_query_seconds", "Sharded top-k fan-out and merge time"):
+            try:
+                for position, shard in enumerate(shards):
+                    shard.lock.acquire()
+                    held.append(shard)
+                    if shard.closed:
+                        raise RuntimeError("Sharded job index is closed")
+                    if not self._send(shard, (query_vectors, k)):
+                        replies[position] = self._score_locally(shard, query_vectors, k)
+                for position, shard in enumerate(shards):
+                    if replies[position] is None:
+                        replies[position] = self._receive(shard, query_vectors, k)
+                    held.remove(shard)
+                    shard.lock.release()
+            finally:
+                for shard in held:
+                    shard.lock.release()
+
+        merged = []
+        for query in range(query_vectors.shape[0]):
+            scores = np.concatenate([reply[query][0] for reply in replies])
+            indices = np.concatenate([shard.rows[reply[query][1]] for shard, reply in zip(shards, replies)])
+            merged.append(_top_k(scores, indices, k))
+        return merged
+
+    def close(self):
+        """Stop the shard workers (after any fan-out in flight); later queries raise"""
+        self._closed = True
+        for shard in self._shards:
+            with shard.lock:
+                shard.closed = True
+                if shard.connection is None:
+                    continue
+                try:
+                    shard.connection.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                shard.process.join(timeout=5)
+                shard.connection.close()
+                shard.connection = None
@@ -0,0 +1,166 @@
+import os
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from .catalog import CATEGORICAL_FIELDS, TEXT_FIELDS, JobCatalog, _Categorical
+from src.utils.lazy import LazyModule
+from src.utils.match_text import MATCH_TEXT_VERSION
+from src.utils.metrics import metrics
+
+np = LazyModule("numpy")
+pa = LazyModule("pyarrow")
+pa_ipc = LazyModule("pyarrow.ipc")
+scipy_sparse = LazyModule("scipy.sparse")
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the snapshot layout changes; older snapshots are rejected
+SNAPSHOT_VERSION = 1
+
+JOBS_FILE = "jobs.arrow"
+VOCABULARY_FILE = "vocabulary.arrow"
+
+
+def _list_array(offsets: "np.ndarray", values):
+    """List column sharing CSR-style offsets with its flat values (64-bit offsets when needed)"""
+    if offsets.dtype == np.int32:
+        return pa.ListArray.from_arrays(pa.array(offsets), values)
+    return pa.LargeListArray.from_arrays(pa.array(offsets.astype(np.int64)), values)
+
+
+def _single_chunk(table, name: str):
+    column = table.column(name)
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+def _write_table(table, path: str):
+    with pa_ipc.new_file(path, table.schema) as writer:
+        writer.write_table(table, max_chunksize=max(len(table), 1))
+
+
+def collection_watermark(collection) -> Dict[str, str]:
+    """Job count and newest processed_at of the job collection (the newest is read off the processed_at index)"""
+    newest = list(collection.find({}, {"_id": 0, "processed_at": 1}).sort("processed_at", -1).limit(1))
+    return {
+        "num_jobs": str(collection.count_documents({})),
+        "latest_processed_at": str(newest[0].get("processed_at") or "") if newest else "",
+    }
+
+
+def catalog_watermark(catalog: JobCatalog) -> Dict[str, str]:
+    """The collection_watermark the catalog was loaded at"""
+    return {
+        "num_jobs": str(len(catalog)),
+        "latest_processed_at": max((value or "" for value in catalog.columns["processed_at"]), default=""),
+    }
+
+
+def write_job_snapshot(path: str, catalog: JobCatalog, vectorizer, job_vectors) -> Dict[str, Any]:
+    """
+    Write a loaded job index to an Arrow IPC snapshot directory
+
+    jobs.arrow holds one row per job: the catalog's display columns,
+    dictionary-encoded categoricals and skills, and the job's TF-IDF row as
+    list columns over the CSR arrays. vocabulary.arrow holds the fitted
+    vocabulary and idf weights, so loading needs no refit. The metadata
+    records the catalog's watermark (job count and newest processed_at).
+
+    Args:
+        path (str): Snapshot directory (created if missing)
+        catalog (JobCatalog): Loaded job catalog
+        vectorizer: Fitted TfidfVectorizer
+        job_vectors: TF-IDF matrix aligned with the catalog rows
+
+    Returns:
+        Dict[str, Any]: Snapshot metadata
+    """
+    os.makedirs(path, exist_ok=True)
+    csr = scipy_sparse.csr_matrix(job_vectors)
+    csr.sort_indices()
+    metadata = {
+        "snapshot_version": str(SNAPSHOT_VERSION),
+        "match_text_version": str(MATCH_TEXT_VERSION),
+        **catalog_watermark(catalog),
+        "created_at": datetime.now().isoformat(),
+    }
+
+    columns = {name: pa.array(catalog.columns[name], pa.string()) for name in TEXT_FIELDS}
+    for name in CATEGORICAL_FIELDS:
+        categorical = catalog.categoricals[name]
+        columns[name] = pa.DictionaryArray.from_arrays(categorical.codes, pa.array(categorical.values, pa.string()))
+    columns["cluster"] = pa.DictionaryArray.from_arrays(catalog.clusters.codes,
+                                                       pa.array(catalog.clusters.values, pa.string()))
+    columns["seniority_level"] = pa.array(catalog.seniority)
+    columns["technical_skills"] = _list_array(
+        catalog.skill_offsets, pa.DictionaryArray.from_arrays(catalog.skill_ids, pa.array(catalog.skill_vocab, pa.string()))
+    )
+    columns["tfidf_indices"] = _list_array(csr.indptr, pa.array(csr.indices.astype(csr.indptr.dtype, copy=False)))
+    columns["tfidf_values"] = _list_array(csr.indptr, pa.array(csr.data))
+
+    with metrics.timer("snapshot_seconds", "Job snapshot read/write time", op="write"):
+        _write_table(pa.table(columns).replace_schema_metadata(metadata), os.path.join(path, JOBS_FILE))
+        terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+        vocabulary = pa.table({"term": pa.array(terms, pa.string()), "idf": pa.array(vectorizer.idf_)})
+        _write_table(vocabulary, os.path.join(path, VOCABULARY_FILE))
+    logger.info(f"Wrote job snapshot of {len(catalog)} jobs to {path}")
+    return metadata
+
+
+def read_job_snapshot(path: str, watermark: Optional[Dict[str, str]] = None
+                      ) -> Tuple[JobCatalog, Dict[str, int], "np.ndarray", Any]:
+    """
+    Read a snapshot written by write_job_snapshot
+
+    The Arrow files are memory-mapped; numeric columns (category codes,
+    seniority, skill ids, TF-IDF arrays) are used in place without copying,
+    and only the columns the matcher needs are read.
+
+    Args:
+        path (str): Snapshot directory
+        watermark (Optional[Dict[str, str]]): The job collection's current collection_watermark;
+            a snapshot exported at another one is out of date
+
+    Returns:
+        Tuple[JobCatalog, Dict[str, int], np.ndarray, csr_matrix]: (catalog, vocabulary, idf weights, job vectors)
+
+    Raises:
+        ValueError: If the snapshot was written by another layout or match text version, or at another watermark
+    """
+    with metrics.timer("snapshot_seconds", "Job snapshot read/write time", op="read"):
+        table = pa_ipc.open_file(pa.memory_map(os.path.join(path, JOBS_FILE), "r")).read_all()
+        metadata = {key.decode(): value.decode() for key, value in (table.schema.metadata or {}).items()}
+        if (metadata.get("snapshot_version") != str(SNAPSHOT_VERSION)
+                or metadata.get("match_text_version") != str(MATCH_TEXT_VERSION)):
+            raise ValueError(f"Job snapshot at {path} is stale ({metadata}); re-export it")
+        if watermark is not None and any(metadata.get(key) != value for key, value in watermark.items()):
+            raise ValueError(f"Job snapshot at {path} is out of date: exported at "
+                             f"{ {key: metadata.get(key) for key in watermark} }, collection is at {watermark}")
+
+        def codes(name: str) -> _Categorical:
+            column = _single_chunk(table, name)
+            return _Categorical.from_codes(column.dictionary.to_pylist(), column.indices.to_numpy(zero_copy_only=True))
+
+        skills = _single_chunk(table, "technical_skills")
+        catalog = JobCatalog.from_columns(
+            columns={name: _single_chunk(table, name).to_pylist() for name in TEXT_FIELDS},
+            categoricals={name: codes(name) for name in CATEGORICAL_FIELDS},
+            seniority=_single_chunk(table, "seniority_level").to_numpy(zero_copy_only=True),
+            clusters=codes("cluster"),
+            skill_vocab=skills.values.dictionary.to_pylist(),
+            skill_offsets=skills.offsets.to_numpy(zero_copy_only=True).astype(np.int64, copy=False),
+            skill_ids=skills.values.indices.to_numpy(zero_copy_only=True),
+        )
+
+        vocabulary_table = pa_ipc.open_file(pa.memory_map(os.path.join(path, VOCABULARY_FILE), "r")).read_all()
+        vocabulary = {term: index for index, term in enumerate(_single_chunk(vocabulary_table, "term").to_pylist())}
+        idf = _single_chunk(vocabulary_table, "idf").to_numpy(zero_copy_only=True)
+
+        indices = _single_chunk(table, "tfidf_indices")
+        values = _single_chunk(table, "tfidf_values")
+        job_vectors = scipy_sparse.csr_matrix(
+            (values.values.to_numpy(zero_copy_only=True), indices.values.to_numpy(zero_copy_only=True),
+             indices.offsets.to_numpy(zero_copy_only=True)),
+            shape=(len(catalog), len(vocabulary))
+        )
+    logger.info(f"Loaded job snapshot of {len(catalog)} jobs from {path} (created {metadata.get('created_at')})")
+    return catalog, vocabulary, idf, job_vectors
@@ -0,0 +1,170 @@
+import json
+import base64
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .models import JobPage
+from src.utils.metrics import metrics
+from src.utils.text_compression import TextCodec
+
+logger = logging.getLogger(__name__)
+
+# Browse order: newest first, job_id breaking ties so every position is unique
+BROWSE_SORT = [("processed_at", -1), ("job_id", -1)]
+
+# Indexes on job_descriptions, by name. Browsing filters by equality on a
+# leading field and reads in BROWSE_SORT order, so each filter field leads a
+# compound index that ends with the sort keys (equality, then sort): a page is
+# an index range scan with no in-memory sort. Bump JOB_INDEX_VERSION after
+# editing this table.
+JOB_INDEXES: Dict[str, Tuple[List[Tuple[str, int]], Dict[str, Any]]] = {
+    "job_id_1": ([("job_id", 1)], {"unique": True}),
+    "browse": (BROWSE_SORT, {}),
+    "category_browse": ([("category", 1)] + BROWSE_SORT, {}),
+    "category_seniority_browse": ([("category", 1), ("seniority_level", 1)] + BROWSE_SORT, {}),
+    "location_browse": ([("location", 1)] + BROWSE_SORT, {}),
+    "seniority_browse": ([("seniority_level", 1)] + BROWSE_SORT, {}),
+    "skills_browse": ([("technical_skills", 1)] + BROWSE_SORT, {}),
+    "title_1": ([("title", 1)], {}),
+    "keywords_1": ([("keywords", 1)], {}),
+}
+JOB_INDEX_VERSION = 1
+
+# Single-field indexes the processor used to create; a compound index above now starts with each field
+SUPERSEDED_INDEXES = ("category_1", "location_1", "technical_skills_1", "seniority_level_1")
+
+MIGRATION_ID = "job_indexes"
+
+# Fields returned for each browsed job (the long text fields are left out)
+BROWSE_FIELDS = ("job_id", "title", "category", "company_type", "location", "employment_type",
+                 "experience_level", "seniority_level", "technical_skills", "salary_range",
+                 "job_summary", "processed_at", "duplicate_of")
+
+
+def ensure_job_indexes(collection, state_collection, force: bool = False) -> bool:
+    """
+    Bring the job collection's indexes to JOB_INDEX_VERSION
+
+    Creates the missing indexes in JOB_INDEXES and drops the superseded ones.
+    The applied version is recorded in state_collection, so once a
+    deployment has migrated this is a single lookup.
+
+    Args:
+        collection: The job_descriptions collection
+        state_collection: Collection holding pipeline state documents
+        force (bool): Re-check the indexes even if the version is current
+
+    Returns:
+        bool: True if any index was created or dropped
+    """
+    state = state_collection.find_one({"_id": MIGRATION_ID}) or {}
+    if not force and state.get("version") == JOB_INDEX_VERSION:
+        return False
+
+    existing = collection.index_information()
+    changed = False
+    with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="migrate_indexes"):
+        # Create before dropping so every filter stays indexed throughout
+        for name, (keys, options) in JOB_INDEXES.items():
+            if name not in existing:
+                collection.create_index(keys, name=name, **options)
+                logger.info(f"Created job index {name}")
+                changed = True
+        for name in SUPERSEDED_INDEXES:
+            if name in existing:
+                collection.drop_index(name)
+                logger.info(f"Dropped superseded job index {name}")
+                changed = True
+
+    state_collection.replace_one(
+        {"_id": MIGRATION_ID},
+        {"_id": MIGRATION_ID, "version": JOB_INDEX_VERSION, "migrated_at": datetime.now().isoformat()},
+        upsert=True
+    )
+    return changed
+
+
+def encode_cursor(job: Dict[str, Any]) -> str:
+    """Opaque page cursor: the sort key of the last job on a page"""
+    position = [job.get("processed_at"), job.get("job_id")]
+    return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """Sort key encoded by encode_cursor"""
+    try:
+        processed_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from e
+    return processed_at, job_id
+
+
+class JobBrowser:
+    """Filtered, keyset-paginated browsing of the stored job catalog"""
+
+    MAX_PAGE_SIZE = 100
+
+    def __init__(self, collection, text_codec: Optional[TextCodec] = None):
+        """
+        Initialize the browser
+
+        Args:
+            collection: The job_descriptions collection (indexed by ensure_job_indexes)
+            text_codec (Optional[TextCodec]): Decompresses job_summary when it is stored compressed
+        """
+        self.collection = collection
+        self.text_codec = text_codec
+
+    @staticmethod
+    def build_filter(category: Optional[str] = None, location: Optional[str] = None,
+                     seniority_level: Optional[int] = None,
+                     skills: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """MongoDB filter for the browse facets (skills must all be present)"""
+        query: Dict[str, Any] = {}
+        if category:
+            query["category"] = category
+        if location:
+            query["location"] = location
+        if seniority_level is not None:
+            query["seniority_level"] = int(seniority_level)
+        if skills:
+            query["technical_skills"] = {"$all": list(skills)}
+        return query
+
+    def browse(self, category: Optional[str] = None, location: Optional[str] = None,
+               seniority_level: Optional[int] = None, skills: Optional[Sequence[str]] = None,
+               limit: int = 20, cursor: Optional[str] = None) -> JobPage:
+        """
+        Return one page of jobs, newest first
+
+        Pages are addressed by the sort key of the previous page's last job
+        rather than an offset, so page N costs the same as page 1.
+
+        Args:
+            category, location, seniority_level, skills: Optional filters
+            limit (int): Jobs per page (capped at MAX_PAGE_SIZE)
+            cursor (Optional[str]): next_cursor of the previous page
+
+        Returns:
+            JobPage: The jobs and the cursor of the following page (None on the last page)
+        """
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+        query = self.build_filter(category, location, seniority_level, skills)
+        if cursor:
+            processed_at, job_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"processed_at": {"$lt": processed_at}},
+                {"processed_at": processed_at, "job_id": {"$lt": job_id}},
+            ]
+
+        projection = dict.fromkeys(BROWSE_FIELDS, 1) | {"_id": 0}
+        with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="browse_jobs"):
+            # One extra job tells whether another page follows
+            jobs = list(self.collection.find(query, projection).sort(BROWSE_SORT).limit(limit + 1))
+
+        next_cursor = encode_cursor(jobs[limit - 1]) if len(jobs) > limit else None
+        jobs = jobs[:limit]
+        if self.text_codec is not None:
+            for job in jobs:
+                self.text_codec.decompress_fields(job, ("job_summary",))
+        return JobPage(jobs=jobs, next_cursor=next_cursor)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedJobDescription:
     """Data class for structured job description"""
     job_id: str
@@ -25,4 +25,10 @@ class ProcessedJobDescription:
     original_description: str
     processed_at: str
     keywords: List[str]
-    seniority_level: int  # 1=Entry, 2=Mid, 3=Senior, 4=Lead/Principal
\ No newline at end of file
+    seniority_level: int  # 1=Entry, 2=Mid, 3=Senior, 4=Lead/Principal
+
+@dataclass(slots=True)
+class JobPage:
+    """One page of browsed jobs"""
+    jobs: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,254 @@
+import re
+import zlib
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.utils.lazy import LazyModule
+from src.utils.metrics import metrics
+
+np = LazyModule("numpy")
+pymongo = LazyModule("pymongo")
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class MinHasher:
+    """MinHash signatures over word shingles, stable across processes"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """
+        Initialize the hasher
+
+        Args:
+            num_perm (int): Signature length (number of hash permutations)
+            shingle_size (int): Words per shingle
+            seed (int): Seed for the permutation parameters; signatures are only comparable for equal seeds
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingle_hashes(self, text: str) -> "np.ndarray":
+        """crc32 of every word shingle of the normalized text (none for text without words)"""
+        words = _WORD_PATTERN.findall((text or "").lower())
+        size = self.shingle_size
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        if len(words) < size:
+            shingles = {" ".join(words)}
+        else:
+            shingles = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+        return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+    def signature(self, text: str) -> Optional["np.ndarray"]:
+        """
+        MinHash signature (uint32, length num_perm) of a text
+
+        Text without words has no signature: every such text would share the
+        same one and look like a duplicate of all the others.
+        """
+        hashes = self.shingle_hashes(text)
+        if not len(hashes):
+            return None
+        # Universal hashing (a*x + b) mod p; uint64 wrap-around is part of the hash family
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def jaccard(first: "np.ndarray", second: "np.ndarray") -> float:
+        """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+        return float(np.mean(first == second))
+
+
+class NearDuplicateDetector:
+    """
+    Locality-sensitive hashing over MinHash signatures
+
+    A signature is cut into `bands` bands of `rows` values; two documents
+    become candidates when any band hashes identically, so a lookup touches
+    only the documents sharing a bucket instead of the whole catalog.
+    Candidates are confirmed with the estimated Jaccard similarity.
+
+    Band keys and signatures are persisted in the `job_minhash` collection
+    (multikey index on `bands`) so the ingest path can check new postings
+    against everything stored before.
+    """
+
+    def __init__(self, collection=None, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 shingle_size: int = 3):
+        """
+        Initialize the detector
+
+        Args:
+            collection: MongoDB collection holding signatures; None for in-memory use only
+            threshold (float): Estimated Jaccard similarity at which postings are near-duplicates
+            num_perm (int): Signature length
+            bands (int): LSH bands; num_perm must be divisible by it
+            shingle_size (int): Words per shingle
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.collection = collection
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, shingle_size)
+        if collection is not None:
+            collection.create_index("job_id", unique=True)
+            collection.create_index("bands")
+
+    def band_keys(self, signature: "np.ndarray") -> List[str]:
+        """One bucket key per band"""
+        return [
+            f"{band}:{hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).hexdigest()}"
+            for band in range(self.bands)
+        ]
+
+    def find_duplicate(self, signature: "np.ndarray", keys: Optional[List[str]] = None,
+                       exclude_job_id: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """
+        Find the stored posting most similar to a signature
+
+        Args:
+            signature (np.ndarray): MinHash signature of the new posting
+            keys (Optional[List[str]]): Precomputed band keys
+            exclude_job_id (Optional[str]): The posting's own id, so re-ingesting it does not match itself
+
+        Returns:
+            Optional[Tuple[str, float]]: (canonical job id, estimated similarity) or None
+        """
+        keys = keys or self.band_keys(signature)
+        best = None
+        with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="minhash_lookup"):
+            query = {"bands": {"$in": keys}}
+            if exclude_job_id:
+                query["job_id"] = {"$ne": exclude_job_id}
+            candidates = list(self.collection.find(query,
+                                                   {"_id": 0, "job_id": 1, "signature": 1, "duplicate_of": 1}))
+        for candidate in candidates:
+            similarity = self.hasher.jaccard(signature, np.frombuffer(candidate["signature"], dtype=np.uint32))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate.get("duplicate_of") or candidate["job_id"], similarity)
+        return best
+
+    def _signature_document(self, job_id: str, signature: "np.ndarray", keys: Optional[List[str]],
+                            duplicate_of: Optional[str]) -> Dict[str, Any]:
+        return {"job_id": job_id, "bands": keys or self.band_keys(signature), "signature": signature.tobytes(),
+                "duplicate_of": duplicate_of, "updated_at": datetime.now().isoformat()}
+
+    def add(self, job_id: str, signature: "np.ndarray", keys: Optional[List[str]] = None,
+            duplicate_of: Optional[str] = None):
+        """Store a posting's signature and band keys"""
+        self.collection.replace_one(
+            {"job_id": job_id}, self._signature_document(job_id, signature, keys, duplicate_of), upsert=True
+        )
+
+    def check(self, job_id: str, text: str) -> Tuple[Optional["np.ndarray"], List[str], Optional[Tuple[str, float]]]:
+        """
+        Signature, band keys and the best stored near-duplicate (if any) for a posting
+
+        A posting without description text gets no signature and is never a duplicate.
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None, [], None
+        keys = self.band_keys(signature)
+        return signature, keys, self.find_duplicate(signature, keys, exclude_job_id=job_id)
+
+    def cluster(self, signatures: Iterable[Tuple[str, "np.ndarray"]], max_bucket_compare: int = 64) -> Dict[str, str]:
+        """
+        Cluster (job_id, signature) pairs into near-duplicate groups in memory
+
+        Each document is compared only with up to max_bucket_compare earlier
+        members of the buckets it falls into, so the work grows with the
+        number of documents rather than their pairs.
+
+        Returns:
+            Dict[str, str]: job_id -> canonical job_id (the first member seen) for every duplicate
+        """
+        parent: Dict[str, str] = {}
+
+        def root(job_id: str) -> str:
+            while parent.get(job_id, job_id) != job_id:
+                parent[job_id] = parent.get(parent[job_id], parent[job_id])
+                job_id = parent[job_id]
+            return job_id
+
+        buckets: Dict[str, List[str]] = {}
+        seen: Dict[str, "np.ndarray"] = {}
+        order: Dict[str, int] = {}
+        for job_id, signature in signatures:
+            seen[job_id] = signature
+            order[job_id] = len(order)
+            compared = set()
+            for key in self.band_keys(signature):
+                members = buckets.setdefault(key, [])
+                for other in members[:max_bucket_compare]:
+                    if other in compared:
+                        continue
+                    compared.add(other)
+                    if self.hasher.jaccard(signature, seen[other]) >= self.threshold:
+                        first, second = root(other), root(job_id)
+                        if first != second:
+                            # The earliest posting stays the canonical one
+                            if order[first] > order[second]:
+                                first, second = second, first
+                            parent[second] = first
+                members.append(job_id)
+        return {job_id: root(job_id) for job_id in parent if root(job_id) != job_id}
+
+    def rebuild(self, job_collection, batch_size: int = 1000, text_codec=None) -> Dict[str, Any]:
+        """
+        Batch dedupe of an existing job collection
+
+        Clusters every stored posting by original_description, sets
+        duplicate_of on duplicates (and clears it on canonical postings), and
+        rewrites the signature collection. Signatures are upserted in place
+        and only those the rebuild did not touch are deleted afterwards, so
+        ingest running meanwhile always sees the stored signatures. Postings
+        without description text are left out. Pass the processor's
+        text_codec when descriptions may be stored compressed.
+
+        Returns:
+            Dict[str, Any]: Counts of scanned postings, duplicates and clusters
+        """
+        cursor = job_collection.find({}, {"_id": 0, "job_id": 1, "original_description": 1}).sort("processed_at", 1)
+        with metrics.timer("near_duplicate_cluster_seconds", "Time to cluster near-duplicate postings"):
+            decode = text_codec.decompress if text_codec is not None else (lambda value: value)
+            all_signatures = [(job["job_id"], self.hasher.signature(decode(job.get("original_description", ""))))
+                              for job in cursor]
+            signatures = [(job_id, signature) for job_id, signature in all_signatures if signature is not None]
+            duplicates = self.cluster(signatures)
+
+        started = datetime.now().isoformat()
+        job_updates, signature_upserts = [], []
+        for job_id, signature in all_signatures:
+            duplicate_of = duplicates.get(job_id)
+            job_updates.append(pymongo.UpdateOne({"job_id": job_id}, {"$set": {"duplicate_of": duplicate_of}}))
+            if signature is not None:
+                signature_upserts.append(pymongo.ReplaceOne(
+                    {"job_id": job_id}, self._signature_document(job_id, signature, None, duplicate_of), upsert=True
+                ))
+            if len(job_updates) >= batch_size:
+                job_collection.bulk_write(job_updates, ordered=False)
+                if signature_upserts:
+                    self.collection.bulk_write(signature_upserts, ordered=False)
+                job_updates, signature_upserts = [], []
+        if job_updates:
+            job_collection.bulk_write(job_updates, ordered=False)
+        if signature_upserts:
+            self.collection.bulk_write(signature_upserts, ordered=False)
+        # Signatures of postings that are gone (or lost their text); ones added by ingest meanwhile are newer
+        self.collection.delete_many({"updated_at": {"$lt": started}})
+
+        summary = {"postings": len(all_signatures), "duplicates": len(duplicates),
+                   "clusters": len(set(duplicates.values()))}
+        logger.info(f"Near-duplicate rebuild: {summary}")
+        return summary
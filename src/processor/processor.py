@@ -1,22 +1,79 @@
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Any
 from datetime import datetime
-import openai
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
 from dataclasses import asdict
 import time
-from .models import ProcessedJobDescription
-from .utils import clean_json_response, map_seniority_level
-import certifi
+from .models import JobPage, ProcessedJobDescription
+from .utils import map_seniority_level
+from .near_duplicates import NearDuplicateDetector
+from .job_queries import JobBrowser, ensure_job_indexes
+from src import config
+from src.utils.lazy import LazyModule
+from src.utils.match_text import MATCH_TEXT_VERSION, match_text_fields
+from src.utils.text_budget import prepare_for_prompt
+from src.utils.structured_output import dataclass_json_schema, extract_structured
+from src.utils.text_compression import JOB_TEXT_FIELDS, TextCodec, parse_fields, sample_texts
+from src.utils.metrics import metrics
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Heavy dependencies are imported on first use
+openai = LazyModule("openai")
+pymongo = LazyModule("pymongo")
+pymongo_errors = LazyModule("pymongo.errors")
+certifi = LazyModule("certifi")
+
+# Fields the LLM is asked for; the rest come from the raw JD or are computed
+JD_EXTRACTION_SCHEMA = dataclass_json_schema(
+    ProcessedJobDescription,
+    exclude=("job_id", "category", "company_type", "location", "experience_level",
+             "original_description", "processed_at", "seniority_level")
+)
+
+# Materialized stats document, kept current as jobs are upserted
+STATS_DOC_ID = "job_descriptions"
+
+# Stats document field -> job field counted into it
+STATS_FIELDS = {
+    "category_distribution": "category",
+    "location_distribution": "location",
+    "seniority_distribution": "seniority_level",
+    "technical_skill_counts": "technical_skills",
+}
+
+TOP_SKILLS_LIMIT = 20
+
+
+def _encode_stats_key(value: Any) -> str:
+    """Escape a value for use as a field name ('.' and '$' are not allowed in paths)"""
+    return str(value).replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def _decode_stats_key(key: str) -> str:
+    return key.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
+
+
+def _stats_contributions(job: Optional[Dict[str, Any]]) -> Counter:
+    """Counts a single job adds to the materialized stats, as {dotted path: n}"""
+    contributions: Counter = Counter()
+    if job is None:
+        return contributions
+    contributions["total_jobs"] = 1
+    for stats_field, job_field in STATS_FIELDS.items():
+        value = job.get(job_field)
+        for item in value if isinstance(value, list) else [value]:
+            contributions[f"{stats_field}.{_encode_stats_key(item)}"] += 1
+    return contributions
+
+
 class JobDescriptionProcessor:
     def __init__(self, openai_api_key: str, mongo_uri: str, 
-                 database_name: str = "recruitment_platform"):
+                 database_name: str = "recruitment_platform",
+                 openai_client: Any = None, mongo_client: Any = None, request_delay: float = 1.0,
+                 store_match_tokens: bool = False, near_duplicate_mode: Optional[str] = None):
         """
         Initialize the Job Description Processor
         
@@ -24,38 +81,80 @@ class JobDescriptionProcessor:
             openai_api_key (str): OpenAI API key
             mongo_uri (str): MongoDB connection URI
             database_name (str): Database name
+            openai_client (Any): Pre-built OpenAI-compatible client (e.g. a recorded stub)
+            mongo_client (Any): Pre-built MongoClient-compatible client (e.g. an in-memory stub)
+            request_delay (float): Seconds to wait between jobs to stay under API rate limits
+            store_match_tokens (bool): Also store the tokenized match text (larger than the text itself; re-tokenizing at index build is cheap)
+            near_duplicate_mode (Optional[str]): "skip", "link" or "off" (defaults to NEAR_DUPLICATE_MODE)
         """
-        self.client = openai.OpenAI(api_key=openai_api_key)
+        # The OpenAI client is created on first extraction, so LLM-free runs need no key
+        self._client = openai_client
+        self._openai_api_key = openai_api_key
+        self.request_delay = request_delay
+        self.store_match_tokens = store_match_tokens
+        self.near_duplicate_mode = (near_duplicate_mode or config.NEAR_DUPLICATE_MODE).lower()
+        self.upsert_listeners: List[Callable[[List[str]], Any]] = []
+        self.upserted_job_ids: List[str] = []
+        self.compressed_fields = ()
+        if config.TEXT_COMPRESSION == "zstd":
+            self.compressed_fields = parse_fields(config.TEXT_COMPRESSION_FIELDS)
         
         # MongoDB setup with retry logic
         retries = 3
         for attempt in range(retries):
             try:
-                self.mongo_client = MongoClient(mongo_uri,
+                self.mongo_client = mongo_client or pymongo.MongoClient(mongo_uri,
                                                  serverSelectionTimeoutMS=5000,
                                                   tlsCAFile=certifi.where(),
                                                   tlsAllowInvalidCertificates=False)
                 self.mongo_client.admin.command("ping")  # Test connection
                 self.db = self.mongo_client[database_name]
                 self.collection = self.db.job_descriptions
+                self.stats_collection = self.db.collection_stats
+                self._stats_initialized = False
+                self.text_codec = TextCodec(self.db.text_dictionaries, config.TEXT_COMPRESSION_LEVEL,
+                                            config.TEXT_COMPRESSION_MIN_BYTES)
+                self.near_duplicates = None
+                if self.near_duplicate_mode in ("skip", "link"):
+                    self.near_duplicates = NearDuplicateDetector(self.db.job_minhash, config.NEAR_DUPLICATE_THRESHOLD)
                 
-                # Create indexes for better query performance
-                self.collection.create_index("job_id", unique=True)
-                self.collection.create_index("title")
-                self.collection.create_index("category")
-                self.collection.create_index("location")
-                self.collection.create_index("technical_skills")
-                self.collection.create_index("keywords")
-                self.collection.create_index("seniority_level")
+                # Indexes are created once per deployment (scripts/migrate_indexes.py);
+                # afterwards this is a single version lookup
+                ensure_job_indexes(self.collection, self.db.pipeline_state)
                 
                 logger.info("Connected to MongoDB Atlas successfully")
                 break
-            except ConnectionFailure as e:
+            except pymongo_errors.ConnectionFailure as e:
                 logger.error(f"Attempt {attempt + 1}/{retries} failed: {e}")
                 if attempt == retries - 1:
                     raise
                 time.sleep(5)
 
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = openai.OpenAI(api_key=self._openai_api_key)
+        return self._client
+
+    def add_upsert_listener(self, listener: Callable[[List[str]], Any]):
+        """
+        Register a callback that receives the ids of jobs upserted by a processing run
+        
+        Args:
+            listener (Callable[[List[str]], Any]): Called once per run with the new/changed job ids
+        """
+        self.upsert_listeners.append(listener)
+
+    def _notify_upsert_listeners(self, job_ids: List[str]):
+        """Hand upserted job ids to the registered listeners"""
+        if not job_ids:
+            return
+        for listener in self.upsert_listeners:
+            try:
+                listener(job_ids)
+            except Exception as e:
+                logger.error(f"Upsert listener failed: {e}")
+
     def create_extraction_prompt(self, job_description: str) -> str:
         """
         Create a detailed prompt for extracting structured information from job descriptions
@@ -113,21 +212,24 @@ class JobDescriptionProcessor:
         """
         try:
             full_description = raw_jd.get('full_description', '')
-            prompt = self.create_extraction_prompt(full_description)
+            prompt_text = prepare_for_prompt(full_description, config.JD_TOKEN_BUDGET)
+            prompt = self.create_extraction_prompt(prompt_text)
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert HR data analyst. Extract structured information from job descriptions and return only valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
+            extracted_data = extract_structured(
+                self.client,
+                model=config.EXTRACTION_MODEL,
+                system_prompt="You are an expert HR data analyst. Extract structured information from job descriptions and return only valid JSON.",
+                prompt=prompt,
+                schema=JD_EXTRACTION_SCHEMA,
+                schema_name="job_description",
+                source_label="Job Description",
+                source_text=prompt_text,
                 max_tokens=1500,
                 temperature=0.3
             )
-            
-            extracted_text = response.choices[0].message.content.strip()
-            extracted_text = clean_json_response(extracted_text)
-            extracted_data = json.loads(extracted_text)
+            if not extracted_data:
+                logger.error(f"No valid fields extracted for job {raw_jd.get('id', 'unknown')}")
+                return None
             
             seniority_level = map_seniority_level(raw_jd.get('experience_level', ''))
             
@@ -165,35 +267,167 @@ class JobDescriptionProcessor:
             logger.error(f"Error processing job {raw_jd.get('id', 'unknown')}: {e}")
             return None
 
-    def store_in_mongodb(self, processed_jd: ProcessedJobDescription) -> bool:
+    def store_in_mongodb(self, processed_jd: ProcessedJobDescription, duplicate_of: Optional[str] = None) -> bool:
         """
         Store processed job description in MongoDB
         
         Args:
             processed_jd (ProcessedJobDescription): Processed job description
+            duplicate_of (Optional[str]): Canonical job id when this posting is a near-duplicate
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             jd_dict = asdict(processed_jd)
-            result = self.collection.replace_one(
-                {"job_id": processed_jd.job_id},
-                jd_dict,
-                upsert=True
-            )
+            # Precompute the matcher's index input once here instead of on every index load
+            jd_dict.update(match_text_fields(jd_dict, self.store_match_tokens))
+            jd_dict["duplicate_of"] = duplicate_of
+            # Compressed after the match text is built from the plain fields
+            self.text_codec.compress_fields(jd_dict, self.compressed_fields)
+            with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="find_one_and_replace"):
+                # Only the previous version's stats fields are needed to keep the materialized stats exact
+                previous = self.collection.find_one_and_replace(
+                    {"job_id": processed_jd.job_id},
+                    jd_dict,
+                    projection=dict.fromkeys(STATS_FIELDS.values(), 1) | {"_id": 0},
+                    upsert=True
+                )
             
-            if result.upserted_id or result.modified_count > 0:
-                logger.info(f"Successfully stored job: {processed_jd.job_id}")
-                return True
-            else:
-                logger.warning(f"No changes made for job: {processed_jd.job_id}")
-                return False
+            # An upsert either inserted the job or replaced the previous version (None when inserted)
+            logger.info(f"Successfully stored job: {processed_jd.job_id}")
+            self.upserted_job_ids.append(processed_jd.job_id)
+            self._update_materialized_stats(previous, jd_dict)
+            return True
                 
         except Exception as e:
             logger.error(f"Error storing job {processed_jd.job_id} in MongoDB: {e}")
             return False
 
+    def store_many(self, processed_jds: Iterable[ProcessedJobDescription], batch_size: int = 1000) -> int:
+        """
+        Bulk-upsert structured job descriptions that need no LLM extraction
+        (e.g. synthesized load-test catalogs), then rebuild the materialized stats
+        
+        Args:
+            processed_jds (Iterable[ProcessedJobDescription]): Job descriptions to store
+            batch_size (int): Upserts sent per bulk write
+            
+        Returns:
+            int: Number of jobs inserted or changed
+        """
+        self.upserted_job_ids = []
+        operations = []
+        stored = 0
+        
+        def flush():
+            with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="bulk_upsert"):
+                result = self.collection.bulk_write(operations, ordered=False)
+            return result.upserted_count + result.modified_count
+        
+        for processed_jd in processed_jds:
+            jd_dict = asdict(processed_jd)
+            jd_dict.update(match_text_fields(jd_dict, self.store_match_tokens))
+            jd_dict["duplicate_of"] = None
+            self.text_codec.compress_fields(jd_dict, self.compressed_fields)
+            operations.append(pymongo.ReplaceOne({"job_id": processed_jd.job_id}, jd_dict, upsert=True))
+            self.upserted_job_ids.append(processed_jd.job_id)
+            if len(operations) >= batch_size:
+                stored += flush()
+                operations = []
+        if operations:
+            stored += flush()
+        
+        self.rebuild_materialized_stats()
+        self._notify_upsert_listeners(self.upserted_job_ids)
+        logger.info(f"Bulk-stored {stored} job(s)")
+        return stored
+
+    def backfill_match_text(self, batch_size: int = 500) -> int:
+        """
+        Store match text on jobs ingested before it existed or with an older MATCH_TEXT_VERSION
+        
+        Args:
+            batch_size (int): Updates sent per bulk write
+            
+        Returns:
+            int: Number of jobs updated
+        """
+        query = {"match_text_version": {"$ne": MATCH_TEXT_VERSION}}
+        projection = {"_id": 0, "original_description": 0, "match_text": 0, "match_tokens": 0}
+        operations = []
+        updated = 0
+        for job in self.collection.find(query, projection):
+            self.text_codec.decompress_fields(job, JOB_TEXT_FIELDS)
+            operations.append(pymongo.UpdateOne(
+                {"job_id": job.get("job_id")},
+                {"$set": match_text_fields(job, self.store_match_tokens)}
+            ))
+            if len(operations) >= batch_size:
+                updated += self.collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated += self.collection.bulk_write(operations, ordered=False).modified_count
+        logger.info(f"Backfilled match text for {updated} job(s)")
+        return updated
+
+    def dedupe_existing(self) -> Dict[str, Any]:
+        """
+        Cluster the stored postings into near-duplicate groups and set duplicate_of on them
+        
+        Returns:
+            Dict[str, Any]: Counts of scanned postings, duplicates and clusters
+        """
+        detector = self.near_duplicates or NearDuplicateDetector(self.db.job_minhash, config.NEAR_DUPLICATE_THRESHOLD)
+        return detector.rebuild(self.collection, text_codec=self.text_codec)
+
+    def train_text_dictionary(self, sample_size: int = 2000) -> int:
+        """
+        Train a zstd dictionary on a sample of the stored compressible text fields
+        
+        Jobs stored afterwards are compressed with it; run compress_existing to
+        recompress jobs stored earlier.
+        
+        Args:
+            sample_size (int): Field values sampled for training
+            
+        Returns:
+            int: The new dictionary's id
+        """
+        fields = self.compressed_fields or parse_fields(config.TEXT_COMPRESSION_FIELDS)
+        samples = sample_texts(self.collection, fields, self.text_codec, sample_size)
+        if not samples:
+            raise ValueError("No stored job text to train a compression dictionary on")
+        return self.text_codec.train(samples)
+
+    def compress_existing(self, batch_size: int = 500) -> int:
+        """
+        Rewrite the stored text fields with the current compression settings
+        (compressing with the active dictionary, or decompressing when TEXT_COMPRESSION is off)
+        
+        Args:
+            batch_size (int): Updates sent per bulk write
+            
+        Returns:
+            int: Number of jobs rewritten
+        """
+        operations = []
+        updated = 0
+        for job in self.collection.find({}, dict.fromkeys(JOB_TEXT_FIELDS, 1) | {"job_id": 1, "_id": 0}):
+            stored = {field: job[field] for field in JOB_TEXT_FIELDS if field in job}
+            plain = self.text_codec.decompress_fields(dict(stored), JOB_TEXT_FIELDS)
+            rewritten = self.text_codec.compress_fields(plain, self.compressed_fields)
+            changes = {field: value for field, value in rewritten.items() if value != stored[field]}
+            if changes:
+                operations.append(pymongo.UpdateOne({"job_id": job.get("job_id")}, {"$set": changes}))
+            if len(operations) >= batch_size:
+                updated += self.collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+        if operations:
+            updated += self.collection.bulk_write(operations, ordered=False).modified_count
+        logger.info(f"Rewrote compressed text on {updated} job(s)")
+        return updated
+
     def process_all_job_descriptions(self, input_file: str = "job_descriptions_dataset.json") -> Dict[str, Any]:
         """
         Process all job descriptions from the input file
@@ -209,28 +443,55 @@ class JobDescriptionProcessor:
                 raw_job_descriptions = json.load(f)
             
             logger.info(f"Loaded {len(raw_job_descriptions)} job descriptions")
+            self.upserted_job_ids = []
             
             successful_processed = 0
             failed_processed = 0
             successful_stored = 0
             failed_stored = 0
+            skipped_duplicates = 0
+            linked_duplicates = 0
             
             for i, raw_jd in enumerate(raw_job_descriptions, 1):
                 logger.info(f"Processing job {i}/{len(raw_job_descriptions)}: {raw_jd.get('title', 'Unknown')}")
                 
-                processed_jd = self.extract_structured_data(raw_jd)
+                duplicate = None
+                if self.near_duplicates:
+                    signature, band_keys, duplicate = self.near_duplicates.check(
+                        raw_jd.get('id'), raw_jd.get('full_description', '')
+                    )
+                    if duplicate and self.near_duplicate_mode == "skip":
+                        # Skipped before the extraction call, so no rate-limit pause either
+                        skipped_duplicates += 1
+                        metrics.counter("jd_near_duplicates_total", "Near-duplicate postings found at ingest").inc(action="skip")
+                        logger.info(f"Skipping near-duplicate of {duplicate[0]} (similarity {duplicate[1]:.2f})")
+                        continue
+                
+                with metrics.timer("jd_extraction_seconds", "End-to-end extraction time per job description"):
+                    processed_jd = self.extract_structured_data(raw_jd)
                 
                 if processed_jd:
+                    metrics.counter("jd_processed_total", "Job descriptions processed").inc(status="ok")
                     successful_processed += 1
-                    if self.store_in_mongodb(processed_jd):
+                    duplicate_of = duplicate[0] if duplicate else None
+                    if self.store_in_mongodb(processed_jd, duplicate_of):
                         successful_stored += 1
+                        if self.near_duplicates and signature is not None:
+                            self.near_duplicates.add(processed_jd.job_id, signature, band_keys, duplicate_of)
+                        if duplicate_of:
+                            linked_duplicates += 1
+                            metrics.counter("jd_near_duplicates_total", "Near-duplicate postings found at ingest").inc(action="link")
                     else:
                         failed_stored += 1
                 else:
+                    metrics.counter("jd_processed_total", "Job descriptions processed").inc(status="failed")
                     failed_processed += 1
                     logger.error(f"Failed to process job: {raw_jd.get('id', 'unknown')}")
                 
-                time.sleep(1)
+                if self.request_delay:
+                    time.sleep(self.request_delay)
+            
+            self._notify_upsert_listeners(self.upserted_job_ids)
             
             summary = {
                 "total_jobs": len(raw_job_descriptions),
@@ -238,6 +499,8 @@ class JobDescriptionProcessor:
                 "failed_processed": failed_processed,
                 "successful_stored": successful_stored,
                 "failed_stored": failed_stored,
+                "skipped_duplicates": skipped_duplicates,
+                "linked_duplicates": linked_duplicates,
                 "processing_date": datetime.now().isoformat(),
                 "mongodb_collection": self.collection.name,
                 "mongodb_database": self.db.name
@@ -253,41 +516,91 @@ class JobDescriptionProcessor:
             logger.error(f"Error processing job descriptions: {e}")
             raise
 
-    def get_collection_stats(self) -> Dict[str, Any]:
+    def _update_materialized_stats(self, previous: Optional[Dict[str, Any]], current: Dict[str, Any]):
+        """Apply the difference between two versions of a job to the stats document"""
+        if not self._stats_initialized:
+            # Without a baseline the increments would miss jobs stored before this run
+            if self.stats_collection.find_one({"_id": STATS_DOC_ID}, {"_id": 1}) is None:
+                self.rebuild_materialized_stats()
+                self._stats_initialized = True
+                return
+            self._stats_initialized = True
+        delta = _stats_contributions(current)
+        delta.subtract(_stats_contributions(previous))
+        increments = {path: count for path, count in delta.items() if count}
+        if not increments:
+            return
+        try:
+            with metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="stats_increment"):
+                self.stats_collection.update_one(
+                    {"_id": STATS_DOC_ID},
+                    {"$inc": increments, "$set": {"last_updated": datetime.now().isoformat()}},
+                    upsert=True
+                )
+        except Exception as e:
+            # A stale stats document is repaired by get_collection_stats(refresh=True)
+            logger.error(f"Error updating materialized stats: {e}")
+
+    @metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="stats_facet")
+    def rebuild_materialized_stats(self) -> Dict[str, Any]:
+        """
+        Recompute the stats document from the whole collection in one $facet pass
+        
+        Returns:
+            Dict[str, Any]: The stored stats document
+        """
+        def group_by(field: str) -> List[Dict[str, Any]]:
+            return [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+
+        facets = {stats_field: group_by(job_field) for stats_field, job_field in STATS_FIELDS.items()
+                  if job_field != "technical_skills"}
+        facets["technical_skill_counts"] = [{"$unwind": "$technical_skills"}] + group_by("technical_skills")
+        facets["total"] = [{"$count": "count"}]
+        result = next(iter(self.collection.aggregate([{"$facet": facets}])), {})
+
+        total = result.get("total", [])
+        document = {"_id": STATS_DOC_ID, "total_jobs": total[0]["count"] if total else 0,
+                    "last_updated": datetime.now().isoformat()}
+        for stats_field in STATS_FIELDS:
+            document[stats_field] = {_encode_stats_key(item["_id"]): item["count"]
+                                     for item in result.get(stats_field, [])}
+        self.stats_collection.replace_one({"_id": STATS_DOC_ID}, document, upsert=True)
+        return document
+
+    @metrics.timer("mongo_operation_seconds", "MongoDB operation latency", op="collection_stats")
+    def get_collection_stats(self, refresh: bool = False) -> Dict[str, Any]:
         """
         Get statistics about the stored job descriptions
         
+        Reads the materialized stats document (maintained by store_in_mongodb);
+        it is rebuilt with a single $facet aggregation when missing or when
+        refresh is requested.
+        
+        Args:
+            refresh (bool): Recompute from the collection instead of reading the stored document
+        
         Returns:
             Dict[str, Any]: Collection statistics
         """
         try:
-            total_jobs = self.collection.count_documents({})
-            category_stats = list(self.collection.aggregate([
-                {"$group": {"_id": "$category", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}}
-            ]))
-            location_stats = list(self.collection.aggregate([
-                {"$group": {"_id": "$location", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}}
-            ]))
-            seniority_stats = list(self.collection.aggregate([
-                {"$group": {"_id": "$seniority_level", "count": {"$sum": 1}}},
-                {"$sort": {"_id": 1}}
-            ]))
-            top_skills = list(self.collection.aggregate([
-                {"$unwind": "$technical_skills"},
-                {"$group": {"_id": "$technical_skills", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}},
-                {"$limit": 20}
-            ]))
-            
+            document = None if refresh else self.stats_collection.find_one({"_id": STATS_DOC_ID})
+            if document is None:
+                document = self.rebuild_materialized_stats()
+
+            def distribution(stats_field: str) -> Dict[str, int]:
+                counts = [(_decode_stats_key(key), count)
+                          for key, count in document.get(stats_field, {}).items() if count > 0]
+                return dict(sorted(counts, key=lambda item: item[1], reverse=True))
+
+            seniority = distribution("seniority_distribution")
+            skills = distribution("technical_skill_counts")
             stats = {
-                "total_jobs": total_jobs,
-                "category_distribution": {item["_id"]: item["count"] for item in category_stats},
-                "location_distribution": {item["_id"]: item["count"] for item in location_stats},
-                "seniority_distribution": {item["_id"]: item["count"] for item in seniority_stats},
-                "top_technical_skills": {item["_id"]: item["count"] for item in top_skills},
-                "last_updated": datetime.now().isoformat()
+                "total_jobs": document.get("total_jobs", 0),
+                "category_distribution": distribution("category_distribution"),
+                "location_distribution": distribution("location_distribution"),
+                "seniority_distribution": dict(sorted(seniority.items())),
+                "top_technical_skills": dict(list(skills.items())[:TOP_SKILLS_LIMIT]),
+                "last_updated": document.get("last_updated", datetime.now().isoformat())
             }
             
             return stats
@@ -309,11 +622,23 @@ class JobDescriptionProcessor:
         """
         try:
             results = list(self.collection.find(query, {"_id": 0}).limit(limit))
-            return results
+            return [self.text_codec.decompress_fields(job, JOB_TEXT_FIELDS) for job in results]
         except Exception as e:
             logger.error(f"Error searching jobs: {e}")
             return []
 
+    def browse_jobs(self, **filters) -> JobPage:
+        """
+        Page through stored jobs, newest first (see JobBrowser.browse)
+        
+        Args:
+            **filters: category, location, seniority_level, skills, limit and cursor
+            
+        Returns:
+            JobPage: The jobs and the cursor of the following page
+        """
+        return JobBrowser(self.collection, self.text_codec).browse(**filters)
+
     def close_connection(self):
         """Close MongoDB connection"""
         if hasattr(self, 'mongo_client'):
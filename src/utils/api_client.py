@@ -1,13 +1,16 @@
-import openai
 import logging
+from src.utils.lazy import LazyModule
+from src.utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+openai = LazyModule("openai")
+
 class OpenAIClient:
     """Wrapper for OpenAI API client."""
-    def __init__(self, api_key: str):
-        """Initialize the OpenAI client with the provided API key."""
-        self.client = openai.OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, client=None):
+        """Initialize the OpenAI client with the provided API key, or wrap an existing (e.g. stub) client."""
+        self.client = client or openai.OpenAI(api_key=api_key)
 
     def generate_text(self, prompt: str, context: str = "", model: str = "gpt-3.5-turbo", max_tokens: int = 1000, temperature: float = 0.7) -> str:
         """Generate text using the OpenAI API."""
@@ -17,13 +20,17 @@ class OpenAIClient:
                 messages.append({"role": "system", "content": context})
             messages.append({"role": "user", "content": prompt})
 
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+            with metrics.timer("llm_request_seconds", "LLM request latency", purpose="generate", model=model):
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+            if response.usage:
+                metrics.counter("llm_tokens_total", "LLM tokens used").inc(response.usage.total_tokens, purpose="generate")
             return response.choices[0].message.content.strip()
         except Exception as e:
+            metrics.counter("llm_errors_total", "Failed LLM requests").inc(purpose="generate")
             logger.error(f"Error generating text with OpenAI API: {e}")
             raise
\ No newline at end of file
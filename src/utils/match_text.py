@@ -0,0 +1,58 @@
+import re
+from typing import Any, Dict, List, Union
+
+# Bump when build_job_match_text or tokenize_match_text change, so stored
+# match text written by older ingests is rebuilt instead of trusted.
+MATCH_TEXT_VERSION = 1
+
+# scikit-learn's default token_pattern; tokenizing with it after lowercasing
+# reproduces TfidfVectorizer's default analyzer input exactly.
+MATCH_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def extract_strings(field: Any) -> List[str]:
+    """Helper to extract strings from a list of strings or dicts."""
+    if isinstance(field, list):
+        if field and isinstance(field[0], dict):
+            # Try 'name' key, fallback to first value
+            return [str(item.get('name', next(iter(item.values()), ''))) for item in field]
+        return [str(item) for item in field]
+    return []
+
+
+def build_job_match_text(job: Dict[str, Any]) -> str:
+    """Build the canonical match text for a job (title, category, skills, responsibilities, keywords, summary)"""
+    return f"""
+            {job.get('title', '')} {job.get('category', '')}
+            {' '.join(extract_strings(job.get('technical_skills', [])))}
+            {' '.join(extract_strings(job.get('soft_skills', [])))}
+            {' '.join(extract_strings(job.get('responsibilities', [])))}
+            {' '.join(extract_strings(job.get('keywords', [])))}
+            {job.get('job_summary', '')}
+            """.strip()
+
+
+def tokenize_match_text(text: Union[str, List[str]]) -> List[str]:
+    """
+    Lowercase and split match text into word tokens
+
+    Token lists (precomputed at ingest) are passed through unchanged, so the
+    vectorizer can take stored tokens for jobs and raw text for resumes.
+    """
+    if isinstance(text, list):
+        return text
+    return MATCH_TOKEN_PATTERN.findall(text.lower())
+
+
+def match_text_fields(job: Dict[str, Any], include_tokens: bool = False) -> Dict[str, Any]:
+    """Fields stored on a job document at ingest so index builds skip text assembly"""
+    match_text = build_job_match_text(job)
+    fields = {"match_text": match_text, "match_text_version": MATCH_TEXT_VERSION}
+    if include_tokens:
+        fields["match_tokens"] = tokenize_match_text(match_text)
+    return fields
+
+
+def identity(value: Any) -> Any:
+    """Module-level no-op preprocessor (picklable, unlike a lambda)"""
+    return value
@@ -0,0 +1,214 @@
+import time
+import bisect
+import logging
+import threading
+from functools import wraps
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (f'{name}="{value}"'.replace("\n", "\\n") for name, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _summary_key(key: LabelKey) -> str:
+    return ",".join(f"{name}={value}" for name, value in key) or "total"
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Increase the counter for a label set"""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def to_prometheus(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return "\n".join(lines)
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            return {_summary_key(key): value for key, value in self._values.items()}
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, in the Prometheus layout"""
+
+    def __init__(self, name: str, description: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Record one observation for a label set"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0,
+                          "min": value, "max": value}
+                self._series[key] = series
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+            series["min"] = min(series["min"], value)
+            series["max"] = max(series["max"], value)
+
+    def to_prometheus(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series["counts"]):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return "\n".join(lines)
+
+    def _quantile(self, series: Dict[str, Any], q: float) -> float:
+        """Estimate a quantile from bucket counts (upper bound of the bucket)"""
+        target = q * series["count"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, series["counts"]):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, series["max"])
+        return series["max"]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                _summary_key(key): {
+                    "count": series["count"],
+                    "sum": round(series["sum"], 6),
+                    "mean": round(series["sum"] / series["count"], 6),
+                    "min": round(series["min"], 6),
+                    "max": round(series["max"], 6),
+                    "p50": round(self._quantile(series, 0.5), 6),
+                    "p95": round(self._quantile(series, 0.95), 6)
+                }
+                for key, series in self._series.items()
+            }
+
+
+class _Timer:
+    """Context manager and decorator that observes elapsed seconds into a histogram"""
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.labels = labels
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        labels = dict(self.labels, status="error" if exc_type else "ok")
+        self.histogram.observe(time.perf_counter() - self._start, **labels)
+        return False
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(self.histogram, self.labels):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class MetricsRegistry:
+    """Holds named counters and histograms and exports them"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, description, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """Get or create a counter"""
+        return self._get_or_create(Counter, name, description)
+
+    def histogram(self, name: str, description: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+
+    def timer(self, name: str, description: str = "", **labels) -> _Timer:
+        """
+        Time a block or function into the histogram `name`
+
+        Usage:
+            with metrics.timer("mongo_operation_seconds", op="find"):
+                ...
+
+            @metrics.timer("vectorize_seconds", target="jobs")
+            def vectorize(...):
+                ...
+        """
+        return _Timer(self.histogram(name, description), labels)
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.to_prometheus() for metric in metrics) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly summary of all metrics"""
+        with self._lock:
+            metrics = list(self._metrics.items())
+        return {name: metric.summary() for name, metric in metrics}
+
+    def write_prometheus(self, filename: str):
+        """Write the Prometheus text format to a file (e.g. for the node exporter textfile collector)"""
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        logger.info(f"Wrote metrics to {filename}")
+
+    def reset(self):
+        """Drop all registered metrics"""
+        with self._lock:
+            self._metrics.clear()
+
+
+# Process-wide default registry
+metrics = MetricsRegistry()
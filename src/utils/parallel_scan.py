@@ -0,0 +1,84 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils.lazy import LazyModule
+from src.utils.metrics import metrics
+
+bson = LazyModule("bson")
+
+logger = logging.getLogger(__name__)
+
+# Collections smaller than this per partition are read with a single cursor
+MIN_PARTITION_SIZE = 5000
+
+
+def partition_bounds(collection, partitions: int) -> List[Tuple[Optional[Any], Optional[Any]]]:
+    """
+    Split a collection into contiguous _id ranges of roughly equal size
+
+    Split points are read from the _id index (skip over a covered,
+    _id-sorted query), so no documents are fetched to pick them.
+
+    Returns:
+        List[Tuple[Optional[Any], Optional[Any]]]: (lower inclusive, upper exclusive) bounds; None is open
+    """
+    total = collection.estimated_document_count()
+    partitions = min(partitions, total // MIN_PARTITION_SIZE)
+    if partitions <= 1:
+        return [(None, None)]
+    step = total // partitions
+    splits = []
+    for i in range(1, partitions):
+        boundary = list(collection.find({}, {"_id": 1}).sort("_id", 1).skip(i * step).limit(1))
+        if boundary and (not splits or boundary[0]["_id"] > splits[-1]):
+            splits.append(boundary[0]["_id"])
+    edges = [None] + splits + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _range_query(lower: Optional[Any], upper: Optional[Any]) -> Dict[str, Any]:
+    condition = {}
+    if lower is not None:
+        condition["$gte"] = lower
+    if upper is not None:
+        condition["$lt"] = upper
+    return {"_id": condition} if condition else {}
+
+
+def parallel_scan(collection, projection: Dict[str, Any], workers: int = 4,
+                  batch_size: int = 2000) -> List[Dict[str, Any]]:
+    """
+    Read a whole collection with one cursor per _id range, in _id order
+
+    Each cursor fetches raw BSON batches (find_raw_batches) and decodes a
+    whole batch at once with bson.decode_all, instead of building documents
+    one by one inside the driver; the projection keeps the decoded fields
+    to the ones the caller needs.
+
+    Args:
+        collection: pymongo collection
+        projection (Dict[str, Any]): Fields to fetch
+        workers (int): Parallel cursors (ranges); 1 reads with a single cursor
+        batch_size (int): Documents per network batch
+
+    Returns:
+        List[Dict[str, Any]]: Decoded documents
+    """
+    bounds = partition_bounds(collection, workers)
+
+    def read(bound: Tuple[Optional[Any], Optional[Any]]) -> List[Dict[str, Any]]:
+        documents = []
+        cursor = collection.find_raw_batches(_range_query(*bound), projection, batch_size=batch_size).sort("_id", 1)
+        for batch in cursor:
+            documents.extend(bson.decode_all(batch))
+        return documents
+
+    with metrics.timer("collection_scan_seconds", "Parallel collection scan time", collection=collection.name):
+        if len(bounds) == 1:
+            parts = [read(bounds[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(bounds), thread_name_prefix="scan") as pool:
+                parts = list(pool.map(read, bounds))
+    logger.info(f"Scanned {sum(len(part) for part in parts)} documents from {collection.name} "
+                f"in {len(bounds)} range(s)")
+    return [document for part in parts for document in part]
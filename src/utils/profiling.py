@@ -0,0 +1,174 @@
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval into folded (flame graph) format"""
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        Initialize the sampler
+
+        Args:
+            interval (float): Seconds between samples
+            thread_id (Optional[int]): Thread to sample (defaults to the calling thread)
+        """
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: Counter = Counter()
+        self.stage: Optional[str] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            stage = self.stage
+            frame = sys._current_frames().get(self.thread_id)
+            if stage is None or frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            stack.append(stage)
+            self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+
+    def write_folded(self, filename: str):
+        """Write collapsed stacks, one `frame;frame;frame count` line per unique stack"""
+        with open(filename, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """Per-stage cProfile, stack sampling and tracemalloc peaks for a batch script"""
+
+    def __init__(self, name: str, output_dir: str = "data", sample_interval: float = 0.005, top_n: int = 25):
+        """
+        Initialize the profiler
+
+        Args:
+            name (str): Run name used in report file names
+            output_dir (str): Directory for the reports
+            sample_interval (float): Stack sampling interval in seconds
+            top_n (int): Functions listed per stage in the JSON summary
+        """
+        self.name = name
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.sampler = StackSampler(sample_interval)
+        self.combined_stats: Optional[pstats.Stats] = None
+        self.stages: List[Dict[str, Any]] = []
+
+    def __enter__(self):
+        tracemalloc.start()
+        self.sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.sampler.stop()
+        tracemalloc.stop()
+        self.write_reports()
+        return False
+
+    @contextmanager
+    def stage(self, stage_name: str):
+        """Profile one (non-nested) stage of the run"""
+        profiler = cProfile.Profile()
+        self.sampler.stage = stage_name
+        tracemalloc.reset_peak()
+        start_current, _ = tracemalloc.get_traced_memory()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            _, peak = tracemalloc.get_traced_memory()
+            self.sampler.stage = None
+            self._record_stage(stage_name, profiler, wall, cpu, peak - start_current)
+
+    def _record_stage(self, stage_name: str, profiler: cProfile.Profile, wall: float, cpu: float, peak_bytes: int):
+        stats = pstats.Stats(profiler)
+        stats_file = os.path.join(self.output_dir, f"profile_{self.name}_{stage_name}.pstats")
+        stats.dump_stats(stats_file)
+        if self.combined_stats is None:
+            self.combined_stats = pstats.Stats(profiler)
+        else:
+            self.combined_stats.add(profiler)
+
+        top_functions = []
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        for func in stats.fcn_list[:self.top_n]:
+            _, calls, tottime, cumtime, _ = stats.stats[func]
+            filename, line, func_name = func
+            top_functions.append({
+                "function": f"{func_name} ({os.path.basename(filename)}:{line})",
+                "calls": calls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6)
+            })
+
+        self.stages.append({
+            "stage": stage_name,
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(cpu, 6),
+            "peak_alloc_bytes": peak_bytes,
+            "pstats_file": stats_file,
+            "top_functions": top_functions
+        })
+        logger.info(f"Stage {stage_name}: {wall:.3f}s wall, {cpu:.3f}s CPU, peak alloc {peak_bytes / 1e6:.1f} MB")
+
+    def write_reports(self):
+        """Write combined pstats, folded stacks and a JSON summary next to the run summaries"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, f"profile_{self.name}")
+        if self.combined_stats is not None:
+            self.combined_stats.dump_stats(f"{prefix}.pstats")
+            text = io.StringIO()
+            pstats.Stats(f"{prefix}.pstats", stream=text).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+            with open(f"{prefix}.txt", "w", encoding="utf-8") as f:
+                f.write(text.getvalue())
+        self.sampler.write_folded(f"{prefix}.folded")
+        with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+            json.dump({"run": self.name, "stages": self.stages}, f, indent=2)
+        logger.info(f"Profile reports written to {prefix}.*")
+
+
+@contextmanager
+def optional_stage(profiler: Optional[RunProfiler], stage_name: str):
+    """Profile a stage when profiling is enabled, otherwise do nothing"""
+    if profiler is None:
+        yield
+    else:
+        with profiler.stage(stage_name):
+            yield
@@ -0,0 +1,337 @@
+import json
+import re
+import logging
+import typing
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Models that accept response_format={"type": "json_schema"}; older chat
+# models only support JSON mode, so the schema is enforced locally instead.
+_JSON_SCHEMA_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "o1", "o3", "o4")
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_PY_LITERALS = re.compile(r"(?<=[:\[,\s])(None|True|False)(?=\s*[,}\]])")
+_PY_LITERAL_MAP = {"None": "null", "True": "true", "False": "false"}
+
+
+def dataclass_json_schema(cls, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Build a JSON schema for the LLM-extracted fields of a dataclass
+
+    Args:
+        cls: Dataclass type
+        exclude (Iterable[str]): Field names filled in by code, not by the LLM
+
+    Returns:
+        Dict[str, Any]: JSON schema object
+    """
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls!r} is not a dataclass")
+
+    excluded = set(exclude)
+    hints = typing.get_type_hints(cls)
+    properties = {}
+    for field in fields(cls):
+        if field.name in excluded:
+            continue
+        properties[field.name] = _type_schema(hints[field.name])
+
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+
+def _type_schema(annotation) -> Dict[str, Any]:
+    """Map a Python type annotation to a JSON schema fragment."""
+    origin = typing.get_origin(annotation)
+    if origin in (list, List):
+        args = typing.get_args(annotation)
+        item = _type_schema(args[0]) if args else {"type": "string"}
+        return {"type": "array", "items": item}
+    if annotation is int:
+        return {"type": "integer"}
+    if annotation is float:
+        return {"type": "number"}
+    if annotation is bool:
+        return {"type": "boolean"}
+    return {"type": "string"}
+
+
+def _balance_brackets(text: str) -> str:
+    """Close an unterminated string and any unclosed brackets at the end of text."""
+    stack = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",")
+    return text + "".join(reversed(stack))
+
+
+def repair_json_text(text: str) -> str:
+    """
+    Repair common defects in LLM JSON output
+
+    Handles code fences, leading/trailing chatter, smart quotes, Python
+    literals, trailing commas and output truncated by max_tokens.
+
+    Args:
+        text (str): Raw LLM response
+
+    Returns:
+        str: Text that is more likely to be valid JSON
+    """
+    text = _CODE_FENCE.sub("", text.strip()).translate(_SMART_QUOTES)
+    start_idx = text.find("{")
+    if start_idx != -1:
+        text = text[start_idx:]
+    text = _PY_LITERALS.sub(lambda m: _PY_LITERAL_MAP[m.group(1)], text)
+    text = _TRAILING_COMMA.sub(r"\1", text)
+    return _balance_brackets(text)
+
+
+def _salvage_fields(text: str, keys: Iterable[str]) -> Dict[str, Any]:
+    """Decode whichever top-level fields are individually well-formed."""
+    decoder = json.JSONDecoder()
+    salvaged = {}
+    for key in keys:
+        match = re.search(r'"%s"\s*:\s*' % re.escape(key), text)
+        if not match:
+            continue
+        try:
+            value, _ = decoder.raw_decode(text, match.end())
+            salvaged[key] = value
+        except json.JSONDecodeError:
+            continue
+    return salvaged
+
+
+def parse_llm_json(text: str, schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Parse an LLM JSON response, repairing it if needed
+
+    Args:
+        text (str): Raw LLM response
+        schema (Optional[Dict[str, Any]]): Schema used to salvage individual fields
+
+    Returns:
+        Dict[str, Any]: Parsed object (possibly partial)
+
+    Raises:
+        json.JSONDecodeError: If nothing could be recovered
+    """
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data
+    except json.JSONDecodeError:
+        pass
+
+    repaired = repair_json_text(text)
+    try:
+        data = json.loads(repaired)
+        if isinstance(data, dict):
+            return data
+    except json.JSONDecodeError as e:
+        if not schema:
+            raise
+        salvaged = _salvage_fields(repaired, schema["properties"])
+        if not salvaged:
+            raise
+        logger.warning(f"Recovered {len(salvaged)} field(s) from malformed JSON: {e}")
+        return salvaged
+    raise json.JSONDecodeError("Top-level JSON value is not an object", repaired, 0)
+
+
+def _coerce(value: Any, spec: Dict[str, Any]) -> Tuple[bool, Any]:
+    """Coerce a value to a schema fragment; returns (ok, value)."""
+    expected = spec.get("type")
+    if value is None and expected in ("array", "string"):
+        # An explicit null means "not in the source"; re-asking would not help
+        return True, [] if expected == "array" else "Not specified"
+    if expected == "array":
+        if isinstance(value, str):
+            value = [part.strip() for part in re.split(r"[,;\n]", value) if part.strip()]
+        if not isinstance(value, list):
+            return False, value
+        item_spec = spec.get("items", {"type": "string"})
+        coerced = []
+        for item in value:
+            ok, item = _coerce(item, item_spec)
+            if ok:
+                coerced.append(item)
+        return True, coerced
+    if expected == "string":
+        if isinstance(value, list):
+            return True, ", ".join(str(item) for item in value)
+        if isinstance(value, dict):
+            # e.g. {"name": "Python", "level": "expert"} for a skill
+            return True, str(value.get("name", next(iter(value.values()), "")))
+        return True, str(value)
+    if expected == "integer":
+        try:
+            return True, int(value)
+        except (TypeError, ValueError):
+            return False, value
+    if expected == "number":
+        try:
+            return True, float(value)
+        except (TypeError, ValueError):
+            return False, value
+    return True, value
+
+
+def validate_fields(data: Dict[str, Any], schema: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Validate parsed data against a schema, coercing near-misses
+
+    Args:
+        data (Dict[str, Any]): Parsed LLM output
+        schema (Dict[str, Any]): JSON schema from dataclass_json_schema
+
+    Returns:
+        Tuple[Dict[str, Any], List[str]]: Valid fields and names of missing/invalid fields
+    """
+    valid = {}
+    invalid = []
+    for name, spec in schema["properties"].items():
+        if name not in data:
+            invalid.append(name)
+            continue
+        ok, value = _coerce(data[name], spec)
+        if ok:
+            valid[name] = value
+        else:
+            invalid.append(name)
+    return valid, invalid
+
+
+def subschema(schema: Dict[str, Any], names: Iterable[str]) -> Dict[str, Any]:
+    """Restrict a schema to a subset of its properties."""
+    properties = {name: schema["properties"][name] for name in names if name in schema["properties"]}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+
+def build_field_repair_prompt(names: List[str], schema: Dict[str, Any], source_label: str, source_text: str) -> str:
+    """
+    Create a prompt that re-asks only for the given fields
+
+    Args:
+        names (List[str]): Fields that were missing or invalid
+        schema (Dict[str, Any]): Full JSON schema
+        source_label (str): Human-readable label for the source text
+        source_text (str): Text to extract from
+
+    Returns:
+        str: Repair prompt
+    """
+    return f"""
+        Extract only the following fields from the {source_label} below and return a JSON
+        object that matches this JSON schema exactly:
+
+        {json.dumps(subschema(schema, names), indent=2)}
+
+        {source_label}:
+        {source_text}
+
+        If a field is not available, use an empty array [] or "Not specified".
+        Return only valid JSON, no additional text.
+        """
+
+
+def response_format_for(model: str, schema: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """Pick the strongest response_format the model supports."""
+    if model.startswith(_JSON_SCHEMA_MODEL_PREFIXES):
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": name, "schema": schema, "strict": True}
+        }
+    return {"type": "json_object"}
+
+
+def extract_structured(client, model: str, system_prompt: str, prompt: str, schema: Dict[str, Any],
+                       schema_name: str, source_label: str, source_text: str,
+                       max_tokens: int = 1500, temperature: float = 0.3,
+                       max_repairs: int = 1) -> Dict[str, Any]:
+    """
+    Run a schema-constrained extraction, re-asking only for invalid fields
+
+    Args:
+        client: openai.OpenAI client
+        model (str): Chat model name
+        system_prompt (str): System message
+        prompt (str): Extraction prompt
+        schema (Dict[str, Any]): JSON schema of the expected object
+        schema_name (str): Name reported to the API for the schema
+        source_label (str): Label for the source text in repair prompts
+        source_text (str): Source text used in repair prompts
+        max_tokens (int): Completion token limit
+        temperature (float): Sampling temperature
+        max_repairs (int): Number of targeted retries for invalid fields
+
+    Returns:
+        Dict[str, Any]: Valid extracted fields (may be partial)
+    """
+    valid: Dict[str, Any] = {}
+    pending = list(schema["properties"])
+    current_prompt, current_schema = prompt, schema
+
+    for attempt in range(max_repairs + 1):
+        with metrics.timer("llm_request_seconds", "LLM request latency", purpose=schema_name, model=model):
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": current_prompt}
+                ],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                response_format=response_format_for(model, current_schema, schema_name)
+            )
+        if getattr(response, "usage", None):
+            metrics.counter("llm_tokens_total", "LLM tokens used").inc(response.usage.total_tokens, purpose=schema_name)
+        content = (response.choices[0].message.content or "").strip()
+        try:
+            data = parse_llm_json(content, current_schema)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Unparseable {schema_name} response (attempt {attempt + 1}): {e}")
+            data = {}
+
+        fields_ok, pending = validate_fields(data, current_schema)
+        valid.update(fields_ok)
+        if not pending:
+            break
+
+        metrics.counter("llm_field_repairs_total", "Targeted re-asks for invalid fields").inc(len(pending), purpose=schema_name)
+        logger.info(f"Re-asking for {len(pending)} invalid {schema_name} field(s): {pending}")
+        current_schema = subschema(schema, pending)
+        current_prompt = build_field_repair_prompt(pending, schema, source_label, source_text)
+
+    return valid
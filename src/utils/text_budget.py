@@ -0,0 +1,211 @@
+import re
+import logging
+from collections import Counter
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough GPT-style token pattern used when tiktoken is not installed: words,
+# numbers and individual punctuation marks each count as one token.
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_MULTI_SPACE = re.compile(r"[ \t\u00a0]+")
+_MULTI_NEWLINE = re.compile(r"\n{3,}")
+_PAGE_NUMBER = re.compile(r"^\s*(page\s*)?\d+\s*(of\s*\d+)?\s*$", re.IGNORECASE)
+_BOILERPLATE = re.compile(
+    r"^\s*(references (are )?available upon request|"
+    r"curriculum vitae|resume|confidential|"
+    r"this document .* confidential.*|"
+    r"we are an equal opportunity employer.*|"
+    r"equal opportunity employer.*)\s*$",
+    re.IGNORECASE
+)
+_TRUNCATION_MARKER = "\n[...]\n"
+
+_encoder = None
+_encoder_loaded = False
+
+
+def _get_encoder():
+    """Return a tiktoken encoder if available, otherwise None."""
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        _encoder_loaded = True
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            logger.debug("tiktoken not available, using regex token estimate")
+            _encoder = None
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the number of tokens in a piece of text
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Token count (exact with tiktoken, estimated otherwise)
+    """
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapse runs of spaces and blank lines and strip trailing whitespace
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Normalized text
+    """
+    lines = [_MULTI_SPACE.sub(" ", line).strip() for line in text.replace("\r", "\n").split("\n")]
+    return _MULTI_NEWLINE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Remove page numbers and common boilerplate lines that carry no signal
+
+    Args:
+        text (str): Normalized text
+
+    Returns:
+        str: Text without boilerplate lines
+    """
+    kept = [line for line in text.split("\n")
+            if not _PAGE_NUMBER.match(line) and not _BOILERPLATE.match(line)]
+    return _MULTI_NEWLINE.sub("\n\n", "\n".join(kept)).strip()
+
+
+def dedupe_page_furniture(pages: List[str], edge_lines: int = 3) -> List[str]:
+    """
+    Drop header/footer lines that repeat across the pages of a document
+
+    Args:
+        pages (List[str]): Text of each page
+        edge_lines (int): Number of lines at the top and bottom of a page to inspect
+
+    Returns:
+        List[str]: Pages with repeated headers and footers removed
+    """
+    if len(pages) < 2:
+        return pages
+
+    page_lines = [[line.strip() for line in page.split("\n")] for page in pages]
+    edge_counts = Counter()
+    for lines in page_lines:
+        non_empty = [line for line in lines if line]
+        edges = set(non_empty[:edge_lines] + non_empty[-edge_lines:])
+        edge_counts.update(edges)
+
+    threshold = max(2, (len(pages) + 1) // 2)
+    furniture = {line for line, count in edge_counts.items() if count >= threshold}
+    if not furniture:
+        return pages
+
+    # Keep the first occurrence so a name in the page header is not lost
+    seen = set()
+    cleaned = []
+    for lines in page_lines:
+        non_empty_idx = [i for i, line in enumerate(lines) if line]
+        edge_idx = set(non_empty_idx[:edge_lines] + non_empty_idx[-edge_lines:])
+        kept = []
+        for i, line in enumerate(lines):
+            if i in edge_idx and line in furniture:
+                if line in seen:
+                    continue
+                seen.add(line)
+            kept.append(line)
+        cleaned.append("\n".join(kept))
+    return cleaned
+
+
+def _take_lines(lines: List[str], budget: int) -> List[str]:
+    """Take whole lines from the front of a list until the token budget is used."""
+    taken = []
+    used = 0
+    for line in lines:
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            break
+        taken.append(line)
+        used += cost
+    return taken
+
+
+def _take_prefix(text: str, budget: int) -> str:
+    """Longest prefix of text that fits in the token budget, cut between tokens."""
+    if budget <= 0:
+        return ""
+    encoder = _get_encoder()
+    if encoder is not None:
+        return encoder.decode(encoder.encode(text)[:budget])
+    end = 0
+    for i, match in enumerate(_TOKEN_PATTERN.finditer(text)):
+        if i == budget:
+            break
+        end = match.end()
+    return text[:end]
+
+
+def truncate_to_budget(text: str, max_tokens: int, tail_ratio: float = 0.2) -> str:
+    """
+    Truncate text to a token budget on line boundaries
+
+    Most of the budget is spent on the beginning of the text (titles, contact
+    details and summaries live there) and the remainder on its end, so closing
+    sections such as certifications or benefits are not lost entirely.
+
+    Args:
+        text (str): Text to truncate
+        max_tokens (int): Token budget
+        tail_ratio (float): Share of the budget reserved for the end of the text
+
+    Returns:
+        str: Text that fits within the budget
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    lines = text.split("\n")
+    budget = max_tokens - count_tokens(_TRUNCATION_MARKER)
+    tail_budget = int(budget * tail_ratio)
+    head = _take_lines(lines, budget - tail_budget)
+    remaining = lines[len(head):]
+    tail = list(reversed(_take_lines(list(reversed(remaining)), tail_budget)))
+
+    if not head:
+        # A single very long line: cut it at the token budget
+        return _take_prefix(text, max_tokens)
+    return "\n".join(head) + _TRUNCATION_MARKER + "\n".join(tail)
+
+
+def prepare_for_prompt(text: str, max_tokens: int, pages: Optional[List[str]] = None) -> str:
+    """
+    Clean text and fit it into a prompt token budget
+
+    Args:
+        text (str): Raw text (ignored when pages are given)
+        max_tokens (int): Token budget for the text
+        pages (Optional[List[str]]): Per-page text, used to drop repeated headers/footers
+
+    Returns:
+        str: Cleaned, budgeted text
+    """
+    if pages:
+        text = "\n".join(dedupe_page_furniture(pages))
+    cleaned = strip_boilerplate(normalize_whitespace(text))
+    original_tokens = count_tokens(cleaned)
+    trimmed = truncate_to_budget(cleaned, max_tokens)
+    if trimmed is not cleaned:
+        logger.info(f"Trimmed prompt text from {original_tokens} to {count_tokens(trimmed)} tokens")
+    return trimmed
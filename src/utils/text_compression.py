@@ -0,0 +1,170 @@
+import random
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from src.utils.lazy import LazyModule
+from src.utils.metrics import metrics
+
+zstd = LazyModule("zstandard")
+
+logger = logging.getLogger(__name__)
+
+# Long text fields of a stored job that may be compressed (TEXT_COMPRESSION_FIELDS picks which)
+JOB_TEXT_FIELDS = ("original_description", "company_overview", "job_summary")
+
+# Dictionary size zstd recommends for trained dictionaries (~100x the typical sample)
+DEFAULT_DICTIONARY_SIZE = 112_640
+
+
+def parse_fields(spec: str) -> tuple:
+    """Parse a comma-separated TEXT_COMPRESSION_FIELDS value"""
+    fields = tuple(field.strip() for field in spec.split(",") if field.strip())
+    unknown = [field for field in fields if field not in JOB_TEXT_FIELDS]
+    if unknown:
+        raise ValueError(f"Cannot compress {unknown}; expected fields from {JOB_TEXT_FIELDS}")
+    return fields
+
+
+def is_compressed(value: Any) -> bool:
+    """Compressed fields are stored as BSON binary (bytes); plain text stays a string"""
+    return isinstance(value, (bytes, bytearray))
+
+
+class TextCodec:
+    """
+    zstd compression of long job text fields, with trained dictionaries
+
+    Dictionaries live in their own collection keyed by their zstd dictionary
+    id. Every frame records the id of the dictionary it was compressed with,
+    so values compressed under older dictionaries still decompress after a
+    new one is trained. Text shorter than min_bytes is stored as is.
+    """
+
+    def __init__(self, dictionary_collection, level: int = 6, min_bytes: int = 256):
+        """
+        Initialize the codec
+
+        Args:
+            dictionary_collection: MongoDB collection holding the trained dictionaries
+            level (int): zstd compression level
+            min_bytes (int): Shortest UTF-8 text worth compressing
+        """
+        self.dictionary_collection = dictionary_collection
+        self.level = level
+        self.min_bytes = min_bytes
+        self._dictionaries: Optional[Dict[int, Any]] = None
+        self._active_id = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _load_dictionaries(self):
+        """Read the stored dictionaries; the most recently trained one compresses new values"""
+        with self._lock:
+            dictionaries, active_id, latest = {}, 0, ""
+            for doc in self.dictionary_collection.find({}, {"_id": 1, "data": 1, "trained_at": 1}):
+                dictionaries[doc["_id"]] = zstd.ZstdCompressionDict(bytes(doc["data"]))
+                if doc.get("trained_at", "") >= latest:
+                    active_id, latest = doc["_id"], doc.get("trained_at", "")
+            self._dictionaries, self._active_id = dictionaries, active_id
+            # Cached (de)compressors were built for the previous dictionary set
+            self._local = threading.local()
+
+    def _dictionary(self, dict_id: int):
+        if self._dictionaries is None or (dict_id and dict_id not in self._dictionaries):
+            self._load_dictionaries()
+        if dict_id and dict_id not in self._dictionaries:
+            raise ValueError(f"Text compression dictionary {dict_id} is not stored")
+        return self._dictionaries.get(dict_id)
+
+    def _compressor(self):
+        # zstd (de)compressors are not thread-safe, so each thread keeps its own
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            if self._dictionaries is None:
+                self._load_dictionaries()
+            compressor = zstd.ZstdCompressor(level=self.level, dict_data=self._dictionaries.get(self._active_id))
+            self._local.compressor = compressor
+        return compressor
+
+    def _decompressor(self, dict_id: int):
+        decompressors = getattr(self._local, "decompressors", None)
+        if decompressors is None:
+            decompressors = self._local.decompressors = {}
+        decompressor = decompressors.get(dict_id)
+        if decompressor is None:
+            decompressor = decompressors[dict_id] = zstd.ZstdDecompressor(dict_data=self._dictionary(dict_id))
+        return decompressor
+
+    def compress(self, text: str) -> Any:
+        """Compress text long enough to benefit; shorter text is returned unchanged"""
+        if not isinstance(text, str):
+            return text
+        encoded = text.encode("utf-8")
+        if len(encoded) < self.min_bytes:
+            return text
+        return self._compressor().compress(encoded)
+
+    def decompress(self, value: Any) -> Any:
+        """Return the text for a compressed value; plain values pass through"""
+        if not is_compressed(value):
+            return value
+        dict_id = zstd.get_frame_parameters(bytes(value)).dict_id
+        return self._decompressor(dict_id).decompress(bytes(value)).decode("utf-8")
+
+    def compress_fields(self, document: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+        """Compress the given text fields of a document in place"""
+        for field in fields:
+            if field in document:
+                document[field] = self.compress(document[field])
+        return document
+
+    def decompress_fields(self, document: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+        """Decompress the given fields of a document in place"""
+        for field in fields:
+            if is_compressed(document.get(field)):
+                document[field] = self.decompress(document[field])
+        return document
+
+    def train(self, samples: List[str], dictionary_size: int = DEFAULT_DICTIONARY_SIZE) -> int:
+        """
+        Train a dictionary on sample texts, store it and make it the active one
+
+        Returns:
+            int: The new dictionary's id
+        """
+        with metrics.timer("text_dictionary_train_seconds", "zstd dictionary training time"):
+            dictionary = zstd.train_dictionary(dictionary_size, [sample.encode("utf-8") for sample in samples],
+                                               level=self.level)
+        dict_id = dictionary.dict_id()
+        self.dictionary_collection.replace_one(
+            {"_id": dict_id},
+            {"_id": dict_id, "data": dictionary.as_bytes(), "samples": len(samples),
+             "trained_at": datetime.now().isoformat()},
+            upsert=True
+        )
+        self._load_dictionaries()
+        logger.info(f"Trained text compression dictionary {dict_id} on {len(samples)} samples")
+        return dict_id
+
+
+def sample_texts(collection, fields: Iterable[str], codec: TextCodec, sample_size: int,
+                 seed: Optional[int] = None) -> List[str]:
+    """Reservoir-sample the (decompressed) values of text fields across a collection"""
+    fields = list(fields)
+    rng = random.Random(seed)
+    samples: List[str] = []
+    seen = 0
+    for doc in collection.find({}, dict.fromkeys(fields, 1) | {"_id": 0}):
+        for field in fields:
+            text = codec.decompress(doc.get(field))
+            if not isinstance(text, str) or not text:
+                continue
+            seen += 1
+            if len(samples) < sample_size:
+                samples.append(text)
+            else:
+                slot = rng.randrange(seen)
+                if slot < sample_size:
+                    samples[slot] = text
+    return samples